@@ -0,0 +1,63 @@
+import json
+import sys
+import time
+
+from war_simulator.dao.game_codec import encode_game, decode_game
+from war_simulator.dao.game_dao import GameDao
+from war_simulator.dao.game_event_log import game_to_dict, game_from_dict
+from war_simulator.model.battlefield import Battlefield
+from war_simulator.model.cruiser import Cruiser
+from war_simulator.model.game import Game
+from war_simulator.model.player import Player
+from war_simulator.model.submarine import Submarine
+
+
+def create_game(fleet_size: int) -> Game:
+    game = Game()
+    for name in ("joueur 1", "joueur 2"):
+        battlefield = Battlefield(0, 10 * fleet_size, -1, 1, -1, 1,
+                                  6 * fleet_size)
+        for x in range(fleet_size):
+            vessel_type = Cruiser if x % 2 == 0 else Submarine
+            battlefield.add_vessel(vessel_type(x, 0, 0))
+        game.add_player(Player(name, battlefield))
+    return game
+
+
+def measure(action, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        action()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(fleet_size: int = 10, repeat: int = 200):
+    game = create_game(fleet_size)
+    dao = GameDao()
+    dao.create_game(game)
+
+    binary = encode_game(game)
+    text = json.dumps(game_to_dict(game)).encode('utf-8')
+    results = [
+        ("binaire", len(binary),
+         measure(lambda: encode_game(game), repeat),
+         measure(lambda: decode_game(binary), repeat)),
+        ("json", len(text),
+         measure(lambda: json.dumps(game_to_dict(game)), repeat),
+         measure(lambda: game_from_dict(json.loads(text)), repeat)),
+        # Le chemin ORM n'a pas de taille comparable : l'écriture est une
+        # création complète de la partie, la lecture un find_game
+        ("orm", None,
+         measure(lambda: dao.create_game(create_game(fleet_size)),
+                 max(1, repeat // 10)),
+         measure(lambda: dao.find_game(game.get_id()), max(1, repeat // 10))),
+    ]
+    print(f"partie de 2 x {fleet_size} vaisseaux")
+    print(f"{'format':>8} {'octets':>8} {'encodage µs':>12} {'décodage µs':>12}")
+    for name, size, encode_time, decode_time in results:
+        size = '-' if size is None else size
+        print(f"{name:>8} {size:>8} {encode_time:12.1f} {decode_time:12.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
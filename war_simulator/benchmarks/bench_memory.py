@@ -0,0 +1,50 @@
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'model'))
+
+from cruiser import Cruiser  # noqa: E402
+
+
+class DictWeapon:
+    # Disposition mémoire des armes avant le passage à __slots__
+    def __init__(self, ammunitions: int, range: int):
+        self.id = None
+        self.ammunitions = ammunitions
+        self.range = range
+
+
+class DictVessel:
+    # Disposition mémoire des vaisseaux avant le passage à __slots__
+    def __init__(self, x: float, y: float, z: float, hits: int,
+                 weapon: DictWeapon):
+        self.id = None
+        self.battlefield = None
+        self._coordinates = x, y, z
+        self.hits_to_be_destroyed = hits
+        self.weapon = weapon
+
+
+def measure_bytes_per_vessel(create_vessel, count: int) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    vessels = [create_vessel(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # La liste elle-même ne fait pas partie du coût d'un vaisseau
+    return (after - before - sys.getsizeof(vessels)) / count
+
+
+def main(count: int = 100_000):
+    with_dict = measure_bytes_per_vessel(
+        lambda i: DictVessel(i, i, 0, 6, DictWeapon(50, 40)), count)
+    with_slots = measure_bytes_per_vessel(lambda i: Cruiser(i, i, 0), count)
+    print(f"vaisseaux : {count}")
+    print(f"avant (__dict__) : {with_dict:.0f} octets par vaisseau")
+    print(f"après (__slots__) : {with_slots:.0f} octets par vaisseau")
+    print(f"gain : {100 * (1 - with_slots / with_dict):.0f} %")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
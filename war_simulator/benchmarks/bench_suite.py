@@ -0,0 +1,296 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Suite de mesures des chemins critiques, couche par couche : modèle
+# (Battlefield), DAO (aller-retour en base SQLite) et HTTP (/shoot-at via
+# l'application FastAPI, puis /get-game avec 1, 10 et 100 clients
+# simultanés servis par les shards de GameEngine). Les résultats sont écrits en JSON et comparés à
+# des seuils : le code de sortie est 1 si l'un d'eux est franchi.
+#   PYTHONPATH=.:war_simulator/model python war_simulator/benchmarks/bench_suite.py \
+#       --output results.json [--baseline previous.json]
+THRESHOLDS_PATH = Path(__file__).resolve().parent / "thresholds.json"
+FLEET_SIZES = (10, 100, 1000, 10000, 100000)
+DAO_FLEET_SIZES = (10, 100)
+HTTP_SHOTS = 500
+HTTP_CONCURRENCY_LEVELS = (1, 10, 100)
+HTTP_CONCURRENT_REQUESTS = 2000
+HTTP_CONCURRENT_GAMES = 16
+
+
+def result(name: str, value: float, unit: str, better: str) -> dict:
+    return {"name": name, "value": value, "unit": unit, "better": better}
+
+
+def measure_per_operation(action, operations: int, repeat: int = 5,
+                          setup=None) -> float:
+    # Meilleur temps par opération sur repeat passages, en microsecondes :
+    # comme timeit, le minimum est moins sensible au bruit de la machine.
+    # setup, s'il est donné, est appelé hors mesure avant chaque passage.
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - start) / operations * 1e6)
+    return min(timings)
+
+
+def create_battlefield(fleet_size: int):
+    from war_simulator.model.battlefield import Battlefield
+    from war_simulator.model.submarine import Submarine
+    battlefield = Battlefield(0, fleet_size, 0, 10, -1, 1,
+                              Submarine.HITS * fleet_size)
+    for x in range(fleet_size):
+        battlefield.add_vessel(Submarine(x, 0, -1))
+    return battlefield
+
+
+def bench_model() -> list[dict]:
+    from war_simulator.model.battlefield import Battlefield
+    from war_simulator.model.submarine import Submarine
+    results = []
+    for fleet_size in FLEET_SIZES:
+        def add_vessels():
+            battlefield = Battlefield(0, fleet_size, 0, 10, -1, 1,
+                                      Submarine.HITS * fleet_size)
+            for x in range(fleet_size):
+                battlefield.add_vessel(Submarine(x, 0, -1))
+
+        battlefield = create_battlefield(fleet_size)
+        # Autant de tirs réussis que manqués, sur toute la flotte
+        targets = [(x, x % 2, -1) for x in range(min(fleet_size, 10000))]
+
+        def fire_at_fleet():
+            for x, y, z in targets:
+                battlefield.fired_at(x, y, z)
+
+        def get_power():
+            for _ in range(10000):
+                battlefield.get_power()
+
+        results += [
+            result(f"model.add_vessel[n={fleet_size}]",
+                   measure_per_operation(add_vessels, fleet_size, repeat=3),
+                   "us/op", "lower"),
+            result(f"model.fired_at[n={fleet_size}]",
+                   measure_per_operation(fire_at_fleet, len(targets)),
+                   "us/op", "lower"),
+            result(f"model.get_power[n={fleet_size}]",
+                   measure_per_operation(get_power, 10000),
+                   "us/op", "lower")]
+    return results
+
+
+def create_game(fleet_size: int):
+    from war_simulator.model.game import Game
+    from war_simulator.model.player import Player
+    game = Game()
+    for name in ("joueur 1", "joueur 2"):
+        game.add_player(Player(name, create_battlefield(fleet_size)))
+    return game
+
+
+def bench_dao() -> list[dict]:
+    from war_simulator.dao.game_dao import GameDao
+    dao = GameDao()
+    results = []
+    for fleet_size in DAO_FLEET_SIZES:
+        game_id = dao.create_game(create_game(fleet_size))
+        updated = {}
+
+        def create_updated_game():
+            # Une partie neuve à chaque passage : les 20 tirs touchent des
+            # sous-marins encore à flot (deux tirs chacun), comme en jeu
+            updated["game"] = create_game(fleet_size)
+            dao.create_game(updated["game"])
+
+        def update_game():
+            # Un tir modifie un seul vaisseau : seules sa ligne et
+            # l'historique des tirs du champ de bataille sont écrits
+            game = updated["game"]
+            battlefield = game.get_players()[1].get_battlefield()
+            vessels = battlefield.get_vessels()
+            for shot in range(20):
+                battlefield.fired_at(*vessels[shot // 2].get_coordinates())
+                dao.update_game(game)
+
+        results += [
+            result(f"dao.create_game[n={fleet_size}]",
+                   measure_per_operation(
+                       lambda: dao.create_game(create_game(fleet_size)), 1),
+                   "us/op", "lower"),
+            result(f"dao.find_game[n={fleet_size}]",
+                   measure_per_operation(lambda: dao.find_game(game_id), 1),
+                   "us/op", "lower"),
+            result(f"dao.update_game[n={fleet_size}]",
+                   measure_per_operation(update_game, 20, repeat=3,
+                                         setup=create_updated_game),
+                   "us/op", "lower")]
+    return results
+
+
+def create_http_game(client) -> list[tuple]:
+    # Partie dont le premier joueur a 4 frégates de 40 munitions chacune ;
+    # renvoie les tireurs (partie, vaisseau)
+    game_id = client.post("/create-game", json={
+        "player_name": "joueur 1", "min_x": 0, "max_x": 100, "min_y": 0,
+        "max_y": 100, "min_z": -1, "max_z": 1}).json()
+    client.post("/join-game", json={"game_id": game_id,
+                                    "player_name": "joueur 2"})
+    for player_name, y in (("joueur 1", 0), ("joueur 2", 50)):
+        for x in range(4):
+            client.post("/add-vessel", json={
+                "game_id": game_id, "player_name": player_name,
+                "vessel_type": "Frigate", "x": x, "y": y, "z": 0})
+    game = client.get("/get-game", params={"game_id": game_id}).json()
+    return [(game_id, vessel["vessel_id"])
+            for vessel in game["players"][0]["vessels"]]
+
+
+async def bench_http_concurrency(app) -> list[dict]:
+    # Débit de /get-game quand plusieurs clients attendent en même temps :
+    # les commandes s'exécutent dans les shards, la boucle asyncio reste
+    # libre pour les autres requêtes
+    import httpx
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport,
+                                 base_url="http://test") as client:
+        game_ids = []
+        for _ in range(HTTP_CONCURRENT_GAMES):
+            response = await client.post("/create-game", json={
+                "player_name": "joueur 1", "min_x": 0, "max_x": 100,
+                "min_y": 0, "max_y": 100, "min_z": -1, "max_z": 1})
+            game_ids.append(response.json())
+            await client.post("/add-vessels", json={
+                "game_id": game_ids[-1], "player_name": "joueur 1",
+                "vessels": [{"vessel_type": "Frigate", "x": x, "y": 0,
+                             "z": 0} for x in range(4)]})
+
+        async def run_client(client_index: int, request_count: int):
+            for request in range(request_count):
+                response = await client.get("/get-game", params={
+                    "game_id": game_ids[(client_index + request)
+                                        % len(game_ids)]})
+                response.raise_for_status()
+
+        results = []
+        for concurrency in HTTP_CONCURRENCY_LEVELS:
+            request_count = HTTP_CONCURRENT_REQUESTS // concurrency
+            start = time.perf_counter()
+            await asyncio.gather(*(run_client(client_index, request_count)
+                                   for client_index in range(concurrency)))
+            elapsed = time.perf_counter() - start
+            results.append(result(f"http.get_game[clients={concurrency}]",
+                                  request_count * concurrency / elapsed,
+                                  "req/s", "higher"))
+    return results
+
+
+def bench_http() -> list[dict]:
+    from fastapi.testclient import TestClient
+    from war_simulator.controllers.game_controller import app
+    # Avant TestClient, dont la sortie arrête GameEngine (httpx ne déclenche
+    # pas les événements de démarrage et d'arrêt de l'application)
+    results = asyncio.run(bench_http_concurrency(app))
+    with TestClient(app) as client:
+        shooters = []
+        while len(shooters) * 40 < HTTP_SHOTS:
+            shooters += create_http_game(client)
+        # Les tirs tombent dans l'eau : les parties ne se terminent pas
+        start = time.perf_counter()
+        for shot in range(HTTP_SHOTS):
+            game_id, vessel_id = shooters[shot % len(shooters)]
+            response = client.post("/shoot-at", json={
+                "game_id": game_id, "shooter_name": "joueur 1",
+                "vessel_id": vessel_id, "x": 5 + shot % 20, "y": 10, "z": 0})
+            response.raise_for_status()
+        elapsed = time.perf_counter() - start
+    return results + [result("http.shoot_at", HTTP_SHOTS / elapsed, "req/s",
+                             "higher")]
+
+
+LAYERS = {"model": bench_model, "dao": bench_dao, "http": bench_http}
+
+
+def check_thresholds(results: list[dict], thresholds: dict) -> list[str]:
+    # thresholds : {nom: {"max": valeur} ou {"min": valeur}}
+    failures = []
+    for entry in results:
+        limits = thresholds.get(entry["name"], {})
+        if "max" in limits and entry["value"] > limits["max"]:
+            failures.append(f"{entry['name']} : {entry['value']:.2f} "
+                            f"{entry['unit']} > {limits['max']}")
+        if "min" in limits and entry["value"] < limits["min"]:
+            failures.append(f"{entry['name']} : {entry['value']:.2f} "
+                            f"{entry['unit']} < {limits['min']}")
+    return failures
+
+
+def check_baseline(results: list[dict], baseline: list[dict],
+                   tolerance: float) -> list[str]:
+    # Régression de plus de tolerance (relative) par rapport à une
+    # exécution précédente
+    previous = {entry["name"]: entry["value"] for entry in baseline}
+    failures = []
+    for entry in results:
+        if entry["name"] not in previous:
+            continue
+        reference = previous[entry["name"]]
+        if entry["better"] == "lower":
+            regressed = entry["value"] > reference * (1 + tolerance)
+        else:
+            regressed = entry["value"] < reference * (1 - tolerance)
+        if regressed:
+            failures.append(f"{entry['name']} : {entry['value']:.2f} "
+                            f"{entry['unit']} contre {reference:.2f}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Mesure les chemins critiques et vérifie les seuils")
+    parser.add_argument("--layers", nargs="+", default=list(LAYERS),
+                        choices=list(LAYERS))
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    parser.add_argument("--thresholds", default=str(THRESHOLDS_PATH))
+    parser.add_argument("--baseline", help="résultats JSON de référence")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Base dédiée, avant le premier import du DAO
+        os.environ["TDLOG_DB_PATH"] = os.path.join(directory, "bench.db")
+        results = []
+        for layer in arguments.layers:
+            results += LAYERS[layer]()
+
+    report = {"python": platform.python_version(),
+              "machine": platform.machine(), "results": results}
+    text = json.dumps(report, indent=2)
+    if arguments.output:
+        Path(arguments.output).write_text(text)
+    else:
+        print(text)
+
+    with open(arguments.thresholds) as thresholds_file:
+        failures = check_thresholds(results, json.load(thresholds_file))
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline_file:
+            failures += check_baseline(results,
+                                       json.load(baseline_file)["results"],
+                                       arguments.tolerance)
+    for failure in failures:
+        print(f"RÉGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
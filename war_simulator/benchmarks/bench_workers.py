@@ -0,0 +1,102 @@
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+# Compare le débit du mode multi-processus (game_router) avec 1 processus
+# puis avec un processus par cœur. À lancer depuis la racine du dépôt :
+#   PYTHONPATH=.:war_simulator/model python war_simulator/benchmarks/bench_workers.py [requêtes] [processus]
+ROUTER_URL = "http://127.0.0.1:5000"
+GAME_COUNT = 32
+CONCURRENCY = 64
+REQUESTS = 2000
+WORKER_COUNT = os.cpu_count() or 1
+
+
+def start_cluster(worker_count: int, database_path: str) -> subprocess.Popen:
+    env = dict(os.environ, TDLOG_WORKER_COUNT=str(worker_count),
+               TDLOG_DB_PATH=database_path)
+    return subprocess.Popen(
+        [sys.executable, "-m", "war_simulator.controllers.game_router"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_until_ready(client: httpx.AsyncClient):
+    # Le routeur répond avant que tous les processus soient prêts :
+    # /cache-stats interroge chacun d'eux
+    for _ in range(300):
+        try:
+            response = await client.get("/cache-stats")
+            if response.status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("Le routeur ne répond pas")
+
+
+async def create_game(client: httpx.AsyncClient) -> int:
+    response = await client.post("/create-game", json={
+        "player_name": "joueur 1", "min_x": 0, "max_x": 100, "min_y": 0,
+        "max_y": 100, "min_z": -1, "max_z": 1})
+    game_id = response.json()
+    await client.post("/join-game", json={"game_id": game_id,
+                                          "player_name": "joueur 2"})
+    for player_name in ("joueur 1", "joueur 2"):
+        for x in range(4):
+            await client.post("/add-vessel", json={
+                "game_id": game_id, "player_name": player_name,
+                "vessel_type": "Frigate", "x": x, "y": 0, "z": 0})
+    return game_id
+
+
+async def measure_throughput(client: httpx.AsyncClient,
+                             game_ids: list[int]) -> float:
+    # Lectures complètes de parties réparties au hasard entre les parties
+    async def run_client(request_count: int):
+        for _ in range(request_count):
+            response = await client.get("/get-game", params={
+                "game_id": random.choice(game_ids)})
+            response.raise_for_status()
+
+    request_count = REQUESTS // CONCURRENCY
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(request_count)
+                           for _ in range(CONCURRENCY)))
+    return request_count * CONCURRENCY / (time.perf_counter() - start)
+
+
+async def bench_cluster(worker_count: int) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        cluster = start_cluster(worker_count,
+                                os.path.join(directory, "tdlog.db"))
+        try:
+            limits = httpx.Limits(max_connections=CONCURRENCY)
+            async with httpx.AsyncClient(base_url=ROUTER_URL, limits=limits,
+                                         timeout=None) as client:
+                await wait_until_ready(client)
+                game_ids = [await create_game(client)
+                            for _ in range(GAME_COUNT)]
+                return await measure_throughput(client, game_ids)
+        finally:
+            cluster.terminate()
+            cluster.wait()
+
+
+async def main():
+    for worker_count in sorted({1, WORKER_COUNT}):
+        throughput = await bench_cluster(worker_count)
+        print(f"{worker_count:>3} processus : {throughput:8.0f} requêtes/s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        REQUESTS = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        WORKER_COUNT = int(sys.argv[2])
+    asyncio.run(main())
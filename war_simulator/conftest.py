@@ -0,0 +1,13 @@
+import os
+import tempfile
+
+# Chargé par pytest avant les modules de test : game_dao lit TDLOG_DB_PATH
+# à l'import, les tests écrivent donc dans une base temporaire plutôt que
+# dans /tmp/tdlog.db, qu'un serveur lancé en local peut utiliser
+database_directory = tempfile.TemporaryDirectory()
+os.environ["TDLOG_DB_PATH"] = os.path.join(database_directory.name,
+                                           "tdlog_test.db")
+
+
+def pytest_unconfigure(config):
+    database_directory.cleanup()
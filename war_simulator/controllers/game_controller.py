@@ -1,90 +1,293 @@
+import asyncio
+import os
+import time
+from contextvars import ContextVar
+from pathlib import Path
+
 import uvicorn
 from starlette.staticfiles import StaticFiles
-from fastapi import FastAPI, Request, Path
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from war_simulator.model.game import Game
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response
+from starlette.routing import Match
+from war_simulator.controllers.game_data import CreateGameData, \
+    JoinGameData, AddVesselData, AddVesselsData, ShootAtData, ShootSalvoData
+from war_simulator.dao.game_event_log import game_to_dict
+from war_simulator.services.game_engine import GameEngine
+from war_simulator.services.game_profiler import GameProfiler
+from war_simulator.services.game_pubsub import GamePubSub
 from war_simulator.services.game_service import GameService
+from war_simulator.services.metrics import CONTENT_TYPE, MetricsRegistry
 
 app = FastAPI()
-game_service = GameService()
+pubsub = GamePubSub()
+# Lancé par game_router, ce processus ne reçoit que les parties dont
+# game_id % WORKER_COUNT vaut WORKER_INDEX
+WORKER_INDEX = int(os.environ.get("TDLOG_WORKER_INDEX", 0))
+WORKER_COUNT = int(os.environ.get("TDLOG_WORKER_COUNT", 1))
+# Exposées sur /metrics ; game_router réunit celles de ses processus, que
+# l'étiquette worker distingue
+metrics = MetricsRegistry({"worker": WORKER_INDEX} if WORKER_COUNT > 1
+                          else None)
+request_durations = metrics.histogram(
+    "tdlog_http_request_duration_seconds",
+    "Durée des requêtes HTTP, en secondes", ("method", "route"))
+request_counts = metrics.counter(
+    "tdlog_http_requests_total", "Nombre de requêtes HTTP",
+    ("method", "route", "status"))
+request_errors = metrics.counter(
+    "tdlog_http_request_errors_total",
+    "Requêtes HTTP terminées par une exception, par type d'exception",
+    ("route", "exception"))
+# Un GameService par shard : chaque partie est toujours traitée par le même
+# thread, qui est le seul à toucher sa copie en cache
+game_services = [
+    GameService(write_behind=os.environ.get("TDLOG_WRITE_BEHIND") == "1",
+                event_log=os.environ.get("TDLOG_EVENT_LOG") == "1",
+                archive_path=os.environ.get("TDLOG_ARCHIVE_PATH"),
+                pubsub=pubsub, metrics=metrics)
+    for _ in range(int(os.environ.get("TDLOG_ENGINE_SHARDS",
+                                      os.cpu_count() or 1)))]
+game_engine = GameEngine(game_services)
+if game_services[0].game_dao.write_behind:
+    game_engine.schedule(game_services[0].game_dao.flush_interval,
+                         GameService.flush_if_due)
+# Profilage des commandes, pour toutes les requêtes avec TDLOG_PROFILE=1 ou
+# pour celles qui portent l'en-tête PROFILE_HEADER ; les derniers profils
+# sont lus sur /debug/profiles
+PROFILE_HEADER = b"x-tdlog-profile"
+PROFILE_ALL = os.environ.get("TDLOG_PROFILE") == "1"
+profiler = GameProfiler(
+    capacity=int(os.environ.get("TDLOG_PROFILE_CAPACITY", 100)),
+    top_n=int(os.environ.get("TDLOG_PROFILE_TOP_N", 20)))
+profiling_requested = ContextVar("profiling_requested", default=False)
 BASE_PATH = Path(__file__).resolve().parent.parent
 app.mount("/views", StaticFiles(directory=BASE_PATH / 'views'), name="views")
 
 
-class CreateGameData(BaseModel):
-    player_name: str
-    min_x: int
-    max_x: int
-    min_y: int
-    max_y: int
-    min_z: int
-    max_z: int
+def get_route_path(scope) -> str:
+    # Chemin déclaré de la route plutôt que l'URL reçue, pour que le nombre
+    # de séries reste borné
+    for route in scope["app"].routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "inconnue"
+
+
+class RequestMetricsMiddleware:
+    # Durée, nombre et exceptions des requêtes HTTP par route. Middleware
+    # ASGI plutôt que @app.middleware("http"), qui ferait passer chaque
+    # réponse par une tâche et un flux supplémentaires.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route = get_route_path(scope)
+        status = 500
+
+        async def send_recording_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_recording_status)
+        except Exception as exc:
+            # Transformée en réponse 500 par exception_handler
+            status = 500
+            request_errors.inc(route, type(exc).__name__)
+            raise
+        finally:
+            request_durations.observe(time.perf_counter() - start,
+                                      scope["method"], route)
+            request_counts.inc(scope["method"], route, str(status))
+
 
+class ProfilingMiddleware:
+    # Marque la requête (ou la connexion WebSocket) à profiler : run_in_game
+    # lit la marque dans le contexte de la tâche qui la traite
+    def __init__(self, app):
+        self.app = app
 
-class JoinGameData(BaseModel):
-    game_id: int
-    player_name: str
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket") or not any(
+                name == PROFILE_HEADER and value == b"1"
+                for name, value in scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+        token = profiling_requested.set(True)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiling_requested.reset(token)
 
 
-class AddVesselData(BaseModel):
-    game_id: int
-    player_name: str
-    vessel_type: str
-    x: int
-    y: int
-    z: int
+app.add_middleware(RequestMetricsMiddleware)
+app.add_middleware(ProfilingMiddleware)
 
 
-class ShootAtData(BaseModel):
-    game_id: int
-    shooter_name: str
-    vessel_id: int
-    x: int
-    y: int
-    z: int
+def get_shard_key(game_id: int) -> int:
+    # Les ids reçus ont tous le même reste modulo WORKER_COUNT : les shards
+    # sont répartis sur le quotient
+    return game_id // WORKER_COUNT
+
+
+async def run_in_game(game_id, command, *args):
+    # La boucle asyncio n'est pas bloquée pendant que le shard de la partie
+    # exécute la commande
+    shard_key = get_shard_key(game_id) if game_id is not None else None
+    if PROFILE_ALL or profiling_requested.get():
+        command = profiler.wrap(command)
+    return await asyncio.wrap_future(
+        game_engine.submit(shard_key, command, *args))
 
 
 @app.post("/create-game")
 async def create_game(game_data: CreateGameData):
-    return game_service.create_game(game_data.player_name, game_data.min_x,
-                                    game_data.max_x, game_data.min_y,
-                                    game_data.max_y, game_data.min_z,
-                                    game_data.max_z)
+    # La partie est créée par un shard choisi à tour de rôle, avant que son id
+    # soit connu : GameCache ne garde pas les nouvelles parties, son shard la
+    # chargera à la première commande
+    return await run_in_game(None, GameService.create_game,
+                             game_data.player_name, game_data.min_x,
+                             game_data.max_x, game_data.min_y,
+                             game_data.max_y, game_data.min_z,
+                             game_data.max_z)
+
+
+def get_game_dict(game_service: GameService, game_id: int) -> dict:
+    # Les vaisseaux référencent leur champ de bataille : la partie est
+    # convertie comme dans le journal d'événements plutôt que par FastAPI,
+    # dans le shard, seul à toucher sa copie en cache
+    game = game_service.get_game(game_id)
+    return game_to_dict(game) if game is not None else None
 
 
 @app.get("/get-game")
-async def get_game(game_id: int) -> Game:
-    return game_service.get_game(game_id)
+async def get_game(game_id: int) -> dict:
+    return await run_in_game(game_id, get_game_dict, game_id)
 
 
 @app.post("/join-game")
 async def join_game(game_data: JoinGameData) -> bool:
-    return game_service.join_game(game_data.game_id, game_data.player_name)
+    return await run_in_game(game_data.game_id, GameService.join_game,
+                             game_data.game_id, game_data.player_name)
 
 
 @app.post("/add-vessel")
 async def add_vessel(game_data: AddVesselData) -> bool:
-    return game_service.add_vessel(game_data.game_id, game_data.player_name,
-                                   game_data.vessel_type, game_data.x,
-                                   game_data.y, game_data.z)
+    return await run_in_game(game_data.game_id, GameService.add_vessel,
+                             game_data.game_id, game_data.player_name,
+                             game_data.vessel_type, game_data.x,
+                             game_data.y, game_data.z)
+
+
+@app.post("/add-vessels")
+async def add_vessels(game_data: AddVesselsData) -> dict:
+    return await run_in_game(game_data.game_id, GameService.add_vessels,
+                             game_data.game_id, game_data.player_name,
+                             [(vessel.vessel_type, vessel.x, vessel.y,
+                               vessel.z) for vessel in game_data.vessels])
 
 
 @app.post("/shoot-at")
 async def shoot_at(game_data: ShootAtData) -> bool:
-    return game_service.shoot_at(game_data.game_id, game_data.shooter_name,
-                                 game_data.vessel_id, game_data.x,
-                                 game_data.y, game_data.z)
+    return await run_in_game(game_data.game_id, GameService.shoot_at,
+                             game_data.game_id, game_data.shooter_name,
+                             game_data.vessel_id, game_data.x,
+                             game_data.y, game_data.z)
+
+
+@app.post("/shoot-salvo")
+async def shoot_salvo(game_data: ShootSalvoData) -> list[bool]:
+    return await run_in_game(game_data.game_id, GameService.shoot_salvo,
+                             game_data.game_id, game_data.shooter_name,
+                             game_data.vessel_id,
+                             [(target.x, target.y, target.z)
+                              for target in game_data.targets])
 
 
 @app.get("/game-status")
 async def get_game_status(game_id: int, player_name: str) -> str:
-    return game_service.get_game_status(game_id, player_name)
+    return await run_in_game(game_id, GameService.get_game_status,
+                             game_id, player_name)
+
+
+@app.websocket("/ws/game-status")
+async def game_status_websocket(websocket: WebSocket, game_id: int,
+                                player_name: str):
+    # Remplace l'interrogation régulière de /game-status : le statut courant
+    # est envoyé à la connexion, puis chaque événement de la partie (arrivée
+    # de l'adversaire, résultats des tirs, fin de partie) dès qu'il a lieu
+    await websocket.accept()
+    queue = pubsub.subscribe(game_id)
+    # Le client n'envoie rien : attendre un message permet seulement de
+    # savoir qu'il s'est déconnecté, même si la partie n'évolue plus
+    disconnected = asyncio.ensure_future(websocket.receive_text())
+    try:
+        await websocket.send_json({
+            "type": "status",
+            "status": await run_in_game(game_id, GameService.get_game_status,
+                                        game_id, player_name)})
+        while True:
+            next_event = asyncio.ensure_future(queue.get())
+            await asyncio.wait({next_event, disconnected},
+                               return_when=asyncio.FIRST_COMPLETED)
+            if not next_event.done():
+                next_event.cancel()
+                break
+            event = next_event.result()
+            if event["type"] == "game_over":
+                event = {"type": "status",
+                         "status": "GAGNE" if event["winner"] == player_name
+                         else "PERDU"}
+            await websocket.send_json(event)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        pubsub.unsubscribe(game_id, queue)
+
+
+@app.get("/cache-stats")
+async def get_cache_stats() -> dict:
+    # Somme des statistiques des caches de tous les shards
+    stats = {}
+    for game_service in game_services:
+        for name, value in game_service.get_cache_stats().items():
+            stats[name] = stats.get(name, 0) + value
+    return stats
+
+
+@app.get("/metrics")
+async def get_metrics() -> Response:
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/debug/profiles")
+async def get_profiles(operation: str = None) -> list[dict]:
+    # Du plus récent au plus ancien, éventuellement pour une seule commande
+    # (shoot_at, add_vessel...)
+    return profiler.get_profiles(operation)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Les commandes en cours se terminent avant la dernière écriture des
+    # parties modifiées
+    game_engine.close()
+    for game_service in game_services:
+        game_service.close()
 
 
 @app.exception_handler(Exception)
 async def exception_handler(request: Request, exc: Exception):
-    return JSONResponse(status_code=500, content={"message": f"{exc}"})
+    return JSONResponse(status_code=500, content={
+        "message": f"{exc}", "error": type(exc).__name__})
 
 
 if __name__ == "__main__":
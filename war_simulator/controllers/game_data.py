@@ -0,0 +1,60 @@
+from pydantic import BaseModel
+
+
+class CreateGameData(BaseModel):
+    player_name: str
+    min_x: int
+    max_x: int
+    min_y: int
+    max_y: int
+    min_z: int
+    max_z: int
+
+
+class JoinGameData(BaseModel):
+    game_id: int
+    player_name: str
+
+
+class AddVesselData(BaseModel):
+    game_id: int
+    player_name: str
+    vessel_type: str
+    x: int
+    y: int
+    z: int
+
+
+class VesselData(BaseModel):
+    vessel_type: str
+    x: int
+    y: int
+    z: int
+
+
+class AddVesselsData(BaseModel):
+    game_id: int
+    player_name: str
+    vessels: list[VesselData]
+
+
+class ShootAtData(BaseModel):
+    game_id: int
+    shooter_name: str
+    vessel_id: int
+    x: int
+    y: int
+    z: int
+
+
+class TargetData(BaseModel):
+    x: int
+    y: int
+    z: int
+
+
+class ShootSalvoData(BaseModel):
+    game_id: int
+    shooter_name: str
+    vessel_id: int
+    targets: list[TargetData]
@@ -0,0 +1,196 @@
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import httpx
+import uvicorn
+import websockets
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response
+from starlette.staticfiles import StaticFiles
+from war_simulator.dao.game_dao import GameDao
+from war_simulator.dao.game_event_log import GameEventLog
+from war_simulator.services.metrics import CONTENT_TYPE, merge_expositions
+
+# Mode multi-processus : WORKER_COUNT processus game_controller écoutent sur
+# les ports WORKER_BASE_PORT, WORKER_BASE_PORT + 1... et ce routeur envoie
+# chaque requête au processus qui possède la partie (game_id % WORKER_COUNT).
+# Une partie n'est donc chargée et modifiée que par un seul processus, avec
+# son cache et ses abonnés WebSocket, et chaque processus occupe un cœur.
+#   python -m war_simulator.controllers.game_router
+WORKER_COUNT = int(os.environ.get("TDLOG_WORKER_COUNT", os.cpu_count() or 1))
+WORKER_BASE_PORT = int(os.environ.get("TDLOG_WORKER_BASE_PORT", 5001))
+WORKER_HOST = "127.0.0.1"
+# En-tête de profilage de game_controller, transmis aux processus
+PROFILE_HEADER = "x-tdlog-profile"
+
+app = FastAPI()
+BASE_PATH = Path(__file__).resolve().parent.parent
+app.mount("/views", StaticFiles(directory=BASE_PATH / 'views'), name="views")
+worker_clients = [
+    httpx.AsyncClient(base_url=f"http://{WORKER_HOST}:{WORKER_BASE_PORT + index}",
+                      timeout=None)
+    for index in range(WORKER_COUNT)]
+next_worker = itertools.cycle(range(WORKER_COUNT))
+
+
+def get_worker(game_id: int) -> int:
+    return game_id % WORKER_COUNT
+
+
+def get_game_id(request_params, body: bytes):
+    # L'id de la partie est dans la requête (GET) ou dans le corps JSON
+    # (POST) ; la création d'une partie n'en a pas encore. Un id qui n'est
+    # pas un entier ou un corps qui n'est pas du JSON donnent None : la
+    # requête est transmise à un processus quelconque, qui la refuse avec
+    # la même erreur 422 que sans routeur.
+    try:
+        if "game_id" in request_params:
+            return int(request_params["game_id"])
+        if body:
+            data = json.loads(body)
+            if isinstance(data, dict) and "game_id" in data:
+                return int(data["game_id"])
+    except (ValueError, TypeError):
+        pass
+    return None
+
+
+def get_forwarded_headers(request) -> dict:
+    headers = {"content-type": request.headers.get("content-type",
+                                                   "application/json")}
+    if PROFILE_HEADER in request.headers:
+        headers[PROFILE_HEADER] = request.headers[PROFILE_HEADER]
+    return headers
+
+
+async def forward(client: httpx.AsyncClient, request: Request,
+                  body: bytes) -> httpx.Response:
+    return await client.request(
+        request.method, request.url.path, params=request.query_params,
+        content=body, headers=get_forwarded_headers(request))
+
+
+@app.get("/cache-stats")
+async def get_cache_stats() -> dict:
+    # Somme des statistiques de tous les processus
+    stats = {}
+    for client in worker_clients:
+        response = await client.get("/cache-stats")
+        for name, value in response.json().items():
+            stats[name] = stats.get(name, 0) + value
+    return stats
+
+
+@app.get("/metrics")
+async def get_metrics() -> Response:
+    # Métriques de tous les processus, distinguées par l'étiquette worker
+    responses = await asyncio.gather(*(client.get("/metrics")
+                                       for client in worker_clients))
+    return Response(
+        content=merge_expositions([response.text for response in responses]),
+        media_type=CONTENT_TYPE)
+
+
+@app.get("/debug/profiles")
+async def get_profiles(operation: str = None) -> list[dict]:
+    # Profils de tous les processus, du plus récent au plus ancien
+    params = {"operation": operation} if operation is not None else {}
+    responses = await asyncio.gather(*(client.get("/debug/profiles",
+                                                  params=params)
+                                       for client in worker_clients))
+    profiles = [dict(profile, worker=worker)
+                for worker, response in enumerate(responses)
+                for profile in response.json()]
+    return sorted(profiles, key=lambda profile: profile["timestamp"],
+                  reverse=True)
+
+
+@app.api_route("/{path:path}", methods=["GET", "POST"])
+async def route(request: Request, path: str):
+    body = await request.body()
+    game_id = get_game_id(request.query_params, body)
+    worker = next(next_worker) if game_id is None else get_worker(game_id)
+    response = await forward(worker_clients[worker], request, body)
+    return Response(content=response.content,
+                    status_code=response.status_code,
+                    media_type=response.headers.get("content-type"))
+
+
+@app.websocket("/ws/game-status")
+async def game_status_websocket(websocket: WebSocket, game_id: int):
+    # Les événements d'une partie ne sont publiés que dans son processus :
+    # la WebSocket est relayée vers celui-ci
+    await websocket.accept()
+    port = WORKER_BASE_PORT + get_worker(game_id)
+    url = f"ws://{WORKER_HOST}:{port}{websocket.url.path}" \
+          f"?{websocket.url.query}"
+    async with websockets.connect(url) as worker_websocket:
+        async def relay_to_client():
+            async for message in worker_websocket:
+                await websocket.send_text(message)
+
+        async def relay_to_worker():
+            try:
+                while True:
+                    await worker_websocket.send(await websocket.receive_text())
+            except WebSocketDisconnect:
+                pass
+
+        tasks = [asyncio.ensure_future(relay_to_client()),
+                 asyncio.ensure_future(relay_to_worker())]
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in tasks:
+            task.cancel()
+    await websocket.close()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    for client in worker_clients:
+        await client.aclose()
+
+
+@app.exception_handler(Exception)
+async def exception_handler(request: Request, exc: Exception):
+    return JSONResponse(status_code=500, content={"message": f"{exc}"})
+
+
+def create_tables():
+    # Sinon les processus créent tous les tables au même moment en démarrant
+    GameDao()
+    GameEventLog()
+
+
+def start_workers() -> list[subprocess.Popen]:
+    create_tables()
+    workers = []
+    for index in range(WORKER_COUNT):
+        env = dict(os.environ, TDLOG_WORKER_INDEX=str(index),
+                   TDLOG_WORKER_COUNT=str(WORKER_COUNT))
+        # Un cœur par processus : un seul shard par défaut dans chacun
+        env.setdefault("TDLOG_ENGINE_SHARDS", "1")
+        # Les fichiers de l'archive ne sont pas partagés entre processus
+        if "TDLOG_ARCHIVE_PATH" in env:
+            env["TDLOG_ARCHIVE_PATH"] += f"-{index}"
+        workers.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn",
+             "war_simulator.controllers.game_controller:app",
+             "--host", WORKER_HOST, "--port", str(WORKER_BASE_PORT + index),
+             "--log-level", "warning"], env=env))
+    return workers
+
+
+if __name__ == "__main__":
+    workers = start_workers()
+    try:
+        uvicorn.run(app, host="0.0.0.0", port=5000)
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait()
@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from war_simulator.controllers import game_router
+from war_simulator.controllers.game_router import get_game_id, get_worker
+
+
+class TestGameRouter(TestCase):
+    def test_get_game_id_from_query(self):
+        # Act
+        game_id = get_game_id({"game_id": "12", "player_name": "joueur"}, b"")
+
+        # Assert
+        self.assertEqual(12, game_id)
+
+    def test_get_game_id_from_body(self):
+        # Act
+        game_id = get_game_id({}, b'{"game_id": 7, "player_name": "joueur"}')
+
+        # Assert
+        self.assertEqual(7, game_id)
+
+    def test_get_game_id_without_id(self):
+        # Act
+        game_ids = [get_game_id({}, b""),
+                    get_game_id({}, b'{"player_name": "joueur"}'),
+                    get_game_id({}, b'[1, 2]')]
+
+        # Assert
+        self.assertEqual([None, None, None], game_ids)
+
+    def test_get_game_id_invalid(self):
+        # Act
+        game_ids = [get_game_id({"game_id": "douze"}, b""),
+                    get_game_id({}, b'{"game_id": "douze"}'),
+                    get_game_id({}, b'{"game_id": null}'),
+                    get_game_id({}, b'{"game_id": 7')]
+
+        # Assert
+        self.assertEqual([None, None, None, None], game_ids)
+
+    def test_get_worker(self):
+        # Arrange
+        worker_count = game_router.WORKER_COUNT
+
+        # Act
+        workers = [get_worker(game_id) for game_id in range(2 * worker_count)]
+
+        # Assert
+        self.assertEqual(list(range(worker_count)), workers[:worker_count])
+        self.assertEqual(workers[:worker_count], workers[worker_count:])
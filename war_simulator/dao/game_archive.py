@@ -0,0 +1,243 @@
+import mmap
+import os
+import struct
+import threading
+from typing import Iterator
+
+from war_simulator.dao.game_codec import VESSEL_TAGS, WEAPON_TAGS, \
+    VESSEL_TYPE_NAMES, WEAPON_TYPE_NAMES, id_or_minus_one
+from war_simulator.model.game import Game
+
+# Archive des parties terminées sous forme de trois fichiers
+# d'enregistrements de taille fixe, lus par mmap sans copie :
+#   <chemin>.vessels : id de la partie, index du joueur, id du vaisseau,
+#                      type, x, y, z, points de vie, type de l'arme,
+#                      munitions restantes, portée
+#   <chemin>.shots   : id de la partie, index du joueur visé, x, y, z,
+#                      touché (1) ou manqué (0), d'après l'historique des
+#                      tirs de son champ de bataille (par case, sans l'ordre
+#                      des tirs), enregistré en base avec lui : il est
+#                      complet même si la partie a été rechargée
+#   <chemin>.games   : id de la partie, index du joueur gagnant (-1 si
+#                      aucun), premier enregistrement de vaisseau, nombre de
+#                      vaisseaux, premier enregistrement de tir, nombre de
+#                      tirs
+VESSEL_RECORD = struct.Struct('<iBiB3iiBii')
+SHOT_RECORD = struct.Struct('<iB3iB')
+GAME_RECORD = struct.Struct('<ibQIQI')
+# Les fichiers doivent rester alignés : un seul écrivain à la fois
+WRITE_LOCK = threading.Lock()
+
+
+class VesselView:
+    # Vue sur un enregistrement de vaisseau : les champs sont lus à la
+    # demande dans le fichier mappé, sans créer de Vessel
+    __slots__ = ('buffer', 'offset')
+
+    def __init__(self, buffer, offset: int):
+        self.buffer = buffer
+        self.offset = offset
+
+    def get_record(self) -> tuple:
+        return VESSEL_RECORD.unpack_from(self.buffer, self.offset)
+
+    @property
+    def game_id(self) -> int:
+        return self.get_record()[0]
+
+    @property
+    def player_index(self) -> int:
+        return self.get_record()[1]
+
+    @property
+    def vessel_type(self) -> str:
+        return VESSEL_TYPE_NAMES[self.get_record()[3]]
+
+    @property
+    def coordinates(self) -> tuple:
+        return self.get_record()[4:7]
+
+    @property
+    def hits(self) -> int:
+        return self.get_record()[7]
+
+    @property
+    def weapon_type(self) -> str:
+        return WEAPON_TYPE_NAMES[self.get_record()[8]]
+
+    @property
+    def ammunitions(self) -> int:
+        return self.get_record()[9]
+
+
+class ShotView:
+    # Vue sur un enregistrement de tir, comme VesselView
+    __slots__ = ('buffer', 'offset')
+
+    def __init__(self, buffer, offset: int):
+        self.buffer = buffer
+        self.offset = offset
+
+    def get_record(self) -> tuple:
+        return SHOT_RECORD.unpack_from(self.buffer, self.offset)
+
+    @property
+    def game_id(self) -> int:
+        return self.get_record()[0]
+
+    @property
+    def player_index(self) -> int:
+        return self.get_record()[1]
+
+    @property
+    def coordinates(self) -> tuple:
+        return self.get_record()[2:5]
+
+    @property
+    def hit(self) -> bool:
+        return self.get_record()[5] == 1
+
+
+class GameView:
+    __slots__ = ('archive', 'game_id', 'winner', 'first_vessel',
+                 'vessel_count', 'first_shot', 'shot_count')
+
+    def __init__(self, archive: 'GameArchiveReader', game_id: int, winner: int,
+                 first_vessel: int, vessel_count: int, first_shot: int,
+                 shot_count: int):
+        self.archive = archive
+        self.game_id = game_id
+        self.winner = winner
+        self.first_vessel = first_vessel
+        self.vessel_count = vessel_count
+        self.first_shot = first_shot
+        self.shot_count = shot_count
+
+    def get_vessels(self) -> Iterator[VesselView]:
+        return self.archive.iter_vessels(self.first_vessel,
+                                         self.first_vessel + self.vessel_count)
+
+    def get_shots(self) -> Iterator[ShotView]:
+        return self.archive.iter_shots(self.first_shot,
+                                       self.first_shot + self.shot_count)
+
+
+class GameArchiveWriter:
+    def __init__(self, path: str):
+        self.vessels_path = path + '.vessels'
+        self.shots_path = path + '.shots'
+        self.games_path = path + '.games'
+
+    def append(self, game: Game):
+        self.append_many([game])
+
+    def append_many(self, games: list[Game]):
+        with WRITE_LOCK, open(self.vessels_path, 'ab') as vessels_file, \
+                open(self.shots_path, 'ab') as shots_file, \
+                open(self.games_path, 'ab') as games_file:
+            first_vessel = vessels_file.tell() // VESSEL_RECORD.size
+            first_shot = shots_file.tell() // SHOT_RECORD.size
+            for game in games:
+                vessel_count = 0
+                shot_count = 0
+                for player_index, player in enumerate(game.get_players()):
+                    for x, y, z, hit in iter_shots(player.get_battlefield()):
+                        shots_file.write(SHOT_RECORD.pack(
+                            game.get_id(), player_index, x, y, z, hit))
+                        shot_count += 1
+                    for vessel in player.get_battlefield().get_vessels():
+                        x, y, z = vessel.get_coordinates()
+                        weapon = vessel.get_weapon()
+                        vessels_file.write(VESSEL_RECORD.pack(
+                            game.get_id(), player_index, id_or_minus_one(vessel.id),
+                            VESSEL_TAGS[type(vessel).__name__], x, y, z,
+                            vessel.get_hits(),
+                            WEAPON_TAGS[type(weapon).__name__],
+                            weapon.get_ammunitions(), weapon.get_range()))
+                        vessel_count += 1
+                games_file.write(GAME_RECORD.pack(
+                    game.get_id(), get_winner(game), first_vessel,
+                    vessel_count, first_shot, shot_count))
+                first_vessel += vessel_count
+                first_shot += shot_count
+
+
+class GameArchiveReader:
+    def __init__(self, path: str):
+        self.vessels = map_file(path + '.vessels')
+        self.shots = map_file(path + '.shots')
+        self.games = map_file(path + '.games')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for mapped_file in (self.vessels, self.shots, self.games):
+            if isinstance(mapped_file, mmap.mmap):
+                mapped_file.close()
+
+    def get_vessel_count(self) -> int:
+        return len(self.vessels) // VESSEL_RECORD.size
+
+    def get_shot_count(self) -> int:
+        return len(self.shots) // SHOT_RECORD.size
+
+    def get_game_count(self) -> int:
+        return len(self.games) // GAME_RECORD.size
+
+    def iter_vessel_records(self) -> Iterator[tuple]:
+        # Le plus rapide pour parcourir toute l'archive : des tuples
+        # décodés directement depuis le fichier mappé
+        return VESSEL_RECORD.iter_unpack(self.vessels)
+
+    def iter_vessels(self, start: int = 0, stop: int = None) \
+            -> Iterator[VesselView]:
+        if stop is None:
+            stop = self.get_vessel_count()
+        for row in range(start, stop):
+            yield VesselView(self.vessels, row * VESSEL_RECORD.size)
+
+    def iter_shot_records(self) -> Iterator[tuple]:
+        return SHOT_RECORD.iter_unpack(self.shots)
+
+    def iter_shots(self, start: int = 0, stop: int = None) \
+            -> Iterator[ShotView]:
+        if stop is None:
+            stop = self.get_shot_count()
+        for row in range(start, stop):
+            yield ShotView(self.shots, row * SHOT_RECORD.size)
+
+    def iter_games(self) -> Iterator[GameView]:
+        for record in GAME_RECORD.iter_unpack(self.games):
+            yield GameView(self, *record)
+
+
+def map_file(path: str):
+    # mmap refuse les fichiers vides
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return b''
+    with open(path, 'rb') as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_shots(battlefield) -> Iterator[tuple]:
+    # x, y, z et touché (1) ou manqué (0) de chaque case visée ; un champ de
+    # bataille jamais visé n'a pas d'historique, qui n'est pas créé ici
+    shot_history = battlefield.shot_history
+    if shot_history is None:
+        return
+    for x, y, z, hit in shot_history.iter_shots():
+        yield x, y, z, int(hit)
+
+
+def get_winner(game: Game) -> int:
+    players = game.get_players()
+    for player_index, player in enumerate(players):
+        opponents = [p for p in players if p is not player]
+        if opponents and all(opponent.get_battlefield().all_vessels_destroyed()
+                             for opponent in opponents):
+            return player_index
+    return -1
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+
+from war_simulator.dao.game_dao import GameDao
+from war_simulator.model.game import Game
+
+
+class GameCache:
+    # Cache LRU des parties en cours devant GameDao. Par défaut les écritures
+    # sont transmises immédiatement au DAO (write-through) ; en mode
+    # write-behind, les parties modifiées sont mises de côté et écrites
+    # ensemble, au plus tard toutes les flush_interval secondes.
+    def __init__(self, game_dao: GameDao, max_size: int = 128,
+                 write_behind: bool = False, flush_interval: float = 1.0):
+        self.game_dao = game_dao
+        self.max_size = max_size
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.games: OrderedDict[int, Game] = OrderedDict()
+        self.pending_games: dict[int, Game] = {}
+        # Actions des parties en attente, écrites avec elles
+        self.pending_events: dict[int, list[tuple]] = {}
+        self.last_flush = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.flushes = 0
+        # Le cache peut être partagé par plusieurs threads de requêtes
+        self.lock = threading.RLock()
+
+    def create_game(self, game: Game, events: list[tuple] = ()):
+        return self.game_dao.create_game(game, events)
+
+    def find_game(self, game_id: int) -> Game:
+        with self.lock:
+            game = self.games.get(game_id)
+            if game is not None:
+                self.hits += 1
+                self.games.move_to_end(game_id)
+                return game
+            self.misses += 1
+            game = self.game_dao.find_game(game_id)
+            self.put(game)
+            return game
+
+    def update_game(self, game: Game, events: list[tuple] = ()):
+        with self.lock:
+            if not self.write_behind:
+                self.game_dao.update_game(game, events)
+                self.put(game)
+                return
+            self.put(game)
+            self.pending_games[game.get_id()] = game
+            self.pending_events.setdefault(game.get_id(), []).extend(events)
+            self.flush_if_due()
+
+    def flush_if_due(self):
+        # Appelée à chaque écriture et, pour qu'une partie inactive ne reste
+        # pas indéfiniment en attente, toutes les flush_interval secondes
+        # (GameService.flush_if_due, planifiée par game_controller)
+        with self.lock:
+            if self.pending_games and \
+                    time.monotonic() - self.last_flush >= self.flush_interval:
+                self.flush()
+
+    def flush(self, game_id: int = None):
+        # Écrit les parties en attente (ou seulement game_id) en une
+        # seule transaction
+        with self.lock:
+            if game_id is None:
+                games = list(self.pending_games.values())
+                events = self.pending_events
+                self.pending_games.clear()
+                self.pending_events = {}
+                self.last_flush = time.monotonic()
+            elif game_id in self.pending_games:
+                games = [self.pending_games.pop(game_id)]
+                events = {game_id: self.pending_events.pop(game_id, [])}
+            else:
+                return
+            games = [game for game in games
+                     if game.is_dirty() or events.get(game.get_id())]
+            if games:
+                self.game_dao.update_games(games, events)
+                self.flushes += 1
+
+    def put(self, game: Game):
+        with self.lock:
+            if game is None or game.get_id() is None:
+                return
+            self.games[game.get_id()] = game
+            self.games.move_to_end(game.get_id())
+            while len(self.games) > self.max_size:
+                evicted_id, _ = self.games.popitem(last=False)
+                self.evictions += 1
+                # Une partie ne quitte pas le cache avant d'avoir été écrite
+                self.flush(evicted_id)
+
+    def invalidate(self, game_id: int):
+        with self.lock:
+            self.games.pop(game_id, None)
+            self.pending_games.pop(game_id, None)
+            self.pending_events.pop(game_id, None)
+
+    def get_stats(self) -> dict:
+        return {"size": len(self.games), "max_size": self.max_size,
+                "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions,
+                "pending": len(self.pending_games), "flushes": self.flushes}
@@ -0,0 +1,115 @@
+import struct
+from typing import BinaryIO, Iterator
+
+from war_simulator.dao.game_dao import build_vessel
+from war_simulator.model.battlefield import Battlefield
+from war_simulator.model.game import Game
+from war_simulator.model.player import Player
+
+# Format binaire compact d'une partie (entiers little-endian, -1 pour un
+# identifiant absent) :
+#   en-tête    : magique, version, id de la partie, nombre de joueurs
+#   par joueur : id, id du champ de bataille, longueur du nom, nom (UTF-8),
+#                limites et puissance maximale, nombre de vaisseaux, puis
+#                un enregistrement de taille fixe par vaisseau
+MAGIC = b'TDLG'
+VERSION = 1
+GAME_HEADER = struct.Struct('<4sBiB')
+PLAYER_HEADER = struct.Struct('<iiH')
+BATTLEFIELD_RECORD = struct.Struct('<7iI')
+# id, type, x, y, z, points de vie, id de l'arme, type de l'arme, munitions,
+# portée
+VESSEL_RECORD = struct.Struct('<iB3iiiBii')
+GAME_LENGTH = struct.Struct('<I')
+
+VESSEL_TYPE_NAMES = ("Vessel", "Cruiser", "Destroyer", "Frigate", "Submarine")
+WEAPON_TYPE_NAMES = ("Weapon", "AirMissileLauncher", "SurfaceMissileLauncher",
+                     "TorpedoLauncher")
+VESSEL_TAGS = {name: tag for tag, name in enumerate(VESSEL_TYPE_NAMES)}
+WEAPON_TAGS = {name: tag for tag, name in enumerate(WEAPON_TYPE_NAMES)}
+
+
+def encode_game(game: Game) -> bytes:
+    chunks = [GAME_HEADER.pack(MAGIC, VERSION, id_or_minus_one(game.get_id()),
+                               len(game.get_players()))]
+    for player in game.get_players():
+        battlefield = player.get_battlefield()
+        name = player.get_name().encode('utf-8')
+        chunks.append(PLAYER_HEADER.pack(id_or_minus_one(player.id),
+                                         id_or_minus_one(battlefield.id),
+                                         len(name)))
+        chunks.append(name)
+        chunks.append(BATTLEFIELD_RECORD.pack(
+            battlefield.min_x, battlefield.max_x, battlefield.min_y,
+            battlefield.max_y, battlefield.min_z, battlefield.max_z,
+            battlefield.max_power, len(battlefield.vessels)))
+        for vessel in battlefield.vessels:
+            x, y, z = vessel.get_coordinates()
+            weapon = vessel.get_weapon()
+            chunks.append(VESSEL_RECORD.pack(
+                id_or_minus_one(vessel.id), VESSEL_TAGS[type(vessel).__name__],
+                x, y, z, vessel.get_hits(), id_or_minus_one(weapon.id),
+                WEAPON_TAGS[type(weapon).__name__], weapon.get_ammunitions(),
+                weapon.get_range()))
+    return b''.join(chunks)
+
+
+def decode_game(data: bytes) -> Game:
+    view = memoryview(data)
+    magic, version, game_id, player_count = GAME_HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Format de partie inconnu !")
+    offset = GAME_HEADER.size
+    game = Game(id_or_none(game_id))
+    for _ in range(player_count):
+        player_id, battlefield_id, name_length = \
+            PLAYER_HEADER.unpack_from(view, offset)
+        offset += PLAYER_HEADER.size
+        name = bytes(view[offset:offset + name_length]).decode('utf-8')
+        offset += name_length
+        min_x, max_x, min_y, max_y, min_z, max_z, max_power, vessel_count = \
+            BATTLEFIELD_RECORD.unpack_from(view, offset)
+        offset += BATTLEFIELD_RECORD.size
+        battlefield = Battlefield(min_x, max_x, min_y, max_y, min_z, max_z,
+                                  max_power)
+        battlefield.id = id_or_none(battlefield_id)
+        vessels_end = offset + vessel_count * VESSEL_RECORD.size
+        for vessel_id, vessel_tag, x, y, z, hits, weapon_id, weapon_tag, \
+                ammunitions, weapon_range in VESSEL_RECORD.iter_unpack(
+                    view[offset:vessels_end]):
+            vessel = build_vessel(VESSEL_TYPE_NAMES[vessel_tag], x, y, z, hits,
+                                  WEAPON_TYPE_NAMES[weapon_tag], ammunitions,
+                                  weapon_range)
+            vessel.id = id_or_none(vessel_id)
+            vessel.get_weapon().id = id_or_none(weapon_id)
+            battlefield.add_vessel(vessel)
+        offset = vessels_end
+        player = Player(name, battlefield)
+        player.id = id_or_none(player_id)
+        game.add_player(player)
+    game.mark_clean()
+    return game
+
+
+def dump_games(games: list[Game], file: BinaryIO):
+    # Chaque partie est précédée de sa longueur
+    for game in games:
+        data = encode_game(game)
+        file.write(GAME_LENGTH.pack(len(data)))
+        file.write(data)
+
+
+def load_games(file: BinaryIO) -> Iterator[Game]:
+    while True:
+        length = file.read(GAME_LENGTH.size)
+        if not length:
+            return
+        yield decode_game(file.read(GAME_LENGTH.unpack(length)[0]))
+
+
+def id_or_minus_one(id) -> int:
+    return -1 if id is None else id
+
+
+def id_or_none(id: int):
+    return None if id == -1 else id
@@ -1,17 +1,84 @@
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, select
+import os
+import struct
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event, Column, Integer, String, ForeignKey, select, delete, insert, func, \
+    LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy import orm
+from sqlalchemy.orm import sessionmaker, relationship, selectinload
+from sqlalchemy.pool import QueuePool
+from war_simulator.dao.query_log import create_query_log
+from war_simulator.model.air_missile_launcher import AirMissileLauncher
+from war_simulator.model.cruiser import Cruiser
+from war_simulator.model.destroyer import Destroyer
+from war_simulator.model.frigate import Frigate
 from war_simulator.model.game import Game
 from war_simulator.model.player import Player
+from war_simulator.model.submarine import Submarine
+from war_simulator.model.surface_missile_launcher import SurfaceMissileLauncher
+from war_simulator.model.torpedos_launcher import TorpedoLauncher
 from war_simulator.model.vessel import Vessel
 from war_simulator.model.battlefield import Battlefield
 from war_simulator.model.weapon import Weapon
 
-engine = create_engine('sqlite:////tmp/tdlog.db', echo=True, future=True)
+# Historique des tirs d'un champ de bataille : x, y, z et touché (1) ou
+# manqué (0) de chaque cellule visée, à la suite
+SHOT_RECORD = struct.Struct('<3iB')
+DATABASE_PATH = os.environ.get("TDLOG_DB_PATH", "/tmp/tdlog.db")
+POOL_SIZE = int(os.environ.get("TDLOG_DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.environ.get("TDLOG_DB_MAX_OVERFLOW", "10"))
+POOL_PRE_PING = os.environ.get("TDLOG_DB_POOL_PRE_PING", "1") == "1"
+# Affichage de toutes les requêtes par SQLAlchemy, synchrone et coûteux :
+# pour le développement seulement, query_log suffit sinon
+SQL_ECHO = os.environ.get("TDLOG_SQL_ECHO") == "1"
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL : les lectures ne bloquent plus les écritures, y compris entre
+    # plusieurs processus ; synchronous=NORMAL suffit en WAL et évite un
+    # fsync par transaction ; busy_timeout fait attendre un verrou au lieu
+    # d'échouer immédiatement
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA cache_size=-16000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+engine = create_engine(f'sqlite:///{DATABASE_PATH}', echo=SQL_ECHO, future=True,
+                       poolclass=QueuePool, pool_size=POOL_SIZE,
+                       max_overflow=MAX_OVERFLOW, pool_pre_ping=POOL_PRE_PING,
+                       connect_args={"check_same_thread": False})
+event.listen(engine, "connect", set_sqlite_pragmas)
+query_log = create_query_log(engine)
 Base = declarative_base(bind=engine)
 Session = sessionmaker(bind=engine)
 
 
+@contextmanager
+def session_scope():
+    # Une session par unité de travail (une requête, une écriture groupée),
+    # validée en cas de succès et annulée en cas d'erreur
+    db_session = Session()
+    try:
+        yield db_session
+        db_session.commit()
+    except Exception:
+        db_session.rollback()
+        raise
+    finally:
+        db_session.close()
+
+VESSEL_TYPES = {vessel_type.__name__: vessel_type
+                for vessel_type in (Cruiser, Destroyer, Frigate, Submarine)}
+WEAPON_TYPES = {weapon_type.__name__: weapon_type
+                for weapon_type in (AirMissileLauncher,
+                                    SurfaceMissileLauncher, TorpedoLauncher)}
+
+
 class GameEntity(Base):
     __tablename__ = 'game'
     id = Column(Integer, primary_key=True)
@@ -39,10 +106,12 @@ class BattlefieldEntity(Base):
     max_y = Column(Integer, nullable=False)
     max_z = Column(Integer, nullable=False)
     max_power = Column(Integer, nullable=False)
+    # SHOT_RECORD à la suite, NULL tant qu'aucun tir n'a visé ce champ
+    shots = Column(LargeBinary, nullable=True)
     player_id = Column(Integer, ForeignKey("player.id"), nullable=False)
     player = relationship("PlayerEntity", back_populates="battlefield")
-    vessel = relationship("VesselEntity", back_populates="battlefield",
-                          uselist=False, cascade="all, delete-orphan")
+    vessels = relationship("VesselEntity", back_populates="battlefield",
+                           cascade="all, delete-orphan")
 
 
 class VesselEntity(Base):
@@ -54,7 +123,7 @@ class VesselEntity(Base):
     hits_to_be_destroyed = Column(Integer, nullable=False)
     type = Column(String, nullable=False)
     battlefield_id = Column(Integer, ForeignKey("battlefield.id"), nullable=False)
-    battlefield = relationship("BattlefieldEntity", back_populates="vessel")
+    battlefield = relationship("BattlefieldEntity", back_populates="vessels")
     weapon = relationship("WeaponEntity", back_populates="vessel",
                           uselist=False, cascade="all, delete-orphan")
 
@@ -70,48 +139,204 @@ class WeaponEntity(Base):
 
 
 class GameDao:
-    def __init__(self):
+    # Si event_log est donné (un GameEventLog), les actions passées à
+    # create_game et update_game(s) y sont écrites dans la même transaction
+    # que la partie
+    def __init__(self, event_log=None):
         Base.metadata.create_all()
-        self.db_session = Session()
+        self.event_log = event_log
 
-    def create_game(self, game: Game) -> int:
-        game_entity = map_to_game_entity(game)
-        self.db_session.add(game_entity)
-        self.db_session.commit()
-        return game_entity
+    def create_game(self, game: Game, events: list[tuple] = ()) -> int:
+        with session_scope() as db_session:
+            game_id = insert_game(db_session, game)
+            self.write_events(db_session, game, events)
+        game.mark_clean()
+        return game_id
 
     def create_vessel(self, battlefield_id: int, vessel: Vessel) -> int:
-        vessel_entity = map_to_vessel_entity(battlefield_id, vessel)
-        self.db_session.add(vessel_entity)
-        self.db_session.commit()
-        return vessel_entity
+        with session_scope() as db_session:
+            vessel_entity = map_to_vessel_entity(battlefield_id, vessel)
+            db_session.add(vessel_entity)
+            db_session.flush()
+            assign_vessel_ids(vessel, vessel_entity)
+        vessel.mark_clean()
+        return vessel.id
 
     def create_player(self, player: Player, game_id) -> int:
-        player_entity = map_to_player_entity(player, game_id)
-        self.db_session.add(player_entity)
-        self.db_session.commit()
-        return player_entity
+        with session_scope() as db_session:
+            player_entity = map_to_player_entity(player, game_id)
+            db_session.add(player_entity)
+            db_session.flush()
+            assign_player_ids(player, player_entity)
+        player.get_battlefield().mark_clean()
+        return player.id
 
     def find_game(self, game_id: int) -> Game:
-        stmt = select(GameEntity).where(GameEntity.id == game_id)
-        game_entity = self.db_session.scalars(stmt).one()
-        return map_to_game(game_entity)
+        with session_scope() as db_session:
+            return select_game(db_session, game_id)
 
     def find_vessel(self, vessel_id: int) -> Vessel:
-        stmt = select(VesselEntity).where(VesselEntity.id == vessel_id)
-        vessel_entity = self.db_session.scalars(stmt).one()
-        return map_to_vessel(vessel_entity)
+        with session_scope() as db_session:
+            stmt = select(VesselEntity).where(VesselEntity.id == vessel_id)
+            vessel_entity = db_session.scalars(stmt).one()
+            return map_to_vessel(vessel_entity)
 
     def find_player(self, player_id: int) -> Player:
-        stmt = select(PlayerEntity).where(PlayerEntity.id == player_id)
-        player_entity = self.db_session.scalars(stmt).one()
-        return map_to_player(player_entity)
+        with session_scope() as db_session:
+            stmt = select(PlayerEntity).where(PlayerEntity.id == player_id)
+            player_entity = db_session.scalars(stmt).one()
+            return map_to_player(player_entity)
+
+    def update_game(self, game: Game, events: list[tuple] = ()):
+        self.update_games([game], {game.get_id(): events})
+
+    def update_games(self, games: list[Game],
+                     events: dict[int, list[tuple]] = None):
+        # events : actions de chaque partie, par id de partie
+        with session_scope() as db_session:
+            write_games(db_session, games)
+            for game in games:
+                self.write_events(db_session, game,
+                                  (events or {}).get(game.get_id(), ()))
+        for game in games:
+            game.mark_clean()
+
+    def write_events(self, session: orm.Session, game: Game,
+                     events: list[tuple]):
+        if self.event_log is not None:
+            self.event_log.write_events(session, game, events)
+
+
+# Les fonctions suivantes ne font que lire ou écrire dans la session reçue,
+# sans valider la transaction : c'est à l'appelant (GameDao) de le faire.
+
+def insert_game(session: orm.Session, game: Game) -> int:
+    game_entity = map_to_game_entity(game)
+    session.add(game_entity)
+    session.flush()
+    game.id = game_entity.id
+    for player, player_entity in zip(game.get_players(),
+                                     game_entity.players):
+        assign_player_ids(player, player_entity)
+    return game_entity.id
+
+
+def select_game(session: orm.Session, game_id: int) -> Game:
+    # Toute la partie est chargée en un nombre fixe de requêtes, quelle
+    # que soit la taille des flottes : une pour la partie, une pour les
+    # joueurs et leurs champs de bataille, une pour les vaisseaux et
+    # leurs armes
+    stmt = select(GameEntity).where(GameEntity.id == game_id).options(
+        selectinload(GameEntity.players)
+        .joinedload(PlayerEntity.battlefield)
+        .selectinload(BattlefieldEntity.vessels)
+        .joinedload(VesselEntity.weapon))
+    game_entity = session.scalars(stmt).one_or_none()
+    if game_entity is None:
+        return None
+    return map_to_game(game_entity)
+
+
+def write_games(session: orm.Session, games: list[Game]):
+    # Seules les lignes modifiées depuis la dernière écriture (suivies
+    # par les drapeaux dirty du modèle) sont écrites
+    new_players = []
+    new_vessels: dict[Battlefield, list[Vessel]] = {}
+    vessel_rows = []
+    weapon_rows = []
+    battlefield_rows = []
+    removed_vessel_ids = []
+    for game in games:
+        for player in game.get_players():
+            if player.id is None:
+                player_entity = map_to_player_entity(player, game.get_id())
+                session.add(player_entity)
+                new_players.append((player, player_entity))
+                continue
+            battlefield = player.get_battlefield()
+            for vessel in battlefield.dirty_vessels:
+                if vessel.id is None:
+                    new_vessels.setdefault(battlefield, []).append(vessel)
+                    continue
+                if vessel.dirty:
+                    vessel_rows.append(map_to_vessel_row(vessel))
+                if vessel.weapon.dirty:
+                    weapon_rows.append(map_to_weapon_row(vessel.weapon))
+            removed_vessel_ids.extend(
+                vessel.id for vessel in battlefield.removed_vessels)
+            if battlefield.shots_dirty:
+                battlefield_rows.append(
+                    {"id": battlefield.id,
+                     "shots": encode_shots(battlefield.shot_history)})
+    if battlefield_rows:
+        session.bulk_update_mappings(BattlefieldEntity, battlefield_rows)
+    if vessel_rows:
+        session.bulk_update_mappings(VesselEntity, vessel_rows)
+    if weapon_rows:
+        session.bulk_update_mappings(WeaponEntity, weapon_rows)
+    if removed_vessel_ids:
+        session.execute(delete(WeaponEntity).where(
+            WeaponEntity.vessel_id.in_(removed_vessel_ids)))
+        session.execute(delete(VesselEntity).where(
+            VesselEntity.id.in_(removed_vessel_ids)))
+    for battlefield, vessels in new_vessels.items():
+        insert_vessels(session, battlefield, vessels)
+    session.flush()
+    for player, player_entity in new_players:
+        assign_player_ids(player, player_entity)
+
+
+def insert_vessels(session: orm.Session, battlefield: Battlefield,
+                   vessels: list[Vessel]):
+    # Insertion groupée des nouveaux vaisseaux d'un champ de bataille déjà
+    # enregistré : une requête (executemany) pour les vaisseaux, une pour
+    # leurs armes et deux lectures d'ids, quel que soit leur nombre. SQLite
+    # donne aux lignes insérées, dans l'ordre, des ids supérieurs à tous
+    # ceux de la table au moment de l'insertion : ce sont les lignes de ce
+    # champ de bataille au-delà de son plus grand id, lu dans la même
+    # transaction (après la suppression des vaisseaux retirés, dont les ids
+    # peuvent être réutilisés).
+    last_id = session.scalar(
+        select(func.max(VesselEntity.id)).where(
+            VesselEntity.battlefield_id == battlefield.id)) or 0
+    session.execute(insert(VesselEntity.__table__),
+                    [dict(map_to_vessel_row(vessel), id=None,
+                          type=type(vessel).__name__,
+                          battlefield_id=battlefield.id)
+                     for vessel in vessels])
+    new_vessel_ids = select(VesselEntity.id).where(
+        VesselEntity.battlefield_id == battlefield.id,
+        VesselEntity.id > last_id)
+    vessel_ids = session.scalars(
+        new_vessel_ids.order_by(VesselEntity.id)).all()
+    if len(vessel_ids) != len(vessels):
+        raise RuntimeError(f"{len(vessels)} vaisseaux insérés mais "
+                           f"{len(vessel_ids)} ids relus")
+    session.execute(insert(WeaponEntity.__table__),
+                    [{"ammunitions": vessel.weapon.ammunitions,
+                      "range": vessel.weapon.range,
+                      "type": type(vessel.weapon).__name__,
+                      "vessel_id": vessel_id}
+                     for vessel, vessel_id in zip(vessels, vessel_ids)])
+    weapon_ids = dict(session.execute(
+        select(WeaponEntity.vessel_id, WeaponEntity.id).where(
+            WeaponEntity.vessel_id.in_(new_vessel_ids))).all())
+    for vessel, vessel_id in zip(vessels, vessel_ids):
+        vessel.id = vessel_id
+        vessel.weapon.id = weapon_ids[vessel_id]
+
+
+def assign_player_ids(player: Player, player_entity: PlayerEntity):
+    player.id = player_entity.id
+    player.get_battlefield().id = player_entity.battlefield.id
+    for vessel, vessel_entity in zip(player.get_battlefield().vessels,
+                                     player_entity.battlefield.vessels):
+        assign_vessel_ids(vessel, vessel_entity)
+
 
-    def update_game(self, game: Game):
-        game_entity =map_to_game_entity(game)
-        self.db_session.merge(game_entity)              #La méthode merge de la session SQLAlchemy
-        self.db_session.commit()                        # permet de mettre à jour
-                                                        # une entité en base de données.
+def assign_vessel_ids(vessel: Vessel, vessel_entity: VesselEntity):
+    vessel.id = vessel_entity.id
+    vessel.weapon.id = vessel_entity.weapon.id
 
 
 def map_to_game_entity(game: Game) -> GameEntity:
@@ -119,17 +344,8 @@ def map_to_game_entity(game: Game) -> GameEntity:
     if game.get_id() is not None:
         game_entity.id = game.get_id()
     for player in game.get_players():
-        player_entity = PlayerEntity()
-        player_entity.id = player.id
-        player_entity.name = player.get_name()
-        battlefield_entity = map_to_battlefield_entity(
-            player.get_battlefield())
-        vessel_entities = \
-            map_to_vessel_entities(player.id.get_battlefield(),
-                                   player.get_battlefield().vessels)
-        battlefield_entity.vessels = vessel_entities
-        player_entity.battle_field = battlefield_entity
-        game_entity.players.append(player_entity)
+        game_entity.players.append(
+            map_to_player_entity(player, game.get_id()))
     return game_entity
 
 
@@ -155,15 +371,27 @@ def map_to_vessel_entity(battlefield_id: int, vessel: Vessel) -> VesselEntity:
     vessel_entity.coord_x = vessel.coordinates[0]
     vessel_entity.coord_y = vessel.coordinates[1]
     vessel_entity.coord_z = vessel.coordinates[2]
-    vessel_entity.battle_field_id = battlefield_id
+    vessel_entity.battlefield_id = battlefield_id
     return vessel_entity
 
 
+def map_to_vessel_row(vessel: Vessel) -> dict:
+    return {"id": vessel.id,
+            "coord_x": vessel.coordinates[0],
+            "coord_y": vessel.coordinates[1],
+            "coord_z": vessel.coordinates[2],
+            "hits_to_be_destroyed": vessel.hits_to_be_destroyed}
+
+
+def map_to_weapon_row(weapon: Weapon) -> dict:
+    return {"id": weapon.id, "ammunitions": weapon.ammunitions}
+
+
 def map_to_player_entity(player: Player, game_id: int) -> PlayerEntity:
     player_entity = PlayerEntity()
     player_entity.id = player.id
     player_entity.name = player.name
-    player_entity.battle_field = map_to_battlefield_entity(
+    player_entity.battlefield = map_to_battlefield_entity(
         player.get_battlefield())
     player_entity.game_id = game_id
     return player_entity
@@ -179,6 +407,9 @@ def map_to_battlefield_entity(battlefield: Battlefield) -> BattlefieldEntity:
     battlefield_entity.min_y = battlefield.min_y
     battlefield_entity.min_z = battlefield.min_z
     battlefield_entity.max_power = battlefield.max_power
+    battlefield_entity.shots = encode_shots(battlefield.shot_history)
+    battlefield_entity.vessels = map_to_vessel_entities(battlefield.id,
+                                                        battlefield.vessels)
     return battlefield_entity
 
 
@@ -191,24 +422,40 @@ def map_to_battlefield(battlefield_entity: BattlefieldEntity) -> Battlefield:
     max_z = battlefield_entity.max_z
     max_power = battlefield_entity.max_power
     battlefield = Battlefield(min_x, max_x, min_y, max_y, min_z, max_z, max_power)
+    battlefield.id = battlefield_entity.id
+    for vessel_entity in battlefield_entity.vessels:
+        battlefield.add_vessel(map_to_vessel(vessel_entity))
+    if battlefield_entity.shots is not None:
+        shot_history = battlefield.get_shot_history()
+        for x, y, z, hit in SHOT_RECORD.iter_unpack(battlefield_entity.shots):
+            shot_history.record(x, y, z, hit == 1)
+    battlefield.mark_clean()
     return battlefield
 
 
+def encode_shots(shot_history) -> bytes:
+    # Proportionnel au nombre de cellules visées, pas au volume : les
+    # champs de bits ne sont pas écrits tels quels
+    if shot_history is None:
+        return None
+    return b"".join(SHOT_RECORD.pack(x, y, z, hit)
+                    for x, y, z, hit in shot_history.iter_shots())
+
+
 def map_to_player(player_entity) -> Player:
     name = player_entity.name
-    battle_field = map_to_battlefield(player_entity.battle_field)
+    battle_field = map_to_battlefield(player_entity.battlefield)
     player = Player(name, battle_field)
     player.id = player_entity.id
     return player
 
 
 def map_to_game(game_entity: GameEntity) -> Game:
-    global game
-    if game_entity.id is not None:
-        game = Game(game_entity.id)
+    game = Game(game_entity.id)
     for player_entity in game_entity.players:
         player = map_to_player(player_entity)
         game.add_player(player)
+    game.mark_clean()
     return game
 
 
@@ -219,13 +466,27 @@ def map_to_vessel(vessel_entity: VesselEntity) -> Vessel:
     hits = vessel_entity.hits_to_be_destroyed
     ammunition = vessel_entity.weapon.ammunitions
     rayon = vessel_entity.weapon.range
-    weapon = Weapon(ammunition, rayon)
-    vessel = Vessel(x, y, z, hits, weapon)
+    vessel = build_vessel(vessel_entity.type, x, y, z, hits,
+                          vessel_entity.weapon.type, ammunition, rayon)
+    vessel.id = vessel_entity.id
+    vessel.weapon.id = vessel_entity.weapon.id
     return vessel
 
 
-
-
-
-
-
+def build_vessel(vessel_type: str, x, y, z, hits: int, weapon_type: str,
+                 ammunitions: int, range: int) -> Vessel:
+    # Recrée un vaisseau de la bonne classe à partir de son état enregistré
+    if vessel_type in VESSEL_TYPES:
+        vessel = VESSEL_TYPES[vessel_type](x, y, z)
+        vessel.hits_to_be_destroyed = hits
+        weapon = vessel.weapon
+        weapon.ammunitions = ammunitions
+    else:
+        if weapon_type in WEAPON_TYPES:
+            weapon = WEAPON_TYPES[weapon_type]()
+            weapon.ammunitions = ammunitions
+        else:
+            weapon = Weapon(ammunitions, range)
+        vessel = Vessel(x, y, z, hits, weapon)
+    vessel.mark_clean()
+    return vessel
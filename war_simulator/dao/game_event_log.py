@@ -0,0 +1,218 @@
+import json
+
+from sqlalchemy import Column, Integer, String, Text, select, insert, \
+    func, orm
+
+from war_simulator.dao.game_dao import Base, session_scope, build_vessel
+from war_simulator.model.battlefield import Battlefield
+from war_simulator.model.game import Game
+from war_simulator.model.player import Player
+
+GAME_CREATED = "game_created"
+PLAYER_JOINED = "player_joined"
+VESSEL_PLACED = "vessel_placed"
+SHOT_FIRED = "shot_fired"
+HIT = "hit"
+
+
+class GameEventEntity(Base):
+    __tablename__ = 'game_event'
+    id = Column(Integer, primary_key=True)
+    game_id = Column(Integer, nullable=False, index=True)
+    type = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)
+
+
+class GameSnapshotEntity(Base):
+    __tablename__ = 'game_snapshot'
+    id = Column(Integer, primary_key=True)
+    game_id = Column(Integer, nullable=False, index=True)
+    last_event_id = Column(Integer, nullable=False)
+    payload = Column(Text, nullable=False)
+
+
+class GameEventLog:
+    # Journal des actions de chaque partie, en ajout seul : une petite ligne
+    # par action. Les actions sont écrites par GameDao dans la transaction
+    # qui écrit l'état de la partie, le journal et les tables de la partie
+    # sont donc toujours d'accord. Il sert à l'audit et au rejeu (load_game
+    # reconstruit une partie à partir du dernier instantané, pris toutes les
+    # snapshot_interval actions, et des actions qui le suivent) : les parties
+    # sont toujours relues depuis leurs tables, jamais depuis le journal.
+    def __init__(self, snapshot_interval: int = 100):
+        Base.metadata.create_all(tables=[GameEventEntity.__table__,
+                                         GameSnapshotEntity.__table__])
+        self.snapshot_interval = snapshot_interval
+
+    def append(self, game: Game, event_type: str, payload: dict):
+        self.append_many(game, [(event_type, payload)])
+
+    def append_many(self, game: Game, events: list[tuple[str, dict]]):
+        with session_scope() as db_session:
+            self.write_events(db_session, game, events)
+
+    def write_events(self, session: orm.Session, game: Game,
+                     events: list[tuple[str, dict]]):
+        # Écrit dans la session reçue, sans valider la transaction. Une
+        # action peut porter une fonction plutôt qu'un dictionnaire : elle
+        # est appelée ici, une fois la partie écrite et les ids des
+        # nouveaux joueurs et vaisseaux connus.
+        if not events:
+            return
+        game_id = game.get_id()
+        session.execute(
+            insert(GameEventEntity),
+            [{"game_id": game_id, "type": event_type,
+              "payload": json.dumps(payload() if callable(payload)
+                                    else payload)}
+             for event_type, payload in events])
+        # Actions depuis le dernier instantané, comptées en base dans la
+        # même transaction : le compte reste juste après un redémarrage et
+        # quand plusieurs processus écrivent
+        last_snapshot_event_id = select(
+            func.coalesce(func.max(GameSnapshotEntity.last_event_id), 0)) \
+            .where(GameSnapshotEntity.game_id == game_id).scalar_subquery()
+        count, last_event_id = session.execute(
+            select(func.count(GameEventEntity.id),
+                   func.max(GameEventEntity.id))
+            .where(GameEventEntity.game_id == game_id,
+                   GameEventEntity.id > last_snapshot_event_id)).one()
+        if count >= self.snapshot_interval:
+            session.execute(insert(GameSnapshotEntity).values(
+                game_id=game_id, last_event_id=last_event_id,
+                payload=json.dumps(game_to_dict(game))))
+
+    def get_events(self, game_id: int, after_event_id: int = 0) -> list[dict]:
+        with session_scope() as db_session:
+            rows = db_session.execute(
+                select(GameEventEntity.id, GameEventEntity.type,
+                       GameEventEntity.payload)
+                .where(GameEventEntity.game_id == game_id,
+                       GameEventEntity.id > after_event_id)
+                .order_by(GameEventEntity.id)).all()
+        return [{"id": event_id, "type": event_type,
+                 "payload": json.loads(payload)}
+                for event_id, event_type, payload in rows]
+
+    def load_game(self, game_id: int) -> Game:
+        with session_scope() as db_session:
+            last_snapshot_id = db_session.execute(
+                select(func.max(GameSnapshotEntity.id))
+                .where(GameSnapshotEntity.game_id == game_id)).scalar()
+            snapshot = None
+            if last_snapshot_id is not None:
+                snapshot = db_session.execute(
+                    select(GameSnapshotEntity.last_event_id,
+                           GameSnapshotEntity.payload)
+                    .where(GameSnapshotEntity.id == last_snapshot_id)).one()
+        if snapshot is None:
+            game = None
+            last_event_id = 0
+        else:
+            game = game_from_dict(json.loads(snapshot.payload))
+            last_event_id = snapshot.last_event_id
+        for event in self.get_events(game_id, last_event_id):
+            game = apply_event(game, game_id, event["type"], event["payload"])
+        if game is not None:
+            game.mark_clean()
+        return game
+
+
+def apply_event(game: Game, game_id: int, event_type: str,
+                payload: dict) -> Game:
+    if event_type == GAME_CREATED:
+        game = Game(game_id)
+        game.add_player(player_from_dict(payload))
+        return game
+    if event_type == PLAYER_JOINED:
+        game.add_player(player_from_dict(payload))
+        return game
+    player = next(p for p in game.get_players()
+                  if p.get_name() == payload["player_name"])
+    battlefield = player.get_battlefield()
+    if event_type == VESSEL_PLACED:
+        vessel = build_vessel(payload["vessel_type"], payload["x"],
+                              payload["y"], payload["z"], payload["hits"],
+                              payload["weapon_type"], payload["ammunitions"],
+                              payload["range"])
+        vessel.id = payload["vessel_id"]
+        vessel.get_weapon().id = payload["weapon_id"]
+        battlefield.add_vessel(vessel)
+    elif event_type == SHOT_FIRED:
+        # Un tir refusé par l'arme consomme quand même une munition : il est
+        # rejoué tel quel et son erreur est ignorée. Un tir parti est d'abord
+        # compté comme manqué dans l'historique de l'adversaire ; l'événement
+        # HIT qui le suit éventuellement le corrige.
+        vessel = battlefield.get_vessel_by_coordinates(*payload["from"])
+        try:
+            vessel.fire_at(*payload["target"])
+        except Exception:
+            return game
+        opponent = next((p for p in game.get_players() if p is not player),
+                        None)
+        if opponent is not None:
+            opponent.get_battlefield().get_shot_history().record(
+                *payload["target"], hit=False)
+    elif event_type == HIT:
+        battlefield.fired_at(payload["x"], payload["y"], payload["z"])
+    return game
+
+
+def battlefield_to_dict(battlefield: Battlefield) -> dict:
+    return {"min_x": battlefield.min_x, "max_x": battlefield.max_x,
+            "min_y": battlefield.min_y, "max_y": battlefield.max_y,
+            "min_z": battlefield.min_z, "max_z": battlefield.max_z,
+            "max_power": battlefield.max_power}
+
+
+def battlefield_from_dict(data: dict) -> Battlefield:
+    battlefield = Battlefield(data["min_x"], data["max_x"], data["min_y"],
+                              data["max_y"], data["min_z"], data["max_z"],
+                              data["max_power"])
+    battlefield.id = data["battlefield_id"]
+    return battlefield
+
+
+def player_to_dict(player: Player) -> dict:
+    battlefield = player.get_battlefield()
+    return dict(battlefield_to_dict(battlefield), player_name=player.get_name(),
+                player_id=player.id, battlefield_id=battlefield.id)
+
+
+def player_from_dict(data: dict) -> Player:
+    player = Player(data["player_name"], battlefield_from_dict(data))
+    player.id = data["player_id"]
+    return player
+
+
+def vessel_placed_payload(player_name: str, vessel) -> dict:
+    x, y, z = vessel.get_coordinates()
+    weapon = vessel.get_weapon()
+    return {"player_name": player_name, "vessel_id": vessel.id,
+            "vessel_type": type(vessel).__name__, "x": x, "y": y, "z": z,
+            "hits": vessel.get_hits(), "weapon_id": weapon.id,
+            "weapon_type": type(weapon).__name__,
+            "ammunitions": weapon.get_ammunitions(),
+            "range": weapon.get_range()}
+
+
+def game_to_dict(game: Game) -> dict:
+    players = []
+    for player in game.get_players():
+        player_data = player_to_dict(player)
+        player_data["vessels"] = [
+            vessel_placed_payload(player.get_name(), vessel)
+            for vessel in player.get_battlefield().get_vessels()]
+        players.append(player_data)
+    return {"id": game.get_id(), "players": players}
+
+
+def game_from_dict(data: dict) -> Game:
+    game = Game(data["id"])
+    for player_data in data["players"]:
+        player = player_from_dict(player_data)
+        game.add_player(player)
+        for vessel_data in player_data["vessels"]:
+            apply_event(game, game.get_id(), VESSEL_PLACED, vessel_data)
+    game.mark_clean()
+    return game
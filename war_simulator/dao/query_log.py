@@ -0,0 +1,132 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Journal des requêtes SQL, à la place de echo=True : chaque requête est
+# chronométrée, mais seules les requêtes lentes (au-delà de
+# TDLOG_SLOW_QUERY_MS) et une fraction tirée au hasard des autres
+# (TDLOG_QUERY_SAMPLE_RATE) sont journalisées. Les paramètres liés sont
+# masqués sauf avec TDLOG_QUERY_LOG_PARAMS=1.
+SLOW_QUERY_MS = float(os.environ.get("TDLOG_SLOW_QUERY_MS", 50))
+QUERY_SAMPLE_RATE = float(os.environ.get("TDLOG_QUERY_SAMPLE_RATE", 0.01))
+QUERY_LOG_PARAMS = os.environ.get("TDLOG_QUERY_LOG_PARAMS") == "1"
+QUERY_LOGGER_NAME = "war_simulator.sql"
+
+
+class JsonFormatter(logging.Formatter):
+    # Un objet JSON par ligne, avec les champs passés dans extra
+    FIELDS = ("statement", "duration_ms", "slow", "parameters", "rows")
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {"time": record.created, "level": record.levelname,
+                 "logger": record.name, "message": record.getMessage()}
+        for field in self.FIELDS:
+            if hasattr(record, field):
+                entry[field] = getattr(record, field)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def redact_parameters(parameters, show: bool):
+    # Types des paramètres seulement (les noms des joueurs, par exemple,
+    # n'apparaissent pas dans le journal), sauf si show
+    if show:
+        return parameters
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__
+                for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class QueryLog:
+    # Écouteurs d'événements du moteur SQLAlchemy. Le journal est écrit par
+    # un QueueHandler : le thread qui exécute la requête ne fait que déposer
+    # l'enregistrement dans une file, et un QueueListener (son propre
+    # thread) le transmet aux handlers, qui font les entrées-sorties.
+    def __init__(self, slow_query_ms: float = SLOW_QUERY_MS,
+                 sample_rate: float = QUERY_SAMPLE_RATE,
+                 show_parameters: bool = QUERY_LOG_PARAMS,
+                 handlers: list[logging.Handler] = None,
+                 rng: random.Random = None):
+        self.slow_query_ms = slow_query_ms
+        self.sample_rate = sample_rate
+        self.show_parameters = show_parameters
+        self.random = (rng if rng is not None else random.Random()).random
+        if handlers is None:
+            handler = logging.StreamHandler()
+            handler.setFormatter(JsonFormatter())
+            handlers = [handler]
+        self.queue = queue.SimpleQueue()
+        self.listener = logging.handlers.QueueListener(
+            self.queue, *handlers, respect_handler_level=True)
+        # Un logger propre à chaque journal, hors de la hiérarchie de
+        # logging.getLogger : son unique QueueHandler est ajouté ici, et deux
+        # journaux (ceux des tests, celui de create_query_log) ne reçoivent
+        # jamais les enregistrements l'un de l'autre
+        self.logger = logging.Logger(QUERY_LOGGER_NAME, logging.INFO)
+        self.logger.addHandler(logging.handlers.QueueHandler(self.queue))
+        self.listener.start()
+
+    def attach(self, engine: Engine):
+        event.listen(engine, "before_cursor_execute",
+                     self.before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self.after_cursor_execute)
+        event.listen(engine, "handle_error", self.handle_error)
+
+    def before_cursor_execute(self, connection, cursor, statement,
+                              parameters, context, executemany):
+        connection.info.setdefault("query_start_times", []).append(
+            time.perf_counter())
+
+    def handle_error(self, exception_context):
+        # after_cursor_execute n'est pas appelée quand la requête échoue :
+        # son heure de début est retirée ici
+        connection = exception_context.connection
+        if connection is None or exception_context.execution_context is None:
+            return
+        start_times = connection.info.get("query_start_times")
+        if start_times:
+            start_times.pop()
+
+    def after_cursor_execute(self, connection, cursor, statement,
+                             parameters, context, executemany):
+        duration_ms = (time.perf_counter()
+                       - connection.info["query_start_times"].pop()) * 1000
+        slow = duration_ms >= self.slow_query_ms
+        if not slow and (self.sample_rate <= 0
+                         or self.random() >= self.sample_rate):
+            return
+        extra = {"statement": statement, "duration_ms": round(duration_ms, 3),
+                 "slow": slow}
+        if executemany:
+            # Une ligne de paramètres par ligne écrite : seul leur nombre
+            # est gardé
+            extra["rows"] = len(parameters)
+        else:
+            extra["parameters"] = redact_parameters(parameters,
+                                                    self.show_parameters)
+        self.logger.log(logging.WARNING if slow else logging.INFO,
+                        "requête SQL lente" if slow else "requête SQL",
+                        extra=extra)
+
+    def close(self):
+        # Vide la file avant de rendre la main
+        self.listener.stop()
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+
+
+def create_query_log(engine: Engine) -> QueryLog:
+    query_log = QueryLog()
+    query_log.attach(engine)
+    atexit.register(query_log.close)
+    return query_log
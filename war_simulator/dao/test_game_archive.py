@@ -0,0 +1,124 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from war_simulator.dao.game_archive import GameArchiveWriter, \
+    GameArchiveReader
+from war_simulator.dao.game_dao import GameDao
+from war_simulator.model.battlefield import Battlefield
+from war_simulator.model.cruiser import Cruiser
+from war_simulator.model.game import Game
+from war_simulator.model.player import Player
+from war_simulator.model.submarine import Submarine
+
+
+def create_finished_game(game_id: int) -> Game:
+    game = Game(game_id)
+    battlefield_1 = Battlefield(0, 100, 0, 100, -10, 10)
+    battlefield_1.add_vessel(Cruiser(1, 1, 0))
+    game.add_player(Player("joueur 1", battlefield_1))
+    battlefield_2 = Battlefield(0, 100, 0, 100, -10, 10)
+    battlefield_2.add_vessel(Submarine(2, 2, -1))
+    game.add_player(Player("joueur 2", battlefield_2))
+    battlefield_1.get_vessel_by_coordinates(1, 1, 0).fire_at(4, 4, 4)
+    battlefield_2.fired_at(2, 2, -1)
+    battlefield_2.fired_at(2, 2, -1)
+    return game
+
+
+class TestGameArchive(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'archive')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_iter_games_and_vessels(self):
+        # Arrange
+        writer = GameArchiveWriter(self.path)
+        writer.append_many([create_finished_game(1), create_finished_game(2)])
+        writer.append(create_finished_game(3))
+
+        # Act
+        with GameArchiveReader(self.path) as reader:
+            games = [(game.game_id, game.winner,
+                      [(vessel.vessel_type, vessel.coordinates, vessel.hits,
+                        vessel.ammunitions) for vessel in game.get_vessels()])
+                     for game in reader.iter_games()]
+            vessel_count = reader.get_vessel_count()
+
+        # Assert
+        self.assertEqual(6, vessel_count)
+        self.assertEqual([1, 2, 3], [game[0] for game in games])
+        self.assertEqual(0, games[2][1])
+        self.assertEqual([("Cruiser", (1, 1, 0), 6, 49),
+                          ("Submarine", (2, 2, -1), 0, 15)], games[2][2])
+
+    def test_iter_vessel_records(self):
+        # Arrange
+        GameArchiveWriter(self.path).append(create_finished_game(1))
+
+        # Act
+        with GameArchiveReader(self.path) as reader:
+            destroyed = sum(1 for record in reader.iter_vessel_records()
+                            if record[7] <= 0)
+
+        # Assert
+        self.assertEqual(1, destroyed)
+
+    def test_iter_shots(self):
+        # Arrange
+        game = create_finished_game(2)
+        game.get_players()[0].get_battlefield().fired_at(50, 50, 0)
+        GameArchiveWriter(self.path).append_many([create_finished_game(1),
+                                                  game])
+
+        # Act
+        with GameArchiveReader(self.path) as reader:
+            shots = [[(shot.game_id, shot.player_index, shot.coordinates,
+                       shot.hit) for shot in game.get_shots()]
+                     for game in reader.iter_games()]
+            hit_count = sum(record[5] for record in reader.iter_shot_records())
+            shot_count = reader.get_shot_count()
+
+        # Assert
+        self.assertEqual(3, shot_count)
+        self.assertEqual(2, hit_count)
+        self.assertEqual([[(1, 1, (2, 2, -1), True)],
+                          [(2, 0, (50, 50, 0), False),
+                           (2, 1, (2, 2, -1), True)]], shots)
+
+    def test_shots_fired_before_a_reload_are_archived(self):
+        # Arrange
+        game_dao = GameDao()
+        game = create_finished_game(None)
+        battlefield_2 = game.get_players()[1].get_battlefield()
+        battlefield_2.add_vessel(Cruiser(3, 3, 1))
+        battlefield_2.fired_at(60, 60, 0)
+        game_id = game_dao.create_game(game)
+        reloaded_game = game_dao.find_game(game_id)
+        battlefield_2 = reloaded_game.get_players()[1].get_battlefield()
+        for _ in range(Cruiser.HITS):
+            battlefield_2.fired_at(3, 3, 1)
+
+        # Act
+        GameArchiveWriter(self.path).append(reloaded_game)
+
+        # Assert
+        with GameArchiveReader(self.path) as reader:
+            game_view, = reader.iter_games()
+            shots = sorted((shot.coordinates, shot.hit)
+                           for shot in game_view.get_shots())
+        self.assertEqual(0, game_view.winner)
+        self.assertEqual(3, game_view.shot_count)
+        self.assertEqual([((2, 2, -1), True), ((3, 3, 1), True),
+                          ((60, 60, 0), False)], shots)
+
+    def test_empty_archive(self):
+        # Act
+        with GameArchiveReader(self.path) as reader:
+            games = list(reader.iter_games())
+
+        # Assert
+        self.assertEqual([], games)
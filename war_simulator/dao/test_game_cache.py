@@ -0,0 +1,167 @@
+from unittest import TestCase
+
+from war_simulator.dao.game_cache import GameCache
+from war_simulator.model.battlefield import Battlefield
+from war_simulator.model.game import Game
+from war_simulator.model.player import Player
+
+
+class FakeGameDao:
+    def __init__(self):
+        self.find_count = 0
+        self.update_count = 0
+        self.updated_games = []
+        self.updated_events = {}
+
+    def find_game(self, game_id: int) -> Game:
+        self.find_count += 1
+        return Game(game_id)
+
+    def update_game(self, game: Game, events: list[tuple] = ()):
+        self.update_games([game], {game.get_id(): events})
+
+    def update_games(self, games: list[Game],
+                     events: dict[int, list[tuple]] = None):
+        self.update_count += 1
+        self.updated_games.extend(games)
+        self.updated_events.update(events or {})
+        for game in games:
+            game.mark_clean()
+
+
+class TestGameCache(TestCase):
+    def test_find_game_served_from_cache(self):
+        # Arrange
+        game_dao = FakeGameDao()
+        game_cache = GameCache(game_dao)
+
+        # Act
+        game = game_cache.find_game(1)
+        game_again = game_cache.find_game(1)
+
+        # Assert
+        self.assertIs(game, game_again)
+        self.assertEqual(1, game_dao.find_count)
+        self.assertEqual(1, game_cache.get_stats()["hits"])
+        self.assertEqual(1, game_cache.get_stats()["misses"])
+
+    def test_least_recently_used_game_evicted(self):
+        # Arrange
+        game_dao = FakeGameDao()
+        game_cache = GameCache(game_dao, max_size=2)
+        game_cache.find_game(1)
+        game_cache.find_game(2)
+        game_cache.find_game(1)
+
+        # Act
+        game_cache.find_game(3)
+        game_cache.find_game(1)
+        game_cache.find_game(2)
+
+        # Assert
+        self.assertEqual(4, game_dao.find_count)
+        self.assertEqual(2, game_cache.get_stats()["evictions"])
+
+    def test_update_game_writes_through(self):
+        # Arrange
+        game_dao = FakeGameDao()
+        game_cache = GameCache(game_dao)
+
+        # Act
+        game_cache.update_game(Game(1))
+        game_cache.find_game(1)
+
+        # Assert
+        self.assertEqual(1, game_dao.update_count)
+        self.assertEqual(0, game_dao.find_count)
+
+    def test_invalidate(self):
+        # Arrange
+        game_dao = FakeGameDao()
+        game_cache = GameCache(game_dao)
+        game_cache.find_game(1)
+
+        # Act
+        game_cache.invalidate(1)
+        game_cache.find_game(1)
+
+        # Assert
+        self.assertEqual(2, game_dao.find_count)
+
+    def test_write_behind_coalesces_updates(self):
+        # Arrange
+        game_dao = FakeGameDao()
+        game_cache = GameCache(game_dao, write_behind=True,
+                               flush_interval=3600)
+        games = [Game(1), Game(2)]
+
+        # Act
+        for game in games:
+            game.add_player(Player("joueur", Battlefield(0, 10, 0, 10, 0, 1)))
+            game_cache.update_game(game)
+            game_cache.update_game(game)
+        pending = game_cache.get_stats()["pending"]
+        game_cache.flush()
+
+        # Assert
+        self.assertEqual(2, pending)
+        self.assertEqual(1, game_dao.update_count)
+        self.assertEqual(games, game_dao.updated_games)
+        self.assertFalse(games[0].is_dirty())
+
+    def test_write_behind_flushes_evicted_game(self):
+        # Arrange
+        game_dao = FakeGameDao()
+        game_cache = GameCache(game_dao, max_size=1, write_behind=True,
+                               flush_interval=3600)
+        game = Game(1)
+        game.add_player(Player("joueur", Battlefield(0, 10, 0, 10, 0, 1)))
+        game_cache.update_game(game)
+
+        # Act
+        game_cache.find_game(2)
+
+        # Assert
+        self.assertEqual([game], game_dao.updated_games)
+        self.assertEqual(0, game_cache.get_stats()["pending"])
+
+    def test_write_behind_flushes_when_due(self):
+        # Arrange
+        game_dao = FakeGameDao()
+        game_cache = GameCache(game_dao, write_behind=True,
+                               flush_interval=3600)
+        game = Game(1)
+        game.add_player(Player("joueur", Battlefield(0, 10, 0, 10, 0, 1)))
+        game_cache.update_game(game)
+
+        # Act
+        game_cache.flush_if_due()
+        pending = game_cache.get_stats()["pending"]
+        game_cache.flush_interval = 0
+        game_cache.flush_if_due()
+
+        # Assert
+        self.assertEqual(1, pending)
+        self.assertEqual([game], game_dao.updated_games)
+        self.assertEqual(0, game_cache.get_stats()["pending"])
+
+    def test_write_behind_keeps_events_with_pending_game(self):
+        # Arrange
+        game_dao = FakeGameDao()
+        game_cache = GameCache(game_dao, write_behind=True,
+                               flush_interval=3600)
+        game = Game(1)
+        game.add_player(Player("joueur", Battlefield(0, 10, 0, 10, 0, 1)))
+
+        # Act
+        game_cache.update_game(game, [("action", {"numero": 1})])
+        game_cache.update_game(game, [("action", {"numero": 2})])
+        written_before_flush = dict(game_dao.updated_events)
+        game_cache.flush()
+
+        # Assert
+        self.assertEqual({}, written_before_flush)
+        self.assertEqual({1: [("action", {"numero": 1}),
+                              ("action", {"numero": 2})]},
+                         game_dao.updated_events)
+        self.assertEqual({}, game_cache.pending_events)
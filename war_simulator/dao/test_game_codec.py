@@ -0,0 +1,67 @@
+import io
+from unittest import TestCase
+
+from war_simulator.dao.game_codec import encode_game, decode_game, \
+    dump_games, load_games
+from war_simulator.dao.game_event_log import game_to_dict
+from war_simulator.model.battlefield import Battlefield
+from war_simulator.model.cruiser import Cruiser
+from war_simulator.model.frigate import Frigate
+from war_simulator.model.game import Game
+from war_simulator.model.player import Player
+from war_simulator.model.submarine import Submarine
+
+
+def create_game(game_id: int) -> Game:
+    game = Game(game_id)
+    battlefield_1 = Battlefield(0, 100, 0, 100, -10, 10)
+    cruiser = Cruiser(1, 1, 0)
+    cruiser.id = 7
+    battlefield_1.add_vessel(cruiser)
+    battlefield_1.add_vessel(Submarine(2, 2, -5))
+    game.add_player(Player("joueur 1", battlefield_1))
+    battlefield_2 = Battlefield(0, 100, 0, 100, -10, 10)
+    battlefield_2.add_vessel(Frigate(3, 3, 0))
+    game.add_player(Player("joueur 2 é", battlefield_2))
+    cruiser.fire_at(5, 5, 5)
+    battlefield_2.fired_at(3, 3, 0)
+    return game
+
+
+class TestGameCodec(TestCase):
+    def test_encode_decode_round_trip(self):
+        # Arrange
+        game = create_game(12)
+
+        # Act
+        decoded_game = decode_game(encode_game(game))
+
+        # Assert
+        self.assertEqual(game_to_dict(game), game_to_dict(decoded_game))
+        self.assertEqual("Submarine", type(decoded_game.get_players()[0]
+                                           .get_battlefield().vessels[1])
+                         .__name__)
+        self.assertFalse(decoded_game.is_dirty())
+
+    def test_decode_unknown_format(self):
+        # Act
+        with self.assertRaises(ValueError) as error_context:
+            decode_game(b'XXXX' + bytes(10))
+
+        # Assert
+        self.assertEqual("Format de partie inconnu !",
+                         str(error_context.exception))
+
+    def test_dump_load_games(self):
+        # Arrange
+        games = [create_game(game_id) for game_id in range(5)]
+        file = io.BytesIO()
+
+        # Act
+        dump_games(games, file)
+        file.seek(0)
+        loaded_games = list(load_games(file))
+
+        # Assert
+        self.assertEqual([game_to_dict(game) for game in games],
+                         [game_to_dict(game) for game in loaded_games])
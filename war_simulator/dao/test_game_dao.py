@@ -0,0 +1,194 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from sqlalchemy import event, text
+
+from war_simulator.dao.game_dao import GameDao, engine, session_scope
+from war_simulator.model.battlefield import Battlefield
+from war_simulator.model.cruiser import Cruiser
+from war_simulator.model.game import Game
+from war_simulator.model.player import Player
+from war_simulator.model.submarine import Submarine
+
+
+def create_game_with_fleet(game_dao: GameDao, fleet_size: int) -> int:
+    game = Game()
+    for name in ("joueur 1", "joueur 2"):
+        battlefield = Battlefield(0, 1000, 0, 10, -1, 1, 6 * fleet_size)
+        for x in range(fleet_size):
+            battlefield.add_vessel(Cruiser(x, 0, 0))
+        game.add_player(Player(name, battlefield))
+    return game_dao.create_game(game)
+
+
+def count_queries(action) -> int:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        action()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+
+class TestGameDao(TestCase):
+    def test_find_game_query_count_independent_of_fleet_size(self):
+        # Arrange
+        small_game_id = create_game_with_fleet(GameDao(), 1)
+        large_game_id = create_game_with_fleet(GameDao(), 50)
+
+        # Act
+        small_count = count_queries(
+            lambda: GameDao().find_game(small_game_id))
+        large_count = count_queries(
+            lambda: GameDao().find_game(large_game_id))
+
+        # Assert
+        self.assertEqual(small_count, large_count)
+
+    def test_find_game_builds_full_domain_graph(self):
+        # Arrange
+        game_dao = GameDao()
+        game = Game()
+        battlefield = Battlefield(0, 100, -10, 100, -10, 10)
+        battlefield.add_vessel(Cruiser(1, 1, 0))
+        battlefield.add_vessel(Submarine(2, 2, -1))
+        game.add_player(Player("joueur", battlefield))
+        game_id = game_dao.create_game(game)
+        battlefield.fired_at(2, 2, -1)
+        battlefield.get_vessel_by_coordinates(1, 1, 0).fire_at(3, 3, 3)
+        game_dao.update_game(game)
+
+        # Act
+        found_game = GameDao().find_game(game_id)
+
+        # Assert
+        found_battlefield = found_game.get_players()[0].get_battlefield()
+        cruiser = found_battlefield.get_vessel_by_coordinates(1, 1, 0)
+        submarine = found_battlefield.get_vessel_by_coordinates(2, 2, -1)
+        self.assertEqual("Cruiser", type(cruiser).__name__)
+        self.assertEqual(49, cruiser.get_weapon().get_ammunitions())
+        self.assertEqual("TorpedoLauncher",
+                         type(submarine.get_weapon()).__name__)
+        self.assertEqual(1, submarine.get_hits())
+        self.assertEqual(7, found_battlefield.get_power())
+        self.assertFalse(found_game.is_dirty())
+
+    def test_find_game_not_found(self):
+        # Act
+        game = GameDao().find_game(-1)
+
+        # Assert
+        self.assertIsNone(game)
+
+    def test_sqlite_runs_in_wal_mode(self):
+        # Act
+        with session_scope() as db_session:
+            journal_mode = db_session.execute(
+                text("PRAGMA journal_mode")).scalar()
+
+        # Assert
+        self.assertEqual("wal", journal_mode)
+
+    def test_find_game_from_several_threads(self):
+        # Arrange
+        game_dao = GameDao()
+        game_id = create_game_with_fleet(game_dao, 5)
+
+        # Act
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            games = list(executor.map(game_dao.find_game, [game_id] * 32))
+
+        # Assert
+        self.assertTrue(all(game.get_id() == game_id for game in games))
+        self.assertTrue(all(
+            game.get_players()[1].get_battlefield().get_power() == 30
+            for game in games))
+
+    def test_update_game_inserts_new_vessels_in_bulk(self):
+        # Arrange
+        game_dao = GameDao()
+        game = Game()
+        game.add_player(Player("joueur",
+                               Battlefield(0, 1000, 0, 10, -1, 1, 1000)))
+        game_id = game_dao.create_game(game)
+        battlefield = game.get_players()[0].get_battlefield()
+        battlefield.add_vessel(Cruiser(0, 0, 0))
+        game_dao.update_game(game)
+
+        def add_cruisers(start: int, count: int):
+            battlefield.add_vessels([Cruiser(x, 0, 0)
+                                     for x in range(start, start + count)])
+            game_dao.update_game(game)
+
+        # Act
+        small_count = count_queries(lambda: add_cruisers(1, 2))
+        large_count = count_queries(lambda: add_cruisers(3, 40))
+
+        # Assert
+        self.assertEqual(small_count, large_count)
+        found_vessels = {
+            vessel.id: vessel for vessel in game_dao.find_game(game_id)
+            .get_players()[0].get_battlefield().get_vessels()}
+        self.assertEqual(43, len(found_vessels))
+        for vessel in battlefield.get_vessels():
+            found_vessel = found_vessels[vessel.id]
+            self.assertEqual(vessel.get_coordinates(),
+                             found_vessel.get_coordinates())
+            self.assertEqual(vessel.weapon.id, found_vessel.weapon.id)
+        self.assertFalse(game.is_dirty())
+
+    def test_update_game_removes_and_adds_vessels(self):
+        # Arrange
+        game_dao = GameDao()
+        game = Game()
+        battlefield = Battlefield(0, 100, 0, 10, -1, 1, 100)
+        for x in range(3):
+            battlefield.add_vessel(Cruiser(x, 0, 0))
+        game.add_player(Player("joueur", battlefield))
+        game_id = game_dao.create_game(game)
+        battlefield.remove_vessel(battlefield.get_vessels()[-1])
+        new_vessel = Cruiser(5, 0, 0)
+        battlefield.add_vessel(new_vessel)
+
+        # Act
+        game_dao.update_game(game)
+
+        # Assert
+        self.assertIsNotNone(new_vessel.id)
+        found_vessels = {
+            vessel.id: vessel for vessel in game_dao.find_game(game_id)
+            .get_players()[0].get_battlefield().get_vessels()}
+        self.assertEqual(3, len(found_vessels))
+        self.assertEqual((5, 0, 0),
+                         found_vessels[new_vessel.id].get_coordinates())
+        self.assertEqual(new_vessel.weapon.id,
+                         found_vessels[new_vessel.id].weapon.id)
+
+    def test_update_game_saves_shot_history(self):
+        # Arrange
+        game_dao = GameDao()
+        game = Game()
+        battlefield = Battlefield(0, 100, 0, 10, -1, 1)
+        battlefield.add_vessel(Cruiser(1, 1, 0))
+        game.add_player(Player("joueur", battlefield))
+        game_id = game_dao.create_game(game)
+        battlefield.fired_at(1, 1, 0)
+        battlefield.fired_at(50, 5, -1)
+
+        # Act
+        game_dao.update_game(game)
+        found_battlefield = game_dao.find_game(game_id).get_players()[0] \
+            .get_battlefield()
+
+        # Assert
+        shot_history = found_battlefield.get_shot_history()
+        self.assertTrue(shot_history.is_hit(1, 1, 0))
+        self.assertTrue(shot_history.is_miss(50, 5, -1))
+        self.assertEqual(2, shot_history.get_hit_count()
+                         + shot_history.get_miss_count())
+        self.assertFalse(found_battlefield.is_dirty())
@@ -0,0 +1,174 @@
+import functools
+from unittest import TestCase
+
+from sqlalchemy import func, select
+
+from war_simulator.dao.game_dao import GameDao, session_scope
+from war_simulator.dao.game_event_log import GameEventLog, GAME_CREATED, \
+    PLAYER_JOINED, VESSEL_PLACED, SHOT_FIRED, HIT, GameSnapshotEntity, \
+    player_to_dict, vessel_placed_payload
+from war_simulator.model.battlefield import Battlefield
+from war_simulator.model.cruiser import Cruiser
+from war_simulator.model.game import Game
+from war_simulator.model.player import Player
+from war_simulator.model.submarine import Submarine
+
+
+def play_game(event_log: GameEventLog) -> Game:
+    game = Game()
+    battlefield_1 = Battlefield(0, 100, 0, 100, -10, 10)
+    game.add_player(Player("joueur 1", battlefield_1))
+    GameDao().create_game(game)
+    event_log.append(game, GAME_CREATED, player_to_dict(game.players[0]))
+    battlefield_2 = Battlefield(0, 100, 0, 100, -10, 10)
+    game.add_player(Player("joueur 2", battlefield_2))
+    event_log.append(game, PLAYER_JOINED, player_to_dict(game.players[1]))
+    cruiser = Cruiser(1, 1, 0)
+    battlefield_1.add_vessel(cruiser)
+    event_log.append(game, VESSEL_PLACED,
+                     vessel_placed_payload("joueur 1", cruiser))
+    submarine = Submarine(5, 5, -1)
+    battlefield_2.add_vessel(submarine)
+    event_log.append(game, VESSEL_PLACED,
+                     vessel_placed_payload("joueur 2", submarine))
+    cruiser.fire_at(5, 5, 1)
+    battlefield_2.fired_at(5, 5, -1)
+    event_log.append_many(game, [
+        (SHOT_FIRED, {"player_name": "joueur 1", "from": (1, 1, 0),
+                      "target": (5, 5, 1)}),
+        (HIT, {"player_name": "joueur 2", "x": 5, "y": 5, "z": -1})])
+    return game
+
+
+class TestGameEventLog(TestCase):
+    def assert_same_game(self, expected: Game, actual: Game):
+        self.assertEqual(expected.get_id(), actual.get_id())
+        for expected_player, player in zip(expected.get_players(),
+                                           actual.get_players()):
+            self.assertEqual(expected_player.get_name(), player.get_name())
+            expected_vessels = expected_player.get_battlefield().get_vessels()
+            vessels = player.get_battlefield().get_vessels()
+            self.assertEqual(
+                [(type(v).__name__, v.get_coordinates(), v.get_hits(),
+                  v.get_weapon().get_ammunitions()) for v in expected_vessels],
+                [(type(v).__name__, v.get_coordinates(), v.get_hits(),
+                  v.get_weapon().get_ammunitions()) for v in vessels])
+
+    def test_load_game_replays_all_events(self):
+        # Arrange
+        event_log = GameEventLog(snapshot_interval=1000)
+        game = play_game(event_log)
+
+        # Act
+        replayed_game = event_log.load_game(game.get_id())
+
+        # Assert
+        self.assert_same_game(game, replayed_game)
+        self.assertEqual(6, len(event_log.get_events(game.get_id())))
+
+    def test_load_game_from_snapshot_and_tail(self):
+        # Arrange
+        event_log = GameEventLog(snapshot_interval=3)
+        game = play_game(event_log)
+
+        # Act
+        replayed_game = event_log.load_game(game.get_id())
+
+        # Assert
+        self.assert_same_game(game, replayed_game)
+        self.assertFalse(replayed_game.is_dirty())
+
+    def test_load_game_rebuilds_shot_history(self):
+        # Arrange
+        event_log = GameEventLog(snapshot_interval=1000)
+        game = play_game(event_log)
+        cruiser = game.get_players()[0].get_battlefield().get_vessels()[0]
+        cruiser.fire_at(7, 7, 1)
+        event_log.append(game, SHOT_FIRED, {"player_name": "joueur 1",
+                                            "from": (1, 1, 0),
+                                            "target": (7, 7, 1)})
+
+        # Act
+        replayed_game = event_log.load_game(game.get_id())
+
+        # Assert
+        shot_history = replayed_game.get_players()[1].get_battlefield() \
+            .get_shot_history()
+        self.assertTrue(shot_history.is_miss(7, 7, 1))
+        self.assertTrue(shot_history.is_hit(5, 5, -1))
+        self.assertEqual(1, shot_history.get_hit_count())
+
+    def test_load_game_unknown(self):
+        # Act
+        game = GameEventLog().load_game(-1)
+
+        # Assert
+        self.assertIsNone(game)
+
+    def test_events_are_written_with_the_game(self):
+        # Arrange
+        event_log = GameEventLog(snapshot_interval=1000)
+        game_dao = GameDao(event_log)
+        game = Game()
+        game.add_player(Player("joueur 1", Battlefield(0, 100, 0, 100,
+                                                       -10, 10)))
+        game_dao.create_game(game, [(GAME_CREATED, functools.partial(
+            player_to_dict, game.players[0]))])
+        cruiser = Cruiser(1, 1, 0)
+        game.players[0].get_battlefield().add_vessel(cruiser)
+
+        # Act
+        game_dao.update_game(game, [(VESSEL_PLACED, functools.partial(
+            vessel_placed_payload, "joueur 1", cruiser))])
+
+        # Assert
+        events = event_log.get_events(game.get_id())
+        self.assertEqual([GAME_CREATED, VESSEL_PLACED],
+                         [event["type"] for event in events])
+        self.assertEqual(game.players[0].id, events[0]["payload"]["player_id"])
+        self.assertEqual(cruiser.id, events[1]["payload"]["vessel_id"])
+        self.assert_same_game(game, event_log.load_game(game.get_id()))
+
+    def test_failed_write_keeps_neither_game_nor_events(self):
+        # Arrange
+        event_log = GameEventLog(snapshot_interval=1000)
+        game_dao = GameDao(event_log)
+        game = Game()
+        game.add_player(Player("joueur 1", Battlefield(0, 100, 0, 100,
+                                                       -10, 10)))
+        game_dao.create_game(game)
+        game.players[0].get_battlefield().add_vessel(Cruiser(1, 1, 0))
+
+        def failing_payload():
+            raise ValueError("charge utile impossible")
+
+        # Act
+        with self.assertRaises(ValueError):
+            game_dao.update_game(game, [(VESSEL_PLACED, failing_payload)])
+
+        # Assert
+        self.assertEqual([], event_log.get_events(game.get_id()))
+        self.assertEqual([], game_dao.find_game(game.get_id()).players[0]
+                         .get_battlefield().get_vessels())
+
+    def test_snapshot_interval_counts_logged_events(self):
+        # Arrange
+        game = Game()
+        game.add_player(Player("joueur 1", Battlefield(0, 100, 0, 100,
+                                                       -10, 10)))
+        GameDao().create_game(game)
+        shot = (SHOT_FIRED, {"player_name": "joueur 1", "from": (1, 1, 0),
+                             "target": (5, 5, 1)})
+        GameEventLog(snapshot_interval=3).append_many(game, [shot, shot])
+
+        # Act
+        # Un autre journal, comme après un redémarrage ou dans un autre
+        # processus
+        GameEventLog(snapshot_interval=3).append(game, *shot)
+
+        # Assert
+        with session_scope() as db_session:
+            snapshot_count = db_session.scalar(
+                select(func.count(GameSnapshotEntity.id))
+                .where(GameSnapshotEntity.game_id == game.get_id()))
+        self.assertEqual(1, snapshot_count)
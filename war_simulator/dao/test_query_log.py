@@ -0,0 +1,115 @@
+import json
+import logging
+import random
+from unittest import TestCase
+
+from sqlalchemy import create_engine, exc, text
+
+from war_simulator.dao.query_log import JsonFormatter, QueryLog
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+
+
+def run_queries(query_log: QueryLog, statements: list) -> list:
+    engine = create_engine("sqlite://", future=True)
+    query_log.attach(engine)
+    with engine.begin() as connection:
+        for statement, parameters in statements:
+            connection.execute(text(statement), parameters)
+    query_log.close()
+    return query_log.listener.handlers[0].records
+
+
+class TestQueryLog(TestCase):
+    def test_only_slow_queries_are_logged_without_sampling(self):
+        # Arrange
+        query_log = QueryLog(slow_query_ms=0, sample_rate=0,
+                             handlers=[ListHandler()])
+
+        # Act
+        records = run_queries(query_log, [("SELECT :x", {"x": 1})])
+
+        # Assert
+        self.assertEqual(1, len(records))
+        self.assertTrue(records[0].slow)
+        self.assertEqual(logging.WARNING, records[0].levelno)
+        self.assertGreaterEqual(records[0].duration_ms, 0)
+
+    def test_fast_queries_are_sampled(self):
+        # Arrange
+        query_log = QueryLog(slow_query_ms=1e6, sample_rate=0.5,
+                             handlers=[ListHandler()], rng=random.Random(1))
+
+        # Act
+        records = run_queries(query_log, [("SELECT :x", {"x": number})
+                                          for number in range(200)])
+
+        # Assert
+        self.assertTrue(50 < len(records) < 150)
+        self.assertFalse(any(record.slow for record in records))
+
+    def test_parameters_are_redacted(self):
+        # Arrange
+        query_log = QueryLog(slow_query_ms=0, sample_rate=0,
+                             handlers=[ListHandler()])
+
+        # Act
+        records = run_queries(query_log, [("SELECT :name, :hits",
+                                           {"name": "joueur 1", "hits": 3})])
+
+        # Assert
+        self.assertEqual(["str", "int"], records[0].parameters)
+        self.assertNotIn("joueur 1", JsonFormatter().format(records[0]))
+
+    def test_parameters_can_be_shown(self):
+        # Arrange
+        query_log = QueryLog(slow_query_ms=0, sample_rate=0,
+                             show_parameters=True, handlers=[ListHandler()])
+
+        # Act
+        records = run_queries(query_log, [("SELECT :name",
+                                           {"name": "joueur 1"})])
+
+        # Assert
+        entry = json.loads(JsonFormatter().format(records[0]))
+        self.assertEqual("SELECT ?", entry["statement"])
+        self.assertEqual(["joueur 1"], entry["parameters"])
+
+    def test_query_logs_do_not_share_records(self):
+        # Arrange
+        other_query_log = QueryLog(slow_query_ms=0, sample_rate=0,
+                                   handlers=[ListHandler()])
+        query_log = QueryLog(slow_query_ms=0, sample_rate=0,
+                             handlers=[ListHandler()])
+
+        # Act
+        records = run_queries(query_log, [("SELECT :x", {"x": 1})])
+        other_query_log.close()
+
+        # Assert
+        self.assertEqual(1, len(records))
+        self.assertEqual([], other_query_log.listener.handlers[0].records)
+
+    def test_failed_query_start_time_is_removed(self):
+        # Arrange
+        query_log = QueryLog(slow_query_ms=0, sample_rate=0,
+                             handlers=[ListHandler()])
+        engine = create_engine("sqlite://", future=True)
+        query_log.attach(engine)
+
+        # Act
+        with engine.connect() as connection:
+            with self.assertRaises(exc.OperationalError):
+                connection.execute(text("SELECT * FROM table_absente"))
+            start_times = list(connection.info["query_start_times"])
+        query_log.close()
+
+        # Assert
+        self.assertEqual([], start_times)
@@ -1,14 +1,24 @@
-from functools import reduce
 from typing import Optional
 
 from exceptions import OutOfRangeError
+from fleet_arrays import FleetArrays
+from shot_history import AnyShotHistory, create_shot_history
 from vessel import Vessel
 
 
 class Battlefield:
     def __init__(self, min_x: int, max_x: int, min_y: int, max_y: int,
                  min_z: int, max_z: int, max_power: int = 22):
+        self.id = None
         self.vessels: list[Vessel] = []
+        self.vessels_by_coordinates: dict[tuple, Vessel] = {}
+        self.power = 0
+        self.destroyed_vessels_count = 0
+        self.fleet_arrays: Optional[FleetArrays] = None
+        # Vaisseaux à écrire en base (nouveaux ou modifiés) et vaisseaux à
+        # supprimer, depuis la dernière écriture
+        self.dirty_vessels: set[Vessel] = set()
+        self.removed_vessels: list[Vessel] = []
         self.min_x = min_x
         self.min_y = min_y
         self.min_z = min_z
@@ -16,8 +26,48 @@ class Battlefield:
         self.max_y = max_y
         self.max_z = max_z
         self.max_power = max_power
+        # Créé au premier tir : un champ de bataille sans tir n'alloue rien.
+        # Écrit en base avec le champ de bataille quand shots_dirty.
+        self.shot_history: Optional[AnyShotHistory] = None
+        self.shots_dirty = False
 
     def add_vessel(self, vessel: Vessel):
+        self.check_vessel(vessel, self.get_power())
+        self.place_vessel(vessel)
+
+    def add_vessels(self, vessels: list[Vessel]) -> list[Optional[Exception]]:
+        # Placement d'une flotte : si l'un des vaisseaux est refusé par
+        # check_vessels, aucun n'est placé
+        errors = self.check_vessels(vessels)
+        if all(error is None for error in errors):
+            for vessel in vessels:
+                self.place_vessel(vessel)
+        return errors
+
+    def check_vessels(self, vessels: list[Vessel]) -> list[Optional[Exception]]:
+        # Vérification d'une flotte en un seul passage : chaque vaisseau est
+        # vérifié comme par add_vessel, en tenant compte de ceux qui le
+        # précèdent dans la liste (collisions, puissance cumulée). Renvoie
+        # l'erreur de chaque vaisseau, None s'il est accepté.
+        errors = []
+        accepted_coordinates = set()
+        power = self.get_power()
+        for vessel in vessels:
+            try:
+                self.check_vessel(vessel, power)
+                if vessel.get_coordinates() in accepted_coordinates:
+                    raise ValueError("Il y a déjà un vaisseau positionné "
+                                     "ici !")
+            except (OutOfRangeError, ValueError) as error:
+                errors.append(error)
+                continue
+            errors.append(None)
+            accepted_coordinates.add(vessel.get_coordinates())
+            power += vessel.get_hits()
+        return errors
+
+    def check_vessel(self, vessel: Vessel, power: int):
+        # power : puissance de la flotte avant l'ajout du vaisseau
         x, y, z = vessel.get_coordinates()
         if x not in range(self.min_x, self.max_x) \
                 or y not in range(self.min_y, self.max_y) \
@@ -26,33 +76,118 @@ class Battlefield:
                                   "en dehors de l'espace réservé !")
         if self.get_vessel_by_coordinates(x, y, z) is not None:
             raise ValueError("Il y a déjà un vaisseau positionné ici !")
-        if self.get_power() + vessel.get_hits() > self.max_power:
+        if power + vessel.get_hits() > self.max_power:
             raise ValueError(f"La puissance dépasse la maximum autorisé "
                              f"{self.max_power} !")
 
+    def place_vessel(self, vessel: Vessel):
         self.vessels.append(vessel)
+        self.vessels_by_coordinates[vessel.get_coordinates()] = vessel
+        self.power += vessel.get_hits()
+        if vessel.get_hits() <= 0:
+            self.destroyed_vessels_count += 1
+        if self.fleet_arrays is not None:
+            self.fleet_arrays.add(vessel)
+        self.dirty_vessels.add(vessel)
+        vessel.battlefield = self
+
+    def remove_vessel(self, vessel: Vessel):
+        self.vessels.remove(vessel)
+        del self.vessels_by_coordinates[vessel.get_coordinates()]
+        self.power -= vessel.get_hits()
+        if vessel.get_hits() <= 0:
+            self.destroyed_vessels_count -= 1
+        if self.fleet_arrays is not None:
+            self.fleet_arrays.remove(vessel)
+        self.dirty_vessels.discard(vessel)
+        if vessel.id is not None:
+            self.removed_vessels.append(vessel)
+        vessel.battlefield = None
+
+    def move_vessel(self, vessel: Vessel, x, y, z):
+        # Appelée par Vessel lorsqu'il change de coordonnées, afin de garder
+        # l'index des positions à jour
+        occupant = self.get_vessel_by_coordinates(x, y, z)
+        if occupant is not None and occupant is not vessel:
+            raise ValueError("Il y a déjà un vaisseau positionné ici !")
+        del self.vessels_by_coordinates[vessel.get_coordinates()]
+        self.vessels_by_coordinates[(x, y, z)] = vessel
+        if self.fleet_arrays is not None:
+            self.fleet_arrays.update_coordinates(vessel, x, y, z)
+        self.dirty_vessels.add(vessel)
+
+    def vessel_touched(self, vessel: Vessel):
+        # Appelée par Vessel.touched, après la perte d'un point de vie
+        self.power -= 1
+        if vessel.get_hits() == 0:
+            self.destroyed_vessels_count += 1
+        if self.fleet_arrays is not None:
+            self.fleet_arrays.update_hits(vessel)
+        self.dirty_vessels.add(vessel)
+
+    def vessel_fired(self, vessel: Vessel):
+        # Appelée par Vessel.fire_at, dont l'arme a pu consommer une munition
+        if self.fleet_arrays is not None:
+            self.fleet_arrays.update_weapon(vessel)
+        self.dirty_vessels.add(vessel)
 
     def fired_at(self, x, y, z) -> bool:
         vessel = self.get_vessel_by_coordinates(x, y, z)
+        shot_history = self.shot_history
+        if shot_history is None:
+            shot_history = self.get_shot_history()
+        shot_history.record(x, y, z, vessel is not None)
+        self.shots_dirty = True
         if vessel is None:
             return False
         vessel.touched()
         return True
 
+    def fired_at_many(self, coordinates: list[tuple]) -> list[bool]:
+        return [self.fired_at(x, y, z) for x, y, z in coordinates]
+
     def get_vessels(self) -> list[Vessel]:
         return self.vessels
 
     def get_vessel_by_coordinates(self, x, y, z) -> Optional[Vessel]:
-        vessels_found = list(
-            filter(lambda vessel: vessel.get_coordinates() == (x, y, z),
-                   self.vessels))
-        if len(vessels_found) != 0:
-            return vessels_found[0]
-        else:
-            return None
+        return self.vessels_by_coordinates.get((x, y, z))
+
+    def is_dirty(self) -> bool:
+        return len(self.dirty_vessels) != 0 or len(self.removed_vessels) != 0 \
+            or self.shots_dirty
+
+    def mark_clean(self):
+        for vessel in self.dirty_vessels:
+            vessel.mark_clean()
+        self.dirty_vessels.clear()
+        self.removed_vessels.clear()
+        self.shots_dirty = False
+
+    def enable_fleet_arrays(self) -> FleetArrays:
+        if self.fleet_arrays is None:
+            self.fleet_arrays = FleetArrays(self.vessels)
+        return self.fleet_arrays
+
+    def get_fleet_arrays(self) -> Optional[FleetArrays]:
+        return self.fleet_arrays
+
+    def get_shot_history(self) -> AnyShotHistory:
+        if self.shot_history is None:
+            self.shot_history = create_shot_history(
+                self.min_x, self.max_x, self.min_y, self.max_y,
+                self.min_z, self.max_z)
+        return self.shot_history
 
     def get_power(self) -> int:
-        return reduce(
-            lambda vessel_n, vessel_n_plus_1:
-            vessel_n + vessel_n_plus_1.get_hits(),
-            self.vessels, 0)
+        return self.power
+
+    def get_alive_vessels_count(self) -> int:
+        return len(self.vessels) - self.destroyed_vessels_count
+
+    def get_destroyed_vessels_count(self) -> int:
+        return self.destroyed_vessels_count
+
+    def all_vessels_destroyed(self) -> bool:
+        # Une flotte encore vide (vaisseaux pas encore placés) n'est pas
+        # détruite
+        return len(self.vessels) > 0 and self.get_alive_vessels_count() == 0
@@ -3,9 +3,11 @@ from vessel import Vessel
 
 
 class Cruiser(Vessel):
+    __slots__ = ()
+    HITS = 6
 
     def __init__(self, x: float, y: float, z: float):
-        super().__init__(x, y, z, 6, AirMissileLauncher())
+        super().__init__(x, y, z, self.HITS, AirMissileLauncher())
 
     def go_to(self, x, y, z):
         if z != 0:
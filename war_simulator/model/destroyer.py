@@ -4,9 +4,11 @@ from vessel import Vessel
 
 
 class Destroyer(Vessel):
+    __slots__ = ()
+    HITS = 4
 
     def __init__(self, x: float, y: float, z: float):
-        super().__init__(x, y, z, 4, TorpedoLauncher())
+        super().__init__(x, y, z, self.HITS, TorpedoLauncher())
 
     def go_to(self, x, y, z):
         if z != 0:
@@ -0,0 +1,103 @@
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from vessel import Vessel
+
+
+class FleetArrays:
+    # Copie en colonnes NumPy (coordonnées, points de vie, portée et
+    # munitions) des vaisseaux d'un champ de bataille, tenue à jour par
+    # Battlefield, pour interroger toute la flotte sans boucle Python
+    def __init__(self, vessels: list[Vessel], capacity: int = 64):
+        if np is None:
+            raise ImportError("NumPy est nécessaire pour utiliser FleetArrays")
+        capacity = max(capacity, len(vessels))
+        self.coordinates = np.zeros((capacity, 3), dtype=np.float64)
+        self.hits = np.zeros(capacity, dtype=np.int64)
+        self.ranges = np.zeros(capacity, dtype=np.float64)
+        self.ammunitions = np.zeros(capacity, dtype=np.int64)
+        self.vessels: list[Vessel] = []
+        self.rows: dict[Vessel, int] = {}
+        for vessel in vessels:
+            self.add(vessel)
+
+    def __len__(self) -> int:
+        return len(self.vessels)
+
+    def add(self, vessel: Vessel):
+        row = len(self.vessels)
+        if row == len(self.hits):
+            self._grow(2 * row)
+        self.vessels.append(vessel)
+        self.rows[vessel] = row
+        self.update_coordinates(vessel, *vessel.get_coordinates())
+        self.update_hits(vessel)
+        self.update_weapon(vessel)
+
+    def remove(self, vessel: Vessel):
+        # La dernière ligne prend la place de la ligne supprimée
+        row = self.rows.pop(vessel)
+        last_row = len(self.vessels) - 1
+        last_vessel = self.vessels.pop()
+        if row != last_row:
+            self.vessels[row] = last_vessel
+            self.rows[last_vessel] = row
+            for column in (self.coordinates, self.hits, self.ranges,
+                           self.ammunitions):
+                column[row] = column[last_row]
+
+    def update_coordinates(self, vessel: Vessel, x, y, z):
+        self.coordinates[self.rows[vessel]] = (x, y, z)
+
+    def update_hits(self, vessel: Vessel):
+        self.hits[self.rows[vessel]] = vessel.get_hits()
+
+    def update_weapon(self, vessel: Vessel):
+        row = self.rows[vessel]
+        weapon = vessel.get_weapon()
+        if weapon is None:
+            self.ranges[row] = 0
+            self.ammunitions[row] = 0
+        else:
+            self.ranges[row] = weapon.get_range()
+            self.ammunitions[row] = weapon.get_ammunitions()
+
+    def get_vessels_in_range_of(self, x, y, z) -> list[Vessel]:
+        # Vaisseaux encore en vie, avec des munitions, dont l'arme atteint
+        # le point (x, y, z)
+        size = len(self.vessels)
+        distances = self._distances_to(x, y, z)
+        mask = (distances <= self.ranges[:size]) \
+            & (self.hits[:size] > 0) \
+            & (self.ammunitions[:size] > 0)
+        return self._select(mask)
+
+    def get_vessels_in_box(self, min_x, max_x, min_y, max_y, min_z,
+                           max_z) -> list[Vessel]:
+        coordinates = self.coordinates[:len(self.vessels)]
+        mask = np.all((coordinates >= (min_x, min_y, min_z))
+                      & (coordinates <= (max_x, max_y, max_z)), axis=1)
+        return self._select(mask)
+
+    def get_nearest_vessel(self, x, y, z) -> Optional[Vessel]:
+        if len(self.vessels) == 0:
+            return None
+        return self.vessels[int(np.argmin(self._distances_to(x, y, z)))]
+
+    def _distances_to(self, x, y, z):
+        deltas = self.coordinates[:len(self.vessels)] - (x, y, z)
+        return np.sqrt(np.einsum('ij,ij->i', deltas, deltas))
+
+    def _select(self, mask) -> list[Vessel]:
+        return [self.vessels[row] for row in np.flatnonzero(mask)]
+
+    def _grow(self, capacity: int):
+        capacity = max(capacity, 1)
+        self.coordinates = np.resize(self.coordinates, (capacity, 3))
+        self.hits = np.resize(self.hits, capacity)
+        self.ranges = np.resize(self.ranges, capacity)
+        self.ammunitions = np.resize(self.ammunitions, capacity)
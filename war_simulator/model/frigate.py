@@ -3,9 +3,11 @@ from vessel import Vessel
 
 
 class Frigate(Vessel):
+    __slots__ = ()
+    HITS = 5
 
     def __init__(self, x: float, y: float, z: float):
-        super().__init__(x, y, z, 5, SurfaceMissileLauncher())
+        super().__init__(x, y, z, self.HITS, SurfaceMissileLauncher())
 
     def go_to(self, x, y, z):
         if z != 0:
@@ -6,6 +6,7 @@ class Game:
     def __init__(self, id=None):
         self.id = id
         self.players = []
+        self.dirty = False
 
     def get_id(self) -> int:
         return self.id
@@ -18,3 +19,13 @@ class Game:
             raise GameFullError(
                 "Seulement 2 joueurs sont admis dans la partie !")
         self.players.append(player)
+        self.dirty = True
+
+    def is_dirty(self) -> bool:
+        return self.dirty or any(player.get_battlefield().is_dirty()
+                                 for player in self.players)
+
+    def mark_clean(self):
+        self.dirty = False
+        for player in self.players:
+            player.get_battlefield().mark_clean()
@@ -0,0 +1,205 @@
+from typing import Iterator, Union
+
+# Au-delà de ce nombre de cellules (4 Mo pour les deux champs de bits), le
+# volume est décrit par les bornes envoyées à /create-game et peut être
+# immense : les tirs, bornés par les munitions, sont gardés dans un
+# dictionnaire
+MAX_BITSET_VOLUME = 1 << 24
+
+# Pour chaque octet d'un champ de bits, les 8 cellules correspondantes (bit
+# de poids faible en premier), à 1 pour un bit présent
+BIT_CELLS = [bytes((byte >> bit) & 1 for bit in range(8))
+             for byte in range(256)]
+
+
+class ShotHistory:
+    # Cellules déjà visées sur un champ de bataille, un bit par cellule du
+    # volume min_x..max_x × min_y..max_y × min_z..max_z (bornes max exclues
+    # comme dans Battlefield.add_vessel) : un champ pour les tirs réussis, un
+    # autre pour les tirs manqués. Une cellule visée plusieurs fois garde le
+    # résultat du dernier tir.
+    # La cellule (x, y, z) est le bit
+    # ((x - min_x) * size_y + (y - min_y)) * size_z + (z - min_z).
+    def __init__(self, min_x: int, max_x: int, min_y: int, max_y: int,
+                 min_z: int, max_z: int):
+        self.min_x = min_x
+        self.min_y = min_y
+        self.min_z = min_z
+        self.size_x = max(max_x - min_x, 0)
+        self.size_y = max(max_y - min_y, 0)
+        self.size_z = max(max_z - min_z, 0)
+        self.volume = self.size_x * self.size_y * self.size_z
+        self.hits = bytearray((self.volume + 7) // 8)
+        self.misses = bytearray((self.volume + 7) // 8)
+
+    def get_index(self, x, y, z) -> int:
+        # -1 pour une cellule hors du volume
+        dx, dy, dz = x - self.min_x, y - self.min_y, z - self.min_z
+        if 0 <= dx < self.size_x and 0 <= dy < self.size_y \
+                and 0 <= dz < self.size_z:
+            return (dx * self.size_y + dy) * self.size_z + dz
+        return -1
+
+    def get_coordinates(self, index: int) -> tuple:
+        xy, dz = divmod(index, self.size_z)
+        dx, dy = divmod(xy, self.size_y)
+        return self.min_x + dx, self.min_y + dy, self.min_z + dz
+
+    def record(self, x, y, z, hit: bool):
+        # Appelée à chaque tir par Battlefield.fired_at : get_index est
+        # développée ici
+        dx, dy, dz = x - self.min_x, y - self.min_y, z - self.min_z
+        if not (0 <= dx < self.size_x and 0 <= dy < self.size_y
+                and 0 <= dz < self.size_z):
+            return
+        index = (dx * self.size_y + dy) * self.size_z + dz
+        byte, mask = index >> 3, 1 << (index & 7)
+        if hit:
+            self.hits[byte] |= mask
+            self.misses[byte] &= ~mask
+        else:
+            self.misses[byte] |= mask
+            self.hits[byte] &= ~mask
+
+    def is_hit(self, x, y, z) -> bool:
+        index = self.get_index(x, y, z)
+        return index >= 0 and bool(self.hits[index >> 3] & (1 << (index & 7)))
+
+    def is_miss(self, x, y, z) -> bool:
+        index = self.get_index(x, y, z)
+        return index >= 0 \
+            and bool(self.misses[index >> 3] & (1 << (index & 7)))
+
+    def is_shot(self, x, y, z) -> bool:
+        index = self.get_index(x, y, z)
+        if index < 0:
+            return False
+        mask = 1 << (index & 7)
+        return bool((self.hits[index >> 3] | self.misses[index >> 3]) & mask)
+
+    def get_hit_count(self) -> int:
+        return sum(bin(byte).count("1") for byte in self.hits)
+
+    def get_miss_count(self) -> int:
+        return sum(bin(byte).count("1") for byte in self.misses)
+
+    def iter_indices(self, bits: bytearray) -> Iterator[int]:
+        for byte_index, byte in enumerate(bits):
+            while byte:
+                low_bit = byte & -byte
+                yield byte_index * 8 + low_bit.bit_length() - 1
+                byte ^= low_bit
+
+    def iter_hits(self) -> Iterator[tuple]:
+        return (self.get_coordinates(index)
+                for index in self.iter_indices(self.hits))
+
+    def iter_misses(self) -> Iterator[tuple]:
+        return (self.get_coordinates(index)
+                for index in self.iter_indices(self.misses))
+
+    def iter_shots(self) -> Iterator[tuple]:
+        # x, y, z et résultat de chaque cellule visée, touchées d'abord :
+        # l'export commun aux deux historiques, proportionnel au nombre de
+        # tirs et non au volume
+        for x, y, z in self.iter_hits():
+            yield x, y, z, True
+        for x, y, z in self.iter_misses():
+            yield x, y, z, False
+
+    def to_cells(self) -> bytes:
+        # Un octet par cellule, dans l'ordre des bits : 0 jamais visée,
+        # 1 manquée, 2 touchée. Les deux champs sont développés octet par
+        # octet puis additionnés comme deux grands entiers (sans retenue :
+        # une cellule n'est jamais à la fois touchée et manquée).
+        if self.volume == 0:
+            return b""
+        hit_cells = int.from_bytes(
+            b"".join(BIT_CELLS[byte] for byte in self.hits), "little")
+        miss_cells = int.from_bytes(
+            b"".join(BIT_CELLS[byte] for byte in self.misses), "little")
+        cell_count = len(self.hits) * 8
+        return (hit_cells * 2 + miss_cells).to_bytes(
+            cell_count, "little")[:self.volume]
+
+
+class SparseShotHistory:
+    # Même interface que ShotHistory pour les grands volumes : le résultat
+    # du dernier tir sur chaque cellule visée, les cellules étant numérotées
+    # de la même façon
+    def __init__(self, min_x: int, max_x: int, min_y: int, max_y: int,
+                 min_z: int, max_z: int):
+        self.bounds = (min_x, max_x, min_y, max_y, min_z, max_z)
+        self.size_x = max(max_x - min_x, 0)
+        self.size_y = max(max_y - min_y, 0)
+        self.size_z = max(max_z - min_z, 0)
+        self.volume = self.size_x * self.size_y * self.size_z
+        self.results: dict[tuple, bool] = {}
+
+    def get_index(self, x, y, z) -> int:
+        min_x, _, min_y, _, min_z, _ = self.bounds
+        dx, dy, dz = x - min_x, y - min_y, z - min_z
+        if 0 <= dx < self.size_x and 0 <= dy < self.size_y \
+                and 0 <= dz < self.size_z:
+            return (dx * self.size_y + dy) * self.size_z + dz
+        return -1
+
+    def get_coordinates(self, index: int) -> tuple:
+        min_x, _, min_y, _, min_z, _ = self.bounds
+        xy, dz = divmod(index, self.size_z)
+        dx, dy = divmod(xy, self.size_y)
+        return min_x + dx, min_y + dy, min_z + dz
+
+    def record(self, x, y, z, hit: bool):
+        min_x, max_x, min_y, max_y, min_z, max_z = self.bounds
+        if min_x <= x < max_x and min_y <= y < max_y and min_z <= z < max_z:
+            self.results[(x, y, z)] = hit
+
+    def is_hit(self, x, y, z) -> bool:
+        return self.results.get((x, y, z)) is True
+
+    def is_miss(self, x, y, z) -> bool:
+        return self.results.get((x, y, z)) is False
+
+    def is_shot(self, x, y, z) -> bool:
+        return (x, y, z) in self.results
+
+    def get_hit_count(self) -> int:
+        return sum(self.results.values())
+
+    def get_miss_count(self) -> int:
+        return len(self.results) - self.get_hit_count()
+
+    def iter_hits(self) -> Iterator[tuple]:
+        return (cell for cell, hit in sorted(self.results.items()) if hit)
+
+    def iter_misses(self) -> Iterator[tuple]:
+        return (cell for cell, hit in sorted(self.results.items())
+                if not hit)
+
+    def iter_shots(self) -> Iterator[tuple]:
+        for x, y, z in self.iter_hits():
+            yield x, y, z, True
+        for x, y, z in self.iter_misses():
+            yield x, y, z, False
+
+    def to_cells(self) -> bytes:
+        # Même format que ShotHistory.to_cells, un octet par cellule du
+        # volume : sur un grand volume, iter_shots est bien moins coûteux
+        cells = bytearray(self.volume)
+        for cell, hit in self.results.items():
+            cells[self.get_index(*cell)] = 2 if hit else 1
+        return bytes(cells)
+
+
+# L'un ou l'autre, selon le volume (create_shot_history)
+AnyShotHistory = Union[ShotHistory, SparseShotHistory]
+
+
+def create_shot_history(min_x: int, max_x: int, min_y: int, max_y: int,
+                        min_z: int, max_z: int) -> AnyShotHistory:
+    volume = max(max_x - min_x, 0) * max(max_y - min_y, 0) \
+        * max(max_z - min_z, 0)
+    history_type = ShotHistory if volume <= MAX_BITSET_VOLUME \
+        else SparseShotHistory
+    return history_type(min_x, max_x, min_y, max_y, min_z, max_z)
@@ -3,9 +3,11 @@ from vessel import Vessel
 
 
 class Submarine(Vessel):
+    __slots__ = ()
+    HITS = 2
 
     def __init__(self, x: float, y: float, z: float):
-        super().__init__(x, y, z, 2, TorpedoLauncher())
+        super().__init__(x, y, z, self.HITS, TorpedoLauncher())
 
     def go_to(self, x, y, z):
         if z > 0:
@@ -3,11 +3,18 @@ from weapon import Weapon
 
 
 class SurfaceMissileLauncher(Weapon):
+    __slots__ = ()
+    AMMUNITIONS = 40
+    RANGE = 30
+
     def __init__(self):
-        super().__init__(ammunitions=40, range=30)
+        super().__init__(ammunitions=self.AMMUNITIONS, range=self.RANGE)
+
+    def can_reach(self, z) -> bool:
+        return z == 0
 
     def check_target_position(self, x, y, z):
-        if z != 0:
+        if not self.can_reach(z):
             self.ammunitions = self.ammunitions - 1
             raise OutOfRangeError(
                 "Impossible d'atteindre la cible ! z doit être = 0")
@@ -40,3 +40,26 @@ class TestAirMissileLauncher(TestCase):
         # Assert
         self.assertEqual("Vous n'avez plus de munitions !",
                          str(error_context.exception))
+
+    def test_fire_at_marks_weapon_dirty(self):
+        # Arrange
+        air_missile_launcher = AirMissileLauncher()
+
+        # Act
+        air_missile_launcher.fire_at(3, 3, 1)
+
+        # Assert
+        self.assertTrue(air_missile_launcher.dirty)
+
+    def test_can_reach_does_not_use_ammunitions(self):
+        # Arrange
+        air_missile_launcher = AirMissileLauncher()
+
+        # Act
+        reachable_depths = [z for z in (-1, 0, 1)
+                            if air_missile_launcher.can_reach(z)]
+
+        # Assert
+        self.assertEqual([1], reachable_depths)
+        self.assertEqual(AirMissileLauncher.AMMUNITIONS,
+                         air_missile_launcher.get_ammunitions())
@@ -4,6 +4,7 @@ from battlefield import Battlefield
 from cruiser import Cruiser
 from exceptions import OutOfRangeError
 from frigate import Frigate
+from shot_history import SparseShotHistory
 
 
 class TestBattleField(TestCase):
@@ -58,6 +59,38 @@ class TestBattleField(TestCase):
             "La puissance dépasse la maximum autorisé 2 !",
             str(error_context.exception))
 
+    def test_add_vessels_success(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        battlefield.add_vessel(Cruiser(0, 0, 0))
+
+        # Act
+        errors = battlefield.add_vessels([Cruiser(1, 0, 0),
+                                          Frigate(2, 0, 0)])
+
+        # Assert
+        self.assertEqual([None, None], errors)
+        self.assertEqual(3, len(battlefield.get_vessels()))
+        self.assertEqual(6 + 6 + Frigate.HITS, battlefield.get_power())
+
+    def test_add_vessels_reports_every_error(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1, 12)
+
+        # Act
+        errors = battlefield.add_vessels([
+            Cruiser(0, 0, 0), Cruiser(200, 0, 0), Cruiser(0, 0, 0),
+            Cruiser(1, 0, 0), Cruiser(2, 0, 0)])
+
+        # Assert
+        self.assertEqual([None, OutOfRangeError, ValueError, None, ValueError],
+                         [type(error) if error is not None else None
+                          for error in errors])
+        self.assertEqual("La puissance dépasse la maximum autorisé 12 !",
+                         str(errors[4]))
+        self.assertEqual([], battlefield.get_vessels())
+        self.assertEqual(0, battlefield.get_power())
+
     def test_fired_at_fail(self):
         # Arrange
         battlefield = Battlefield(0, 100, 0, 100, -1, 1)
@@ -79,3 +112,189 @@ class TestBattleField(TestCase):
 
         # Assert
         self.assertTrue(touched)
+
+    def test_get_vessel_by_coordinates_after_go_to(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        frigate = Frigate(50, 50, 0)
+        battlefield.add_vessel(frigate)
+
+        # Act
+        frigate.go_to(10, 10, 0)
+
+        # Assert
+        self.assertIsNone(battlefield.get_vessel_by_coordinates(50, 50, 0))
+        self.assertIs(frigate, battlefield.get_vessel_by_coordinates(10, 10, 0))
+        self.assertTrue(battlefield.fired_at(10, 10, 0))
+
+    def test_go_to_position_not_empty(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        frigate = Frigate(50, 50, 0)
+        battlefield.add_vessel(frigate)
+        battlefield.add_vessel(Cruiser(10, 10, 0))
+
+        # Act
+        with self.assertRaises(ValueError) as error_context:
+            frigate.go_to(10, 10, 0)
+
+        # Assert
+        self.assertEqual(
+            "Il y a déjà un vaisseau positionné ici !",
+            str(error_context.exception))
+        self.assertEqual((50, 50, 0), frigate.get_coordinates())
+
+    def test_get_power_after_fired_at(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        battlefield.add_vessel(Frigate(50, 50, 0))
+        battlefield.add_vessel(Cruiser(10, 10, 0))
+
+        # Act
+        battlefield.fired_at(50, 50, 0)
+
+        # Assert
+        self.assertEqual(10, battlefield.get_power())
+
+    def test_destroyed_vessels_count(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        battlefield.add_vessel(Frigate(50, 50, 0))
+        battlefield.add_vessel(Cruiser(10, 10, 0))
+
+        # Act
+        for _ in range(5):
+            battlefield.fired_at(50, 50, 0)
+
+        # Assert
+        self.assertEqual(1, battlefield.get_destroyed_vessels_count())
+        self.assertEqual(1, battlefield.get_alive_vessels_count())
+        self.assertFalse(battlefield.all_vessels_destroyed())
+
+    def test_empty_battlefield_is_not_destroyed(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+
+        # Act
+        destroyed = battlefield.all_vessels_destroyed()
+
+        # Assert
+        self.assertFalse(destroyed)
+
+    def test_remove_vessel(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        frigate = Frigate(50, 50, 0)
+        battlefield.add_vessel(frigate)
+        battlefield.add_vessel(Cruiser(10, 10, 0))
+
+        # Act
+        battlefield.remove_vessel(frigate)
+
+        # Assert
+        self.assertEqual(6, battlefield.get_power())
+        self.assertEqual(1, battlefield.get_alive_vessels_count())
+        self.assertIsNone(battlefield.get_vessel_by_coordinates(50, 50, 0))
+
+    def test_fired_at_many(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        battlefield.add_vessel(Frigate(50, 50, 0))
+
+        # Act
+        results = battlefield.fired_at_many([(1, 1, 0), (50, 50, 0),
+                                             (50, 50, 0)])
+
+        # Assert
+        self.assertEqual([False, True, True], results)
+        self.assertEqual(3, battlefield.get_power())
+
+    def test_dirty_vessels_after_fired_at(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        frigate = Frigate(50, 50, 0)
+        cruiser = Cruiser(10, 10, 0)
+        battlefield.add_vessel(frigate)
+        battlefield.add_vessel(cruiser)
+        battlefield.mark_clean()
+
+        # Act
+        battlefield.fired_at(50, 50, 0)
+
+        # Assert
+        self.assertTrue(battlefield.is_dirty())
+        self.assertEqual({frigate}, battlefield.dirty_vessels)
+        self.assertTrue(frigate.dirty)
+        self.assertFalse(cruiser.dirty)
+
+    def test_mark_clean(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        cruiser = Cruiser(10, 10, 0)
+        battlefield.add_vessel(cruiser)
+        cruiser.fire_at(10, 10, 1)
+
+        # Act
+        battlefield.mark_clean()
+
+        # Assert
+        self.assertFalse(battlefield.is_dirty())
+        self.assertFalse(cruiser.dirty)
+        self.assertFalse(cruiser.get_weapon().dirty)
+
+    def test_fired_at_records_shot_history(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        battlefield.add_vessel(Frigate(50, 50, 0))
+
+        # Act
+        battlefield.fired_at(50, 50, 0)
+        battlefield.fired_at(10, 10, 0)
+
+        # Assert
+        shot_history = battlefield.get_shot_history()
+        self.assertTrue(shot_history.is_hit(50, 50, 0))
+        self.assertTrue(shot_history.is_miss(10, 10, 0))
+        self.assertFalse(shot_history.is_shot(20, 20, 0))
+
+    def test_shot_history_is_created_on_first_shot(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        self.assertIsNone(battlefield.shot_history)
+
+        # Act
+        battlefield.fired_at(1, 1, 0)
+
+        # Assert
+        self.assertTrue(battlefield.shot_history.is_miss(1, 1, 0))
+
+    def test_fired_at_marks_shots_dirty(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        battlefield.add_vessel(Frigate(50, 50, 0))
+        battlefield.mark_clean()
+
+        # Act
+        battlefield.fired_at(10, 10, 0)
+
+        # Assert
+        self.assertTrue(battlefield.shots_dirty)
+        self.assertTrue(battlefield.is_dirty())
+        battlefield.mark_clean()
+        self.assertFalse(battlefield.shots_dirty)
+
+    def test_large_battlefield_keeps_sparse_shot_history(self):
+        # Arrange
+        battlefield = Battlefield(0, 10000, 0, 10000, -10, 10)
+        battlefield.add_vessel(Frigate(5000, 5000, 0))
+
+        # Act
+        battlefield.fired_at(5000, 5000, 0)
+        battlefield.fired_at(9999, 9999, 9)
+
+        # Assert
+        shot_history = battlefield.get_shot_history()
+        self.assertIsInstance(shot_history, SparseShotHistory)
+        self.assertTrue(shot_history.is_hit(5000, 5000, 0))
+        self.assertTrue(shot_history.is_miss(9999, 9999, 9))
+        self.assertEqual([(5000, 5000, 0)], list(shot_history.iter_hits()))
@@ -1,5 +1,6 @@
 from unittest import TestCase
 
+from air_missile_launcher import AirMissileLauncher
 from cruiser import Cruiser
 from exceptions import OutOfRangeError
 
@@ -48,3 +49,13 @@ class TestCruiser(TestCase):
         # Assert
         self.assertEqual("La cible est hors de portée!",
                          str(error_context.exception))
+
+    def test_stats_from_class_constants(self):
+        # Arrange
+        cruiser = Cruiser(0, 0, 0)
+
+        # Assert
+        self.assertEqual(Cruiser.HITS, cruiser.get_hits())
+        self.assertEqual(AirMissileLauncher.RANGE,
+                         cruiser.get_weapon().get_range())
+        self.assertFalse(hasattr(cruiser.get_weapon(), '__dict__'))
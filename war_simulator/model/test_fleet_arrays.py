@@ -0,0 +1,104 @@
+from unittest import TestCase, skipIf
+
+from battlefield import Battlefield
+from cruiser import Cruiser
+from exceptions import OutOfRangeError
+from fleet_arrays import np
+from frigate import Frigate
+from submarine import Submarine
+
+
+@skipIf(np is None, "NumPy n'est pas installé")
+class TestFleetArrays(TestCase):
+
+    def test_get_vessels_in_range_of(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        cruiser = Cruiser(0, 0, 0)
+        frigate = Frigate(50, 50, 0)
+        battlefield.add_vessel(cruiser)
+        battlefield.add_vessel(frigate)
+        fleet_arrays = battlefield.enable_fleet_arrays()
+
+        # Act
+        vessels = fleet_arrays.get_vessels_in_range_of(30, 0, 0)
+
+        # Assert
+        self.assertEqual([cruiser], vessels)
+
+    def test_get_vessels_in_range_of_skips_destroyed_vessels(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        submarine = Submarine(0, 0, 0)
+        battlefield.enable_fleet_arrays()
+        battlefield.add_vessel(submarine)
+
+        # Act
+        battlefield.fired_at(0, 0, 0)
+        battlefield.fired_at(0, 0, 0)
+
+        # Assert
+        self.assertEqual(
+            [], battlefield.get_fleet_arrays().get_vessels_in_range_of(1, 1, 0))
+
+    def test_get_vessels_in_box_after_go_to(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        frigate = Frigate(50, 50, 0)
+        battlefield.add_vessel(frigate)
+        battlefield.add_vessel(Cruiser(10, 10, 0))
+        fleet_arrays = battlefield.enable_fleet_arrays()
+
+        # Act
+        frigate.go_to(80, 80, 0)
+
+        # Assert
+        self.assertEqual([frigate],
+                         fleet_arrays.get_vessels_in_box(70, 90, 70, 90, 0, 0))
+        self.assertEqual([], fleet_arrays.get_vessels_in_box(40, 60, 40, 60,
+                                                             0, 0))
+
+    def test_get_nearest_vessel_after_remove(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        frigate = Frigate(50, 50, 0)
+        cruiser = Cruiser(10, 10, 0)
+        battlefield.add_vessel(frigate)
+        battlefield.add_vessel(cruiser)
+        fleet_arrays = battlefield.enable_fleet_arrays()
+
+        # Act
+        battlefield.remove_vessel(cruiser)
+
+        # Assert
+        self.assertIs(frigate, fleet_arrays.get_nearest_vessel(0, 0, 0))
+
+    def test_ammunitions_updated_when_fire_fails(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1)
+        submarine = Submarine(0, 0, 0)
+        battlefield.add_vessel(submarine)
+        fleet_arrays = battlefield.enable_fleet_arrays()
+
+        # Act
+        with self.assertRaises(OutOfRangeError):
+            submarine.fire_at(1, 1, 1)
+
+        # Assert
+        self.assertEqual(14, fleet_arrays.ammunitions[0])
+
+    def test_grow(self):
+        # Arrange
+        battlefield = Battlefield(0, 100, 0, 100, -1, 1, 1000)
+        fleet_arrays = battlefield.enable_fleet_arrays()
+
+        # Act
+        for x in range(100):
+            battlefield.add_vessel(Submarine(x, 0, 0))
+
+        # Assert
+        self.assertEqual(100, len(fleet_arrays))
+        self.assertEqual(Submarine, type(fleet_arrays.get_nearest_vessel(
+            99, 0, 0)))
+        self.assertEqual((99, 0, 0), fleet_arrays.get_nearest_vessel(
+            99, 0, 0).get_coordinates())
@@ -0,0 +1,129 @@
+from unittest import TestCase
+
+from shot_history import MAX_BITSET_VOLUME, ShotHistory, \
+    SparseShotHistory, create_shot_history
+
+
+class TestShotHistory(TestCase):
+    def test_record_keeps_hits_and_misses_separately(self):
+        # Arrange
+        shot_history = ShotHistory(0, 10, 0, 10, -1, 1)
+
+        # Act
+        shot_history.record(1, 2, 0, hit=True)
+        shot_history.record(3, 4, -1, hit=False)
+
+        # Assert
+        self.assertTrue(shot_history.is_hit(1, 2, 0))
+        self.assertFalse(shot_history.is_miss(1, 2, 0))
+        self.assertTrue(shot_history.is_miss(3, 4, -1))
+        self.assertFalse(shot_history.is_hit(3, 4, -1))
+        self.assertTrue(shot_history.is_shot(1, 2, 0))
+        self.assertFalse(shot_history.is_shot(5, 5, 0))
+
+    def test_record_keeps_last_result(self):
+        # Arrange
+        shot_history = ShotHistory(0, 10, 0, 10, -1, 1)
+        shot_history.record(1, 2, 0, hit=True)
+
+        # Act
+        shot_history.record(1, 2, 0, hit=False)
+
+        # Assert
+        self.assertEqual(0, shot_history.get_hit_count())
+        self.assertEqual(1, shot_history.get_miss_count())
+
+    def test_record_ignores_cells_out_of_volume(self):
+        # Arrange
+        shot_history = ShotHistory(0, 10, 0, 10, -1, 1)
+
+        # Act
+        shot_history.record(10, 0, 0, hit=False)
+
+        # Assert
+        self.assertEqual(0, shot_history.get_miss_count())
+        self.assertFalse(shot_history.is_shot(10, 0, 0))
+
+    def test_memory_is_one_bit_per_cell(self):
+        # Act
+        shot_history = ShotHistory(0, 100, 0, 100, -5, 5)
+
+        # Assert
+        self.assertEqual(100 * 100 * 10 // 8, len(shot_history.hits))
+        self.assertEqual(100 * 100 * 10 // 8, len(shot_history.misses))
+
+    def test_iter_hits_and_misses(self):
+        # Arrange
+        shot_history = ShotHistory(-5, 5, 0, 3, -1, 2)
+        shot_history.record(-5, 0, -1, hit=True)
+        shot_history.record(4, 2, 1, hit=True)
+        shot_history.record(0, 1, 0, hit=False)
+
+        # Act
+        hits = list(shot_history.iter_hits())
+        misses = list(shot_history.iter_misses())
+
+        # Assert
+        self.assertEqual([(-5, 0, -1), (4, 2, 1)], hits)
+        self.assertEqual([(0, 1, 0)], misses)
+
+    def test_to_cells(self):
+        # Arrange
+        shot_history = ShotHistory(0, 3, 0, 2, 0, 2)
+        shot_history.record(0, 0, 1, hit=True)
+        shot_history.record(2, 1, 1, hit=False)
+
+        # Act
+        cells = shot_history.to_cells()
+
+        # Assert
+        self.assertEqual(12, len(cells))
+        self.assertEqual(2, cells[shot_history.get_index(0, 0, 1)])
+        self.assertEqual(1, cells[shot_history.get_index(2, 1, 1)])
+        self.assertEqual(3, sum(cells))
+
+    def test_sparse_history_matches_bitsets(self):
+        # Arrange
+        shot_history = ShotHistory(0, 10, 0, 10, -1, 1)
+        sparse_history = SparseShotHistory(0, 10, 0, 10, -1, 1)
+        shots = [(1, 2, 0, True), (3, 4, -1, False), (1, 2, 0, False),
+                 (5, 5, 0, True), (10, 0, 0, True)]
+
+        # Act
+        for x, y, z, hit in shots:
+            shot_history.record(x, y, z, hit)
+            sparse_history.record(x, y, z, hit)
+
+        # Assert
+        self.assertEqual(list(shot_history.iter_hits()),
+                         list(sparse_history.iter_hits()))
+        self.assertEqual(list(shot_history.iter_misses()),
+                         list(sparse_history.iter_misses()))
+        self.assertEqual(shot_history.get_hit_count(),
+                         sparse_history.get_hit_count())
+        self.assertEqual(shot_history.get_miss_count(),
+                         sparse_history.get_miss_count())
+        self.assertEqual(list(shot_history.iter_shots()),
+                         list(sparse_history.iter_shots()))
+        self.assertEqual(shot_history.to_cells(), sparse_history.to_cells())
+
+    def test_export_history_larger_than_bitsets(self):
+        # Arrange
+        shot_history = create_shot_history(0, 1 << 12, 0, 1 << 12, 0, 2)
+        self.assertGreater(shot_history.volume, MAX_BITSET_VOLUME)
+        shot_history.record(4000, 1, 1, hit=True)
+        shot_history.record(2, 3, 0, hit=False)
+
+        # Act
+        shots = list(shot_history.iter_shots())
+        cells = shot_history.to_cells()
+
+        # Assert
+        self.assertIsInstance(shot_history, SparseShotHistory)
+        self.assertEqual([(4000, 1, 1, True), (2, 3, 0, False)], shots)
+        self.assertEqual(shot_history.volume, len(cells))
+        self.assertEqual(2, cells[shot_history.get_index(4000, 1, 1)])
+        self.assertEqual(1, cells[shot_history.get_index(2, 3, 0)])
+        self.assertEqual((4000, 1, 1), shot_history.get_coordinates(
+            shot_history.get_index(4000, 1, 1)))
+        self.assertEqual(3, sum(cells))
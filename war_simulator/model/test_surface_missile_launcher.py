@@ -40,3 +40,16 @@ class TestSurfaceMissileLauncher(TestCase):
         # Assert
         self.assertEqual("Vous n'avez plus de munitions !",
                          str(error_context.exception))
+
+    def test_can_reach_does_not_use_ammunitions(self):
+        # Arrange
+        surface_missile_launcher = SurfaceMissileLauncher()
+
+        # Act
+        reachable_depths = [z for z in (-1, 0, 1)
+                            if surface_missile_launcher.can_reach(z)]
+
+        # Assert
+        self.assertEqual([0], reachable_depths)
+        self.assertEqual(SurfaceMissileLauncher.AMMUNITIONS,
+                         surface_missile_launcher.get_ammunitions())
@@ -40,3 +40,16 @@ class TestTorpedoLauncher(TestCase):
         # Assert
         self.assertEqual("Vous n'avez plus de munitions !",
                          str(error_context.exception))
+
+    def test_can_reach_does_not_use_ammunitions(self):
+        # Arrange
+        torpedo_launcher = TorpedoLauncher()
+
+        # Act
+        reachable_depths = [z for z in (-1, 0, 1)
+                            if torpedo_launcher.can_reach(z)]
+
+        # Assert
+        self.assertEqual([-1, 0], reachable_depths)
+        self.assertEqual(TorpedoLauncher.AMMUNITIONS,
+                         torpedo_launcher.get_ammunitions())
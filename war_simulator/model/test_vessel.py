@@ -37,3 +37,14 @@ class TestVessel(TestCase):
 
         # Assert
         self.assertEqual(9, distance)
+
+    def test_vessel_has_no_instance_dict(self):
+        # Arrange
+        vessel = Vessel(0, 0, 0, 1, None)
+
+        # Act
+        with self.assertRaises(AttributeError):
+            vessel.unknown_attribute = 1
+
+        # Assert
+        self.assertFalse(hasattr(vessel, '__dict__'))
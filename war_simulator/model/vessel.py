@@ -5,11 +5,28 @@ from weapon import Weapon
 
 
 class Vessel:
+    __slots__ = ('id', 'battlefield', '_coordinates', 'hits_to_be_destroyed',
+                 'weapon', 'dirty')
+
     def __init__(self, x: float, y: float, z: float, hits: int,
                  weapon: Weapon):
+        self.id = None
+        self.battlefield = None
         self.coordinates = x, y, z
         self.hits_to_be_destroyed = hits
         self.weapon = weapon
+        self.dirty = False
+
+    @property
+    def coordinates(self) -> (float, float, float):
+        return self._coordinates
+
+    @coordinates.setter
+    def coordinates(self, coordinates: (float, float, float)):
+        if self.battlefield is not None:
+            self.battlefield.move_vessel(self, *coordinates)
+        self._coordinates = coordinates
+        self.dirty = True
 
     def go_to(self, x, y, z):
         if self.hits_to_be_destroyed == 0:
@@ -27,10 +44,22 @@ class Vessel:
         if self.calculate_distance_to(x, y, z) > self.weapon.get_range():
             raise OutOfRangeError('La cible est hors de portée!')
 
-        self.weapon.fire_at(x, y, z)
+        try:
+            self.weapon.fire_at(x, y, z)
+        finally:
+            if self.battlefield is not None:
+                self.battlefield.vessel_fired(self)
 
     def touched(self):
         self.hits_to_be_destroyed = self.hits_to_be_destroyed - 1
+        self.dirty = True
+        if self.battlefield is not None:
+            self.battlefield.vessel_touched(self)
+
+    def mark_clean(self):
+        self.dirty = False
+        if self.weapon is not None:
+            self.weapon.dirty = False
 
     def get_weapon(self) -> Weapon:
         return self.weapon
@@ -2,9 +2,22 @@ from exceptions import NoAmmunitionError
 
 
 class Weapon:
+    __slots__ = ('id', '_ammunitions', 'range', 'dirty')
+
     def __init__(self, ammunitions: int, range: int):
+        self.id = None
         self.ammunitions = ammunitions
         self.range = range
+        self.dirty = False
+
+    @property
+    def ammunitions(self) -> int:
+        return self._ammunitions
+
+    @ammunitions.setter
+    def ammunitions(self, ammunitions: int):
+        self._ammunitions = ammunitions
+        self.dirty = True
 
     def fire_at(self, x, y, z):
         if self.ammunitions == 0:
@@ -20,5 +33,8 @@ class Weapon:
     def get_range(self):
         return self.range
 
+    def can_reach(self, z) -> bool:
+        raise NotImplementedError()
+
     def check_target_position(self, x, y, z):
         raise NotImplementedError()
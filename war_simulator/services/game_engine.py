@@ -0,0 +1,86 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class GameEngine:
+    # Répartit les parties entre plusieurs shards selon leur id. Chaque shard
+    # est un thread qui possède son propre état (typiquement un GameService,
+    # avec son cache de parties) et traite sa file de commandes dans l'ordre :
+    # les commandes d'une même partie ne s'exécutent jamais en même temps,
+    # sans verrou par partie, alors que des parties de shards différents
+    # avancent en parallèle.
+    def __init__(self, shard_states: list):
+        self.shard_states = shard_states
+        self.queues = [queue.SimpleQueue() for _ in shard_states]
+        self.threads = [threading.Thread(target=self.run_shard,
+                                         args=(commands, shard_state),
+                                         name=f"game-engine-{index}",
+                                         daemon=True)
+                        for index, (commands, shard_state)
+                        in enumerate(zip(self.queues, shard_states))]
+        self.next_shard = itertools.cycle(range(len(shard_states)))
+        self.closed = threading.Event()
+        self.timers: list[threading.Thread] = []
+        for thread in self.threads:
+            thread.start()
+
+    def schedule(self, interval: float, command, *args):
+        # Soumet command à chaque shard toutes les interval secondes : elle
+        # s'exécute dans le thread du shard, entre deux commandes, et peut
+        # donc toucher à son état sans verrou. Un shard occupé n'en reçoit
+        # pas une de plus tant que la précédente attend dans sa file.
+        pending = [threading.Event() for _ in self.queues]
+
+        def run_scheduled(shard_state, shard_pending: threading.Event):
+            shard_pending.clear()
+            command(shard_state, *args)
+
+        def run_timer():
+            while not self.closed.wait(interval):
+                for commands, shard_pending in zip(self.queues, pending):
+                    if shard_pending.is_set():
+                        continue
+                    shard_pending.set()
+                    commands.put((Future(), run_scheduled, (shard_pending,)))
+        timer = threading.Thread(target=run_timer, name="game-engine-timer",
+                                 daemon=True)
+        self.timers.append(timer)
+        timer.start()
+
+    def get_shard(self, game_id: int) -> int:
+        return hash(game_id) % len(self.shard_states)
+
+    def submit(self, game_id, command, *args) -> Future:
+        # La commande est appelée avec l'état du shard suivi de args. Avec
+        # game_id None (création d'une partie), le shard est choisi à tour
+        # de rôle.
+        shard = next(self.next_shard) if game_id is None \
+            else self.get_shard(game_id)
+        future = Future()
+        self.queues[shard].put((future, command, args))
+        return future
+
+    def run_shard(self, commands: queue.SimpleQueue, shard_state):
+        while True:
+            item = commands.get()
+            if item is None:
+                return
+            future, command, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(command(shard_state, *args))
+            except BaseException as error:
+                future.set_exception(error)
+
+    def close(self):
+        # Les commandes déjà soumises sont traitées avant l'arrêt
+        self.closed.set()
+        for timer in self.timers:
+            timer.join()
+        for commands in self.queues:
+            commands.put(None)
+        for thread in self.threads:
+            thread.join()
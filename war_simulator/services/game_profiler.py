@@ -0,0 +1,76 @@
+import cProfile
+import os
+import pstats
+import threading
+import time
+from collections import deque
+
+
+def format_function(function: tuple) -> str:
+    file_name, line, name = function
+    if file_name == "~":
+        # Fonction native : name est déjà de la forme <built-in method ...>
+        return name
+    return f"{os.path.basename(file_name)}:{line}({name})"
+
+
+class GameProfiler:
+    # Profilage à la demande des commandes de GameService : une commande
+    # enveloppée par wrap est exécutée sous cProfile, et les top_n fonctions
+    # où elle a passé le plus de temps propre sont gardées avec sa durée.
+    # Seuls les capacity derniers profils sont conservés (tampon circulaire).
+    # Une commande non enveloppée ne coûte rien.
+    def __init__(self, capacity: int = 100, top_n: int = 20):
+        self.top_n = top_n
+        self.profiles = deque(maxlen=capacity)
+        # Une seule mesure à la fois : à partir de Python 3.12, cProfile ne
+        # peut être actif que dans un seul thread
+        self.profile_lock = threading.Lock()
+        self.lock = threading.Lock()
+
+    def wrap(self, command):
+        def profiled(*args):
+            return self.profile(command.__name__, command, *args)
+        profiled.__name__ = command.__name__
+        return profiled
+
+    def profile(self, operation: str, command, *args):
+        profiler = cProfile.Profile()
+        with self.profile_lock:
+            start = time.perf_counter()
+            try:
+                return profiler.runcall(command, *args)
+            finally:
+                duration = time.perf_counter() - start
+                self.add_profile(operation, duration, profiler)
+
+    def add_profile(self, operation: str, duration: float,
+                    profiler: cProfile.Profile):
+        stats = pstats.Stats(profiler).stats
+        hot_functions = sorted(stats.items(), key=lambda item: item[1][2],
+                               reverse=True)[:self.top_n]
+        entry = {"operation": operation,
+                 "timestamp": time.time(),
+                 "duration": duration,
+                 "functions": [
+                     {"function": format_function(function),
+                      "calls": calls,
+                      "total_time": total_time,
+                      "cumulative_time": cumulative_time}
+                     for function, (_, calls, total_time, cumulative_time, _)
+                     in hot_functions]}
+        with self.lock:
+            self.profiles.append(entry)
+
+    def get_profiles(self, operation: str = None) -> list[dict]:
+        # Du plus récent au plus ancien
+        with self.lock:
+            profiles = list(reversed(self.profiles))
+        if operation is not None:
+            profiles = [profile for profile in profiles
+                        if profile["operation"] == operation]
+        return profiles
+
+    def clear(self):
+        with self.lock:
+            self.profiles.clear()
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+
+class GamePubSub:
+    # Diffusion en mémoire des événements d'une partie à ses abonnés (les
+    # WebSockets des joueurs). Chaque abonné a sa propre file ; si un abonné
+    # ne lit pas assez vite, ses événements les plus anciens sont perdus.
+    # publish peut être appelée depuis n'importe quel thread : l'événement
+    # est déposé dans la boucle asyncio de chaque abonné.
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self.subscribers: dict[int, dict[asyncio.Queue,
+                                         asyncio.AbstractEventLoop]] = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, game_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self.lock:
+            self.subscribers.setdefault(game_id, {})[queue] = \
+                asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, game_id: int, queue: asyncio.Queue):
+        with self.lock:
+            queues = self.subscribers.get(game_id)
+            if queues is None:
+                return
+            queues.pop(queue, None)
+            if not queues:
+                del self.subscribers[game_id]
+
+    def publish(self, game_id: int, event: dict):
+        with self.lock:
+            subscribers = list(self.subscribers.get(game_id, {}).items())
+        for queue, loop in subscribers:
+            loop.call_soon_threadsafe(put_dropping_oldest, queue, event)
+
+    def get_subscriber_count(self, game_id: int) -> int:
+        return len(self.subscribers.get(game_id, ()))
+
+
+def put_dropping_oldest(queue: asyncio.Queue, event: dict):
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
@@ -1,20 +1,46 @@
-from war_simulator.dao.game_dao import GameDao
+import functools
+
+from war_simulator.dao.game_archive import GameArchiveWriter
+from war_simulator.dao.game_cache import GameCache
+from war_simulator.dao.game_dao import GameDao, VESSEL_TYPES
+from war_simulator.dao.game_event_log import GameEventLog, GAME_CREATED, \
+    PLAYER_JOINED, VESSEL_PLACED, SHOT_FIRED, HIT, player_to_dict, \
+    vessel_placed_payload
+from war_simulator.services.game_pubsub import GamePubSub
+from war_simulator.services.metrics import MetricsRegistry, TimedProxy
 from war_simulator.model.game import Game
 from war_simulator.model.battlefield import Battlefield
 from war_simulator.model.player import Player
-from war_simulator.model.vessel import Vessel
 
 
 class GameService:
-    def __init__(self):
-        self.game_dao = GameDao()
+    def __init__(self, write_behind: bool = False, event_log: bool = False,
+                 archive_path: str = None, pubsub: GamePubSub = None,
+                 metrics: MetricsRegistry = None):
+        # Les actions sont écrites par GameDao, avec la partie
+        self.event_log = GameEventLog() if event_log else None
+        game_dao = GameDao(self.event_log)
+        if metrics is not None:
+            # Seuls les appels qui atteignent la base sont mesurés, pas ceux
+            # servis par le cache
+            game_dao = TimedProxy(game_dao, metrics.histogram(
+                "tdlog_dao_duration_seconds",
+                "Durée des appels à GameDao, en secondes", ("operation",)))
+        self.game_dao = GameCache(game_dao, write_behind=write_behind)
+        self.game_archive = GameArchiveWriter(archive_path) \
+            if archive_path is not None else None
+        self.pubsub = pubsub if pubsub is not None else GamePubSub()
 
     def create_game(self, player_name: str, min_x: int, max_x: int, min_y: int,
                     max_y: int, min_z: int, max_z: int) -> int:
         game = Game()
         battlefield = Battlefield(min_x, max_x, min_y, max_y, min_z, max_z)
-        game.add_player(Player(player_name, battlefield))
-        return self.game_dao.create_game(game)
+        player = Player(player_name, battlefield)
+        game.add_player(player)
+        # Les charges utiles qui portent des ids sont calculées à l'écriture,
+        # quand ils sont connus
+        return self.game_dao.create_game(
+            game, [(GAME_CREATED, functools.partial(player_to_dict, player))])
 
     def join_game(self, game_id: int, player_name: str) -> bool:
         game = self.game_dao.find_game(game_id)
@@ -30,7 +56,10 @@ class GameService:
         player = Player(player_name, battlefield)
         game.add_player(player)
         # Enregistrez la partie mise à jour dans la base de données
-        self.game_dao.update_game(game)
+        self.game_dao.update_game(
+            game, [(PLAYER_JOINED, functools.partial(player_to_dict, player))])
+        self.pubsub.publish(game_id, {"type": "player_joined",
+                                      "player_name": player_name})
         return True
 
     def get_game(self, game_id: int) -> Game:
@@ -45,55 +74,127 @@ class GameService:
         player = next((p for p in game.players if p.name == player_name), None)
         if player is None:
             return False
-        # Vérifier si la position est disponible sur le champ de bataille du joueur
-        if (x < player.battlefield.min_x or x > player.battlefield.max_x or
-                y < player.battlefield.min_y or y > player.battlefield.max_y or
-                z < player.battlefield.min_z or z > player.battlefield.max_z):
-            return False
-        # Vérifier si le joueur a atteint la limite de vaisseaux autorisés sur son champ de bataille
-        if len(player.battlefield.vessels) >= player.battlefield.max_hits:
-            return False
-        # Créer le vaisseau et l'ajouter au champ de bataille du joueur
-        vessel = Vessel(x, y, z, vessel_type)
-
-        if not Battlefield.add_vessel(vessel):
+        if vessel_type not in VESSEL_TYPES:
             return False
-        self.game_dao.db_session.merge(player)
+        # Créer le vaisseau et l'ajouter au champ de bataille du joueur :
+        # Battlefield.add_vessel vérifie la position et la puissance
+        vessel = VESSEL_TYPES[vessel_type](x, y, z)
+        player.battlefield.add_vessel(vessel)
+        self.game_dao.update_game(game, [
+            (VESSEL_PLACED, functools.partial(vessel_placed_payload,
+                                              player_name, vessel))])
         return True
 
+    def add_vessels(self, game_id: int, player_name: str,
+                    vessels: list[tuple[str, int, int, int]]) -> dict:
+        # Placement de toute une flotte (type et coordonnées de chaque
+        # vaisseau) : une lecture de la partie, une vérification de tous les
+        # vaisseaux et une seule écriture. Si un vaisseau est refusé, aucun
+        # n'est placé ; l'erreur de chacun est renvoyée.
+        game = self.game_dao.find_game(game_id)
+        if game is None:
+            return {"placed": False, "vessels": []}
+        player = next((p for p in game.players if p.name == player_name), None)
+        if player is None:
+            return {"placed": False, "vessels": []}
+        built_vessels = [VESSEL_TYPES[vessel_type](x, y, z)
+                         if vessel_type in VESSEL_TYPES else None
+                         for vessel_type, x, y, z in vessels]
+        known_vessels = [vessel for vessel in built_vessels
+                         if vessel is not None]
+        battlefield = player.battlefield
+        if len(known_vessels) == len(built_vessels):
+            placement_errors = iter(battlefield.add_vessels(known_vessels))
+        else:
+            placement_errors = iter(battlefield.check_vessels(known_vessels))
+        errors = [next(placement_errors) if vessel is not None
+                  else ValueError(f"Type de vaisseau inconnu : {vessel_type}")
+                  for vessel, (vessel_type, _, _, _)
+                  in zip(built_vessels, vessels)]
+        placed = all(error is None for error in errors)
+        if placed:
+            # Les ids des vaisseaux sont renvoyés : la partie est écrite
+            # tout de suite, même en mode write-behind
+            self.game_dao.update_game(game, [
+                (VESSEL_PLACED, functools.partial(vessel_placed_payload,
+                                                  player_name, vessel))
+                for vessel in known_vessels])
+            self.game_dao.flush(game_id)
+        return {"placed": placed,
+                "vessels": [{"vessel_id": vessel.id if placed else None,
+                             "error": type(error).__name__
+                             if error is not None else None,
+                             "message": str(error)
+                             if error is not None else None}
+                            for vessel, error in zip(built_vessels, errors)]}
+
     def shoot_at(self, game_id: int, shooter_name: str, vessel_id: int, x: int, y: int, z: int) -> bool:
-        # Vérifier si la partie existe
+        # Un tir isolé est une salve d'un seul tir
+        return self.shoot_salvo(game_id, shooter_name, vessel_id,
+                                [(x, y, z)]) == [True]
+
+    def shoot_salvo(self, game_id: int, shooter_name: str, vessel_id: int,
+                    targets: list[tuple[int, int, int]]) -> list[bool]:
+        # Une seule lecture et une seule écriture en base pour toute la salve
         game = self.game_dao.find_game(game_id)
         if game is None:
-            return False
-        # Vérifier si le joueur fait partie de la partie
+            return []
         shooter = next((p for p in game.players if p.name == shooter_name), None)
         if shooter is None:
-            return False
-        # Vérifier si le vaisseau appartient au joueur et s'il peut tirer
-        vessel = next((v for v in shooter.battlefield.vessels if v.id == vessel_id and v.can_shoot()), None)
+            return []
+        vessel = next((v for v in shooter.battlefield.vessels if v.id == vessel_id), None)
         if vessel is None:
-            return False
-        # Vérifier si la cible est dans la portée de l'arme du vaisseau
-        if not vessel.in_range(x, y, z):
-            return False
-        # Trouver la cible (un vaisseau adverse)
-        for p in game.players:
-            if p.name == shooter_name:
-                continue
-            target = next((v for v in p.battlefield.vessels if v.coord_x == x and v.coord_y == y and v.coord_z == z),
-                          None)
-            if target is not None:
-                break
-        # Si la cible n'a pas été trouvée, cela signifie que
-        # la coordonnée (x, y, z) ne correspond à aucun vaisseau
-        # dans la partie
-            if target is None:
-                return False
-        # Tirer sur la cible
-            vessel.fire_at(target)
-        # Mettre à jour la base de données
-        self.game_dao.db_session.merge(shooter)
+            return []
+        opponent = next((p for p in game.players if p.name != shooter_name), None)
+        if opponent is None:
+            return []
+        # Si un tir est impossible, l'exception interrompt la salve : seuls
+        # les tirs déjà partis sont appliqués et enregistrés
+        game_was_running = not opponent.battlefield.all_vessels_destroyed()
+        fired_targets = []
+        events = []
+        try:
+            for x, y, z in targets:
+                # Même refusé par l'arme, un tir peut consommer une munition :
+                # il est journalisé avant d'être tiré
+                events.append((SHOT_FIRED,
+                               {"player_name": shooter_name,
+                                "from": vessel.get_coordinates(),
+                                "target": (x, y, z)}))
+                vessel.fire_at(x, y, z)
+                fired_targets.append((x, y, z))
+        finally:
+            results = opponent.battlefield.fired_at_many(fired_targets)
+            events.extend((HIT, {"player_name": opponent.name,
+                                 "x": x, "y": y, "z": z})
+                          for (x, y, z), touched in zip(fired_targets, results)
+                          if touched)
+            self.game_dao.update_game(game, events)
+            if fired_targets:
+                self.pubsub.publish(game_id, {"type": "shots",
+                                              "shooter_name": shooter_name,
+                                              "targets": fired_targets,
+                                              "results": results})
+            if game_was_running and opponent.battlefield.all_vessels_destroyed():
+                # Fin de partie
+                self.game_dao.flush(game_id)
+                if self.game_archive is not None:
+                    self.game_archive.append(game)
+                self.pubsub.publish(game_id, {"type": "game_over",
+                                              "winner": shooter_name})
+        return results
+
+    def get_cache_stats(self) -> dict:
+        return self.game_dao.get_stats()
+
+    def flush_if_due(self):
+        # Écrit les parties en attente depuis plus de flush_interval
+        # (mode write-behind)
+        self.game_dao.flush_if_due()
+
+    def close(self):
+        # Écrit les parties encore en attente (mode write-behind)
+        self.game_dao.flush()
 
     def get_game_status(self, game_id: int, player_name: str) -> str:
         game = self.game_dao.find_game(game_id)
@@ -0,0 +1,195 @@
+import bisect
+import threading
+import time
+
+# Format texte d'exposition lu par Prometheus
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Limites supérieures (en secondes) des seaux des histogrammes de durée
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                    0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"") \
+        .replace("\n", "\\n")
+
+
+def format_labels(labels: list[tuple]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f"{name}=\"{escape_label_value(value)}\""
+                          for name, value in labels) + "}"
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    # Compteur par combinaison de valeurs des étiquettes label_names
+    TYPE = "counter"
+
+    def __init__(self, name: str, description: str, label_names: tuple = (),
+                 constant_labels: tuple = ()):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.constant_labels = constant_labels
+        self.values: dict[tuple, float] = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self.lock:
+            self.values[label_values] = \
+                self.values.get(label_values, 0) + amount
+
+    def get(self, *label_values) -> float:
+        return self.values.get(label_values, 0)
+
+    def get_labels(self, label_values: tuple) -> list[tuple]:
+        return list(self.constant_labels) \
+            + list(zip(self.label_names, label_values))
+
+    def render(self) -> list[str]:
+        with self.lock:
+            values = sorted(self.values.items())
+        return [f"{self.name}{format_labels(self.get_labels(label_values))} "
+                f"{format_value(value)}" for label_values, value in values]
+
+
+class Histogram(Counter):
+    # Répartition des valeurs observées dans des seaux cumulés (le = « less
+    # or equal »), avec leur nombre et leur somme
+    TYPE = "histogram"
+
+    def __init__(self, name: str, description: str, label_names: tuple = (),
+                 constant_labels: tuple = (),
+                 buckets: tuple = DURATION_BUCKETS):
+        super().__init__(name, description, label_names, constant_labels)
+        self.buckets = tuple(buckets)
+        # Valeurs des étiquettes -> [nombre par seau (non cumulé, le dernier
+        # pour +Inf), somme]
+        self.values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.values.get(label_values)
+            if series is None:
+                series = self.values[label_values] = \
+                    [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def get(self, *label_values) -> int:
+        series = self.values.get(label_values)
+        return sum(series[0]) if series is not None else 0
+
+    def render(self) -> list[str]:
+        with self.lock:
+            values = sorted((label_values, (list(counts), total))
+                            for label_values, (counts, total)
+                            in self.values.items())
+        lines = []
+        for label_values, (counts, total) in values:
+            labels = self.get_labels(label_values)
+            cumulated = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulated += count
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{format_labels(labels + [('le', format_value(bound))])}"
+                    f" {cumulated}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} "
+                         f"{format_value(total)}")
+            lines.append(f"{self.name}_count{format_labels(labels)} "
+                         f"{cumulated}")
+        return lines
+
+
+class MetricsRegistry:
+    # Métriques d'un processus, rendues au format texte de Prometheus.
+    # constant_labels est ajouté à toutes les séries (par exemple le numéro
+    # du processus lancé par game_router).
+    def __init__(self, constant_labels: dict = None):
+        self.constant_labels = tuple((constant_labels or {}).items())
+        self.metrics: dict[str, Counter] = {}
+        self.lock = threading.Lock()
+
+    def get_or_create(self, metric_type: type, name: str, description: str,
+                      label_names: tuple, **kwargs) -> Counter:
+        # Plusieurs composants (les shards par exemple) partagent la même
+        # métrique en la demandant sous le même nom
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = metric_type(
+                    name, description, label_names, self.constant_labels,
+                    **kwargs)
+            elif type(metric) is not metric_type:
+                raise ValueError(f"La métrique {name} est déjà un "
+                                 f"{metric.TYPE}")
+            return metric
+
+    def counter(self, name: str, description: str,
+                label_names: tuple = ()) -> Counter:
+        return self.get_or_create(Counter, name, description, label_names)
+
+    def histogram(self, name: str, description: str, label_names: tuple = (),
+                  buckets: tuple = DURATION_BUCKETS) -> Histogram:
+        return self.get_or_create(Histogram, name, description, label_names,
+                                  buckets=buckets)
+
+    def render(self) -> str:
+        with self.lock:
+            metrics = list(self.metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+class TimedProxy:
+    # Transmet les appels de méthode à target en mesurant leur durée dans
+    # histogram, étiquetée par le nom de la méthode (exceptions comprises)
+    def __init__(self, target, histogram: Histogram):
+        self.target = target
+        self.histogram = histogram
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.target, name)
+        if not callable(attribute):
+            return attribute
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                self.histogram.observe(time.perf_counter() - start, name)
+        return timed
+
+
+def merge_expositions(texts: list[str]) -> str:
+    # Réunit les métriques de plusieurs processus : le format texte
+    # n'autorise qu'un seul bloc par famille, avec un seul HELP et un seul
+    # TYPE, les séries étant distinguées par leurs étiquettes
+    headers: dict[str, list[str]] = {}
+    samples: dict[str, list[str]] = {}
+    for text in texts:
+        known = set(headers)
+        family = None
+        for line in text.splitlines():
+            if line.startswith("# HELP ") or line.startswith("# TYPE "):
+                family = line.split(" ", 3)[2]
+                samples.setdefault(family, [])
+                if family not in known:
+                    headers.setdefault(family, []).append(line)
+            elif line and family is not None:
+                samples[family].append(line)
+    return "".join("\n".join(headers[family] + samples[family]) + "\n"
+                   for family in headers)
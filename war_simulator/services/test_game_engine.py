@@ -0,0 +1,125 @@
+import threading
+import time
+from unittest import TestCase
+
+from war_simulator.services.game_engine import GameEngine
+
+
+class TestGameEngine(TestCase):
+    def setUp(self):
+        self.game_engine = GameEngine(["shard 0", "shard 1"])
+
+    def tearDown(self):
+        self.game_engine.close()
+
+    def test_commands_of_a_game_are_serialized(self):
+        # Arrange
+        running = {"count": 0, "max": 0}
+        lock = threading.Lock()
+
+        def command(shard_state):
+            with lock:
+                running["count"] += 1
+                running["max"] = max(running["max"], running["count"])
+            time.sleep(0.01)
+            with lock:
+                running["count"] -= 1
+
+        # Act
+        futures = [self.game_engine.submit(1, command) for _ in range(5)]
+        for future in futures:
+            future.result()
+
+        # Assert
+        self.assertEqual(1, running["max"])
+
+    def test_commands_keep_submission_order(self):
+        # Arrange
+        order = []
+
+        # Act
+        futures = [self.game_engine.submit(
+                       3, lambda shard_state, n: order.append(n), number)
+                   for number in range(20)]
+        for future in futures:
+            future.result()
+
+        # Assert
+        self.assertEqual(list(range(20)), order)
+
+    def test_games_of_different_shards_run_in_parallel(self):
+        # Arrange
+        game_ids = [0, 1]
+        self.assertNotEqual(self.game_engine.get_shard(game_ids[0]),
+                            self.game_engine.get_shard(game_ids[1]))
+
+        # Act
+        start = time.perf_counter()
+        futures = [self.game_engine.submit(
+                       game_id, lambda shard_state: time.sleep(0.2))
+                   for game_id in game_ids]
+        for future in futures:
+            future.result()
+        duration = time.perf_counter() - start
+
+        # Assert
+        self.assertLess(duration, 0.35)
+
+    def test_command_error_returned_by_future(self):
+        # Act
+        future = self.game_engine.submit(
+            1, lambda shard_state: int("pas un nombre"))
+
+        # Assert
+        with self.assertRaises(ValueError):
+            future.result()
+
+    def test_command_receives_shard_state(self):
+        # Act
+        shard_state = self.game_engine.submit(
+            1, lambda shard_state: shard_state).result()
+
+        # Assert
+        self.assertEqual(
+            ["shard 0", "shard 1"][self.game_engine.get_shard(1)], shard_state)
+
+    def test_scheduled_command_runs_on_every_shard(self):
+        # Arrange
+        shard_states = []
+        lock = threading.Lock()
+
+        def command(shard_state):
+            with lock:
+                shard_states.append(shard_state)
+
+        # Act
+        self.game_engine.schedule(0.01, command)
+        time.sleep(0.1)
+        self.game_engine.close()
+        with lock:
+            ran = set(shard_states)
+            count = len(shard_states)
+        time.sleep(0.05)
+
+        # Assert
+        self.assertEqual({"shard 0", "shard 1"}, ran)
+        self.assertEqual(count, len(shard_states))
+
+    def test_scheduled_command_does_not_pile_up_on_a_busy_shard(self):
+        # Arrange
+        release = threading.Event()
+        runs = []
+        game_engine = GameEngine(["shard 0"])
+        busy = game_engine.submit(0, lambda shard_state: release.wait())
+
+        # Act
+        game_engine.schedule(0.01, lambda shard_state: runs.append(1))
+        time.sleep(0.1)
+        release.set()
+        busy.result()
+        time.sleep(0.005)
+        game_engine.close()
+
+        # Assert
+        self.assertLessEqual(len(runs), 2)
+        self.assertGreaterEqual(len(runs), 1)
@@ -0,0 +1,82 @@
+from unittest import TestCase
+
+from war_simulator.model.battlefield import Battlefield
+from war_simulator.model.frigate import Frigate
+from war_simulator.services.game_profiler import GameProfiler
+
+
+def place_frigates(battlefield: Battlefield, count: int) -> int:
+    for x in range(count):
+        battlefield.add_vessel(Frigate(x, 0, 0))
+    return len(battlefield.get_vessels())
+
+
+def shoot_with_first_vessel(battlefield: Battlefield):
+    battlefield.get_vessels()[0].fire_at(0, 0, 0)
+
+
+class TestGameProfiler(TestCase):
+    def test_wrapped_command_is_profiled(self):
+        # Arrange
+        profiler = GameProfiler()
+        battlefield = Battlefield(0, 100, 0, 10, -1, 1, 1000)
+
+        # Act
+        result = profiler.wrap(place_frigates)(battlefield, 50)
+
+        # Assert
+        self.assertEqual(50, result)
+        profile, = profiler.get_profiles()
+        self.assertEqual("place_frigates", profile["operation"])
+        self.assertGreater(profile["duration"], 0)
+        total_times = [function["total_time"]
+                       for function in profile["functions"]]
+        self.assertEqual(sorted(total_times, reverse=True), total_times)
+        self.assertTrue(any("add_vessel" in function["function"]
+                            for function in profile["functions"]))
+
+    def test_only_top_functions_are_kept(self):
+        # Arrange
+        profiler = GameProfiler(top_n=3)
+        battlefield = Battlefield(0, 100, 0, 10, -1, 1, 1000)
+
+        # Act
+        profiler.wrap(place_frigates)(battlefield, 50)
+
+        # Assert
+        profile, = profiler.get_profiles()
+        self.assertEqual(3, len(profile["functions"]))
+        total_times = [function["total_time"]
+                       for function in profile["functions"]]
+        self.assertEqual(sorted(total_times, reverse=True), total_times)
+
+    def test_failed_command_is_profiled(self):
+        # Arrange
+        profiler = GameProfiler()
+        battlefield = Battlefield(0, 10, 0, 10, -1, 1)
+
+        # Act
+        with self.assertRaises(IndexError):
+            profiler.wrap(shoot_with_first_vessel)(battlefield)
+
+        # Assert
+        self.assertEqual(["shoot_with_first_vessel"],
+                         [profile["operation"]
+                          for profile in profiler.get_profiles()])
+
+    def test_only_last_profiles_are_kept(self):
+        # Arrange
+        profiler = GameProfiler(capacity=2)
+
+        # Act
+        for count in (1, 2, 3):
+            profiler.profile(f"operation {count}", place_frigates,
+                             Battlefield(0, 10, 0, 10, -1, 1), count)
+
+        # Assert
+        self.assertEqual(["operation 3", "operation 2"],
+                         [profile["operation"]
+                          for profile in profiler.get_profiles()])
+        self.assertEqual(["operation 2"],
+                         [profile["operation"] for profile
+                          in profiler.get_profiles("operation 2")])
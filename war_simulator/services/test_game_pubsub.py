@@ -0,0 +1,46 @@
+from unittest import IsolatedAsyncioTestCase
+
+from war_simulator.services.game_pubsub import GamePubSub
+
+
+class TestGamePubSub(IsolatedAsyncioTestCase):
+    async def test_publish_to_game_subscribers(self):
+        # Arrange
+        pubsub = GamePubSub()
+        queue_1 = pubsub.subscribe(1)
+        queue_2 = pubsub.subscribe(1)
+        other_queue = pubsub.subscribe(2)
+
+        # Act
+        pubsub.publish(1, {"type": "player_joined"})
+
+        # Assert
+        self.assertEqual({"type": "player_joined"}, await queue_1.get())
+        self.assertEqual({"type": "player_joined"}, await queue_2.get())
+        self.assertTrue(other_queue.empty())
+
+    async def test_slow_subscriber_loses_oldest_events(self):
+        # Arrange
+        pubsub = GamePubSub(queue_size=2)
+        queue = pubsub.subscribe(1)
+
+        # Act
+        for number in range(3):
+            pubsub.publish(1, {"number": number})
+
+        # Assert
+        self.assertEqual({"number": 1}, await queue.get())
+        self.assertEqual({"number": 2}, await queue.get())
+
+    async def test_unsubscribe(self):
+        # Arrange
+        pubsub = GamePubSub()
+        queue = pubsub.subscribe(1)
+
+        # Act
+        pubsub.unsubscribe(1, queue)
+        pubsub.publish(1, {"type": "player_joined"})
+
+        # Assert
+        self.assertTrue(queue.empty())
+        self.assertEqual(0, pubsub.get_subscriber_count(1))
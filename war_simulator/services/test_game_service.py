@@ -0,0 +1,100 @@
+from unittest import TestCase
+
+from war_simulator.dao.game_dao import GameDao
+from war_simulator.services.game_pubsub import GamePubSub
+from war_simulator.services.game_service import GameService
+
+
+class RecordingPubSub(GamePubSub):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def publish(self, game_id: int, event: dict):
+        self.events.append((game_id, event))
+
+
+class TestGameService(TestCase):
+    def setUp(self):
+        # joueur 1 tire avec un sous-marin (torpilles : z <= 0) sur la
+        # frégate de joueur 2
+        self.pubsub = RecordingPubSub()
+        self.game_service = GameService(pubsub=self.pubsub)
+        self.game_id = self.game_service.create_game("joueur 1", 0, 100, 0,
+                                                     100, -10, 10)
+        self.game_service.join_game(self.game_id, "joueur 2")
+        placement = self.game_service.add_vessels(
+            self.game_id, "joueur 1", [("Submarine", 10, 10, -1)])
+        self.vessel_id = placement["vessels"][0]["vessel_id"]
+        self.game_service.add_vessels(self.game_id, "joueur 2",
+                                      [("Frigate", 12, 12, 0),
+                                       ("Cruiser", 50, 50, 1)])
+        self.pubsub.events.clear()
+
+    def get_stored_vessels(self) -> tuple:
+        # Relus en base, sans passer par le cache du service
+        game = GameDao().find_game(self.game_id)
+        submarine = game.players[0].get_battlefield() \
+            .get_vessel_by_coordinates(10, 10, -1)
+        frigate = game.players[1].get_battlefield() \
+            .get_vessel_by_coordinates(12, 12, 0)
+        return submarine, frigate
+
+    def test_shoot_salvo(self):
+        # Act
+        results = self.game_service.shoot_salvo(
+            self.game_id, "joueur 1", self.vessel_id,
+            [(12, 12, 0), (5, 5, -1), (12, 12, 0)])
+
+        # Assert
+        self.assertEqual([True, False, True], results)
+        submarine, frigate = self.get_stored_vessels()
+        self.assertEqual(12, submarine.get_weapon().get_ammunitions())
+        self.assertEqual(type(frigate).HITS - 2, frigate.get_hits())
+        self.assertEqual([(self.game_id, {
+            "type": "shots", "shooter_name": "joueur 1",
+            "targets": [(12, 12, 0), (5, 5, -1), (12, 12, 0)],
+            "results": [True, False, True]})], self.pubsub.events)
+
+    def test_shoot_salvo_unknown_vessel(self):
+        # Act
+        results = self.game_service.shoot_salvo(
+            self.game_id, "joueur 1", -1, [(12, 12, 0)])
+
+        # Assert
+        self.assertEqual([], results)
+        submarine, frigate = self.get_stored_vessels()
+        self.assertEqual(15, submarine.get_weapon().get_ammunitions())
+        self.assertEqual(type(frigate).HITS, frigate.get_hits())
+        self.assertEqual([], self.pubsub.events)
+
+    def test_shoot_salvo_keeps_shots_fired_before_a_rejected_one(self):
+        # Act
+        with self.assertRaises(Exception) as error_context:
+            self.game_service.shoot_salvo(
+                self.game_id, "joueur 1", self.vessel_id,
+                [(12, 12, 0), (12, 12, 1), (12, 12, 0)])
+
+        # Assert
+        self.assertEqual("OutOfRangeError",
+                         type(error_context.exception).__name__)
+        submarine, frigate = self.get_stored_vessels()
+        # Le tir refusé consomme aussi une munition, le troisième n'est
+        # pas tiré
+        self.assertEqual(13, submarine.get_weapon().get_ammunitions())
+        self.assertEqual(type(frigate).HITS - 1, frigate.get_hits())
+        self.assertEqual([(self.game_id, {
+            "type": "shots", "shooter_name": "joueur 1",
+            "targets": [(12, 12, 0)], "results": [True]})],
+            self.pubsub.events)
+
+    def test_rejected_shot_publishes_no_shots(self):
+        # Act
+        with self.assertRaises(Exception):
+            self.game_service.shoot_at(self.game_id, "joueur 1",
+                                       self.vessel_id, 12, 12, 1)
+
+        # Assert
+        submarine, _ = self.get_stored_vessels()
+        self.assertEqual(14, submarine.get_weapon().get_ammunitions())
+        self.assertEqual([], self.pubsub.events)
@@ -0,0 +1,119 @@
+from unittest import TestCase
+
+from war_simulator.model.exceptions import GameNotFoundError
+from war_simulator.services.metrics import MetricsRegistry, TimedProxy, \
+    merge_expositions
+
+
+class FakeDao:
+    def find_game(self, game_id: int):
+        if game_id < 0:
+            raise GameNotFoundError(game_id)
+        return game_id
+
+
+class TestMetrics(TestCase):
+    def test_counter_is_rendered_by_labels(self):
+        # Arrange
+        metrics = MetricsRegistry()
+        errors = metrics.counter("errors_total", "Erreurs",
+                                 ("route", "exception"))
+
+        # Act
+        errors.inc("/shoot-at", "OutOfRangeError")
+        errors.inc("/shoot-at", "OutOfRangeError")
+        errors.inc("/join-game", "GameFullError")
+
+        # Assert
+        self.assertEqual(
+            "# HELP errors_total Erreurs\n"
+            "# TYPE errors_total counter\n"
+            "errors_total{route=\"/join-game\",exception=\"GameFullError\"} 1\n"
+            "errors_total{route=\"/shoot-at\",exception=\"OutOfRangeError\"} 2\n",
+            metrics.render())
+
+    def test_histogram_buckets_are_cumulative(self):
+        # Arrange
+        metrics = MetricsRegistry({"worker": 1})
+        durations = metrics.histogram("duration_seconds", "Durées",
+                                      ("route",), buckets=(0.1, 1.0))
+
+        # Act
+        for value in (0.05, 0.1, 0.5, 2.0):
+            durations.observe(value, "/shoot-at")
+
+        # Assert
+        lines = metrics.render().splitlines()
+        self.assertEqual([
+            "duration_seconds_bucket{worker=\"1\",route=\"/shoot-at\","
+            "le=\"0.1\"} 2",
+            "duration_seconds_bucket{worker=\"1\",route=\"/shoot-at\","
+            "le=\"1.0\"} 3",
+            "duration_seconds_bucket{worker=\"1\",route=\"/shoot-at\","
+            "le=\"+Inf\"} 4",
+            "duration_seconds_sum{worker=\"1\",route=\"/shoot-at\"} 2.65",
+            "duration_seconds_count{worker=\"1\",route=\"/shoot-at\"} 4"],
+            lines[2:])
+
+    def test_label_values_are_escaped(self):
+        # Arrange
+        metrics = MetricsRegistry()
+        counter = metrics.counter("requests_total", "Requêtes", ("route",))
+
+        # Act
+        counter.inc("a\"b\\c\nd")
+
+        # Assert
+        self.assertIn("requests_total{route=\"a\\\"b\\\\c\\nd\"} 1",
+                      metrics.render())
+
+    def test_registry_shares_metrics_by_name(self):
+        # Arrange
+        metrics = MetricsRegistry()
+
+        # Act
+        counter_1 = metrics.counter("requests_total", "Requêtes")
+        counter_2 = metrics.counter("requests_total", "Requêtes")
+
+        # Assert
+        self.assertIs(counter_1, counter_2)
+        with self.assertRaises(ValueError):
+            metrics.histogram("requests_total", "Requêtes")
+
+    def test_timed_proxy_times_calls_and_errors(self):
+        # Arrange
+        durations = MetricsRegistry().histogram("dao_seconds", "DAO",
+                                                ("operation",))
+        dao = TimedProxy(FakeDao(), durations)
+
+        # Act
+        result = dao.find_game(3)
+        with self.assertRaises(GameNotFoundError):
+            dao.find_game(-1)
+
+        # Assert
+        self.assertEqual(3, result)
+        self.assertEqual(2, durations.get("find_game"))
+
+    def test_merge_expositions_keeps_one_header_per_family(self):
+        # Arrange
+        texts = []
+        for worker in (0, 1):
+            metrics = MetricsRegistry({"worker": worker})
+            metrics.counter("requests_total", "Requêtes").inc()
+            metrics.counter("errors_total", "Erreurs").inc(amount=worker)
+            texts.append(metrics.render())
+
+        # Act
+        merged = merge_expositions(texts)
+
+        # Assert
+        self.assertEqual(
+            "# HELP requests_total Requêtes\n"
+            "# TYPE requests_total counter\n"
+            "requests_total{worker=\"0\"} 1\n"
+            "requests_total{worker=\"1\"} 1\n"
+            "# HELP errors_total Erreurs\n"
+            "# TYPE errors_total counter\n"
+            "errors_total{worker=\"0\"} 0\n"
+            "errors_total{worker=\"1\"} 1\n", merged)
@@ -0,0 +1,232 @@
+import argparse
+import json
+import random
+import time
+from typing import Optional
+
+from war_simulator.model.battlefield import Battlefield
+from war_simulator.model.cruiser import Cruiser
+from war_simulator.model.destroyer import Destroyer
+from war_simulator.model.frigate import Frigate
+from war_simulator.model.submarine import Submarine
+from war_simulator.model.vessel import Vessel
+from war_simulator.simulation.targeting import DensityTargeting, \
+    find_shooter, get_placement_depths
+
+# Simulation de parties complètes sans base de données ni serveur : les
+# stratégies des deux joueurs tirent tour à tour avec Vessel.fire_at sur
+# Battlefield.fired_at, comme GameService, jusqu'à ce qu'une flotte soit
+# détruite ou que plus personne ne puisse tirer.
+#   python -m war_simulator.simulation.battle_simulator --games 10000 --seed 1
+
+# min_x, max_x, min_y, max_y, min_z, max_z (bornes max exclues)
+DEFAULT_BOUNDS = (0, 5, 0, 5, -1, 1)
+DEFAULT_FLEET = (Cruiser, Frigate, Destroyer, Submarine, Submarine)
+MAX_TURNS = 10000
+
+
+def get_cells(battlefield: Battlefield) -> list[tuple]:
+    return [(x, y, z)
+            for x in range(battlefield.min_x, battlefield.max_x)
+            for y in range(battlefield.min_y, battlefield.max_y)
+            for z in range(battlefield.min_z, battlefield.max_z)]
+
+
+def place_fleet(battlefield: Battlefield, fleet: tuple, rng: random.Random):
+    for vessel_type in fleet:
+        depths = get_placement_depths(vessel_type, battlefield.min_z,
+                                      battlefield.max_z)
+        while True:
+            x = rng.randrange(battlefield.min_x, battlefield.max_x)
+            y = rng.randrange(battlefield.min_y, battlefield.max_y)
+            z = rng.choice(depths)
+            if battlefield.get_vessel_by_coordinates(x, y, z) is None:
+                battlefield.add_vessel(vessel_type(x, y, z))
+                break
+
+
+class Strategy:
+    # Stratégie de tir d'un joueur : elle connaît sa propre flotte et la
+    # composition de la flotte adverse, pas sa position, et n'apprend que le
+    # résultat de ses tirs. Les deux champs de bataille ont les mêmes bornes.
+    def __init__(self, battlefield: Battlefield, rng: random.Random,
+                 opponent_fleet: tuple):
+        self.battlefield = battlefield
+        self.rng = rng
+        self.opponent_fleet = opponent_fleet
+
+    def choose_shot(self) -> Optional[tuple[Vessel, tuple]]:
+        # Le vaisseau qui tire et la cible, ou None si plus aucun tir n'est
+        # possible
+        raise NotImplementedError()
+
+    def observe(self, target: tuple, hit: bool, sunk: bool):
+        pass
+
+
+class RandomStrategy(Strategy):
+    # Tire sur des cellules au hasard, chacune une seule fois, sauf une
+    # cellule touchée : il faut plusieurs tirs pour couler un vaisseau
+    def __init__(self, battlefield: Battlefield, rng: random.Random,
+                 opponent_fleet: tuple):
+        super().__init__(battlefield, rng, opponent_fleet)
+        self.targets = self.get_targets()
+        self.current_target = None
+
+    def get_targets(self) -> list[tuple]:
+        # Les cellules sont prises en partant de la fin de la liste
+        targets = get_cells(self.battlefield)
+        self.rng.shuffle(targets)
+        return targets
+
+    def choose_shot(self) -> Optional[tuple[Vessel, tuple]]:
+        if self.current_target is not None:
+            shooter = find_shooter(self.battlefield, *self.current_target)
+            if shooter is not None:
+                return shooter, self.current_target
+            self.current_target = None
+        # Les vaisseaux ne bougent pas et ne regagnent ni munitions ni points
+        # de vie : une cible hors d'atteinte le reste
+        while self.targets:
+            target = self.targets.pop()
+            shooter = find_shooter(self.battlefield, *target)
+            if shooter is not None:
+                return shooter, target
+        return None
+
+    def observe(self, target: tuple, hit: bool, sunk: bool):
+        self.current_target = target if hit and not sunk else None
+
+
+class SweepStrategy(RandomStrategy):
+    # Parcourt les cellules dans l'ordre, en commençant par la surface
+    def get_targets(self) -> list[tuple]:
+        return sorted(get_cells(self.battlefield),
+                      key=lambda cell: (abs(cell[2]), cell[0], cell[1]),
+                      reverse=True)
+
+
+class DensityStrategy(Strategy):
+    def __init__(self, battlefield: Battlefield, rng: random.Random,
+                 opponent_fleet: tuple):
+        super().__init__(battlefield, rng, opponent_fleet)
+        self.targeting = DensityTargeting(battlefield, opponent_fleet, rng)
+
+    def choose_shot(self) -> Optional[tuple[Vessel, tuple]]:
+        return self.targeting.choose_shot()
+
+    def observe(self, target: tuple, hit: bool, sunk: bool):
+        self.targeting.record_shot(target, hit, sunk)
+
+
+STRATEGIES = {"random": RandomStrategy, "sweep": SweepStrategy,
+              "density": DensityStrategy}
+
+
+def play_game(strategy_types: tuple, seed: int, bounds: tuple = DEFAULT_BOUNDS,
+              fleets: tuple = (DEFAULT_FLEET, DEFAULT_FLEET),
+              first_player: int = 0) -> dict:
+    rng = random.Random(seed)
+    battlefields = [Battlefield(*bounds), Battlefield(*bounds)]
+    for battlefield, fleet in zip(battlefields, fleets):
+        place_fleet(battlefield, fleet, rng)
+    strategies = [strategy_type(battlefield, rng, fleets[1 - player])
+                  for player, (strategy_type, battlefield)
+                  in enumerate(zip(strategy_types, battlefields))]
+    shots = [0, 0]
+    hits = [0, 0]
+    winner = None
+    player = first_player
+    passes = 0
+    turn = 0
+    while turn < MAX_TURNS and passes < 2:
+        turn += 1
+        shot = strategies[player].choose_shot()
+        if shot is None:
+            passes += 1
+        else:
+            passes = 0
+            shooter, (x, y, z) = shot
+            opponent_battlefield = battlefields[1 - player]
+            destroyed_count = opponent_battlefield.get_destroyed_vessels_count()
+            shooter.fire_at(x, y, z)
+            hit = opponent_battlefield.fired_at(x, y, z)
+            sunk = opponent_battlefield.get_destroyed_vessels_count() \
+                != destroyed_count
+            strategies[player].observe((x, y, z), hit, sunk)
+            shots[player] += 1
+            hits[player] += hit
+            if opponent_battlefield.all_vessels_destroyed():
+                winner = player
+                break
+        player = 1 - player
+    return {"winner": winner, "turns": turn, "shots": shots, "hits": hits,
+            "remaining_power": [battlefield.get_power()
+                                for battlefield in battlefields]}
+
+
+def get_game_seeds(count: int, seed: int) -> list[int]:
+    # Une graine par partie, tirée de la graine de la simulation : chaque
+    # partie peut être rejouée seule
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(count)]
+
+
+def aggregate_results(results: list[dict]) -> dict:
+    game_count = len(results)
+    wins = [0, 0]
+    shots = [0, 0]
+    hits = [0, 0]
+    winner_power = 0
+    for result in results:
+        if result["winner"] is not None:
+            wins[result["winner"]] += 1
+            winner_power += result["remaining_power"][result["winner"]]
+        for player in (0, 1):
+            shots[player] += result["shots"][player]
+            hits[player] += result["hits"][player]
+    win_count = wins[0] + wins[1]
+    return {
+        "games": game_count,
+        "wins": wins,
+        "draws": game_count - win_count,
+        "mean_turns": sum(result["turns"] for result in results)
+        / max(game_count, 1),
+        "mean_shots": [player_shots / max(game_count, 1)
+                       for player_shots in shots],
+        "hit_rate": [player_hits / max(player_shots, 1)
+                     for player_hits, player_shots in zip(hits, shots)],
+        "mean_winner_remaining_power": winner_power / max(win_count, 1)}
+
+
+def simulate_games(strategy_types: tuple, game_count: int, seed: int = 0,
+                   bounds: tuple = DEFAULT_BOUNDS,
+                   fleets: tuple = (DEFAULT_FLEET, DEFAULT_FLEET)) -> dict:
+    # Le premier joueur alterne d'une partie à l'autre pour ne pas avantager
+    # une stratégie
+    start = time.perf_counter()
+    results = [play_game(strategy_types, game_seed, bounds, fleets,
+                         first_player=index % 2)
+               for index, game_seed
+               in enumerate(get_game_seeds(game_count, seed))]
+    stats = aggregate_results(results)
+    stats["games_per_second"] = game_count / (time.perf_counter() - start)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Simule des parties entre deux stratégies")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--strategies", nargs=2, default=["random", "random"],
+                        choices=sorted(STRATEGIES))
+    arguments = parser.parse_args()
+    strategy_types = tuple(STRATEGIES[name] for name in arguments.strategies)
+    stats = simulate_games(strategy_types, arguments.games, arguments.seed)
+    print(json.dumps(dict(stats, strategies=arguments.strategies,
+                          seed=arguments.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import random
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from war_simulator.model.battlefield import Battlefield
+from war_simulator.model.submarine import Submarine
+from war_simulator.model.vessel import Vessel
+
+# Poids minimal d'une couche sans vaisseau attendu : ses cellules restent
+# des cibles, en dernier, si la flotte adverse n'est pas placée comme prévu
+LAYER_PRIOR = 1e-3
+
+
+def find_shooter(battlefield: Battlefield, x, y, z) -> Optional[Vessel]:
+    # Premier vaisseau capable de tirer sur la cible sans lever d'exception.
+    # Appelée à chaque tir : les attributs sont lus directement et la portée,
+    # la seule vérification coûteuse, est testée en dernier.
+    for vessel in battlefield.vessels:
+        weapon = vessel.weapon
+        if vessel.hits_to_be_destroyed > 0 and weapon.can_reach(z) \
+                and weapon.ammunitions > 0 \
+                and vessel.calculate_distance_to(x, y, z) <= weapon.range:
+            return vessel
+    return None
+
+
+def get_placement_depths(vessel_type: type, min_z: int, max_z: int) -> list:
+    # Seuls les sous-marins plongent, les autres vaisseaux restent en surface
+    if vessel_type is Submarine:
+        return [z for z in range(min_z, max_z) if z <= 0]
+    return [z for z in (0,) if min_z <= z < max_z]
+
+
+class DensityTargeting:
+    # Choix des tirs d'un joueur géré par l'ordinateur. Une grille donne,
+    # pour chaque cellule du volume min_*/max_*, la probabilité qu'elle
+    # contienne un vaisseau adverse : les vaisseaux restants sont répartis
+    # sur les profondeurs où ils peuvent être placés, puis sur les cellules
+    # de chaque profondeur qui n'ont pas encore été visées. Une cellule
+    # touchée est visée jusqu'à ce que le vaisseau coule. Seules les cellules
+    # qu'un vaisseau du joueur peut atteindre (portée, profondeur de l'arme,
+    # munitions) sont proposées.
+    # Tout est tenu à jour de façon incrémentale pour qu'un choix ne
+    # parcoure qu'une profondeur de la grille : un tir ne change qu'une
+    # cellule, et un vaisseau qui ne peut plus tirer ne change que la boîte
+    # à portée de son arme. Les grilles sont indexées par (z, x, y) pour que
+    # chaque profondeur soit contiguë en mémoire.
+    def __init__(self, battlefield: Battlefield, opponent_fleet: tuple,
+                 rng: random.Random = None):
+        if np is None:
+            raise ImportError("NumPy est nécessaire pour utiliser "
+                              "DensityTargeting")
+        rng = rng if rng is not None else random.Random()
+        self.battlefield = battlefield
+        self.origin = (battlefield.min_z, battlefield.min_x, battlefield.min_y)
+        self.zs = np.arange(battlefield.min_z, battlefield.max_z)
+        self.xs = np.arange(battlefield.min_x, battlefield.max_x)
+        self.ys = np.arange(battlefield.min_y, battlefield.max_y)
+        shape = (len(self.zs), len(self.xs), len(self.ys))
+        self.unknown = np.ones(shape, dtype=bool)
+        self.unknown_counts = np.full(len(self.zs), shape[1] * shape[2])
+        # Nombre de vaisseaux du joueur pouvant atteindre chaque cellule, et
+        # cellules à la fois inconnues et atteignables, par profondeur
+        self.shooter_counts = np.zeros(shape, dtype=np.int16)
+        self.candidates = np.zeros(shape, dtype=bool)
+        self.candidate_counts = np.zeros(len(self.zs), dtype=np.int64)
+        self.shooter_reaches: dict[Vessel, tuple] = {}
+        # Départage des cellules de même probabilité, fixé par rng
+        self.tie_breaks = np.random.default_rng(
+            rng.getrandbits(64)).random(shape)
+        self.remaining_fleet = list(opponent_fleet)
+        self.expected_counts = self.get_expected_counts()
+        # Nombre de tirs réussis sur chaque cellule touchée pas encore coulée
+        self.hits_by_cell: dict[tuple, int] = {}
+        self.update_shooters()
+
+    def get_expected_counts(self):
+        counts = np.full(len(self.zs), LAYER_PRIOR)
+        min_z, max_z = self.battlefield.min_z, self.battlefield.max_z
+        for vessel_type in self.remaining_fleet:
+            depths = get_placement_depths(vessel_type, min_z, max_z)
+            for z in depths:
+                counts[z - min_z] += 1 / len(depths)
+        return counts
+
+    def get_layer_weights(self):
+        return self.expected_counts / np.maximum(self.unknown_counts, 1)
+
+    def get_density(self):
+        # Probabilité par cellule, indexée par (z, x, y), 1 pour une cellule
+        # touchée non coulée
+        density = self.unknown * self.get_layer_weights()[:, None, None]
+        for x, y, z in self.hits_by_cell:
+            density[self.get_index(x, y, z)] = 1
+        return density
+
+    def get_index(self, x, y, z) -> tuple:
+        return z - self.origin[0], x - self.origin[1], y - self.origin[2]
+
+    def get_vessel_reach(self, vessel: Vessel) -> tuple:
+        # Boîte de la grille à portée de l'arme, et cellules de cette boîte
+        # que l'arme atteint
+        x, y, z = vessel.get_coordinates()
+        weapon = vessel.get_weapon()
+        weapon_range = weapon.get_range()
+        box = tuple(slice(max(int(np.floor(center - weapon_range)) - low, 0),
+                          max(int(np.ceil(center + weapon_range)) - low + 1,
+                              0))
+                    for center, low in zip((z, x, y), self.origin))
+        zs, xs, ys = self.zs[box[0]], self.xs[box[1]], self.ys[box[2]]
+        depths = np.array([weapon.can_reach(int(cell_z)) for cell_z in zs],
+                          dtype=bool)
+        distances = (zs - z)[:, None, None] ** 2 \
+            + (xs - x)[None, :, None] ** 2 \
+            + (ys - y)[None, None, :] ** 2
+        return box, (distances <= weapon_range ** 2) & depths[:, None, None]
+
+    def change_shooter(self, box: tuple, reach, added: bool):
+        candidates = self.candidates[box]
+        shooter_counts = self.shooter_counts[box]
+        before = np.count_nonzero(candidates, axis=(1, 2))
+        if added:
+            shooter_counts += reach
+        else:
+            shooter_counts -= reach
+        np.logical_and(self.unknown[box], shooter_counts, out=candidates)
+        self.candidate_counts[box[0]] += \
+            np.count_nonzero(candidates, axis=(1, 2)) - before
+
+    def update_shooters(self):
+        # Les vaisseaux coulés, sans munitions ou déplacés depuis le dernier
+        # appel sont retirés des cellules atteignables, puis les nouvelles
+        # positions ajoutées
+        shooters = {vessel: vessel.get_coordinates()
+                    for vessel in self.battlefield.get_vessels()
+                    if vessel.get_hits() > 0
+                    and vessel.get_weapon().get_ammunitions() > 0}
+        for vessel, (coordinates, box, reach) \
+                in list(self.shooter_reaches.items()):
+            if shooters.get(vessel) != coordinates:
+                self.change_shooter(box, reach, added=False)
+                del self.shooter_reaches[vessel]
+        for vessel, coordinates in shooters.items():
+            if vessel not in self.shooter_reaches:
+                box, reach = self.get_vessel_reach(vessel)
+                self.change_shooter(box, reach, added=True)
+                self.shooter_reaches[vessel] = (coordinates, box, reach)
+
+    def choose_shot(self) -> Optional[tuple[Vessel, tuple]]:
+        for cell in self.hits_by_cell:
+            shooter = find_shooter(self.battlefield, *cell)
+            if shooter is not None:
+                return shooter, cell
+        self.update_shooters()
+        while self.candidate_counts.any():
+            layer = int(np.argmax(np.where(self.candidate_counts > 0,
+                                           self.get_layer_weights(), -1)))
+            layer_candidates = self.candidates[layer]
+            index = int(np.argmax(np.where(layer_candidates,
+                                           self.tie_breaks[layer], -1)))
+            x_index, y_index = divmod(index, layer_candidates.shape[1])
+            cell = (int(self.xs[x_index]), int(self.ys[y_index]),
+                    int(self.zs[layer]))
+            shooter = find_shooter(self.battlefield, *cell)
+            if shooter is not None:
+                return shooter, cell
+            # Cellule en limite de portée, à l'arrondi près
+            layer_candidates[x_index, y_index] = False
+            self.candidate_counts[layer] -= 1
+        return None
+
+    def record_shot(self, cell: tuple, hit: bool, sunk: bool):
+        index = self.get_index(*cell)
+        if self.unknown[index]:
+            self.unknown[index] = False
+            self.unknown_counts[index[0]] -= 1
+        if self.candidates[index]:
+            self.candidates[index] = False
+            self.candidate_counts[index[0]] -= 1
+        if not hit:
+            # Le vaisseau touché a pu se déplacer
+            self.hits_by_cell.pop(cell, None)
+            return
+        hits = self.hits_by_cell.get(cell, 0) + 1
+        if not sunk:
+            self.hits_by_cell[cell] = hits
+            return
+        self.hits_by_cell.pop(cell, None)
+        self.remove_sunk_vessel(cell[2], hits)
+
+    def remove_sunk_vessel(self, z: int, hits: int):
+        # Le nombre de tirs nécessaires donne le type du vaisseau coulé ;
+        # sinon, le type le plus contraint pouvant se trouver à cette
+        # profondeur est retiré
+        min_z, max_z = self.battlefield.min_z, self.battlefield.max_z
+        candidates = [vessel_type for vessel_type in self.remaining_fleet
+                      if z in get_placement_depths(vessel_type, min_z, max_z)]
+        if not candidates:
+            return
+        exact = [vessel_type for vessel_type in candidates
+                 if vessel_type.HITS == hits]
+        sunk_type = exact[0] if exact else min(
+            candidates, key=lambda vessel_type: len(
+                get_placement_depths(vessel_type, min_z, max_z)))
+        self.remaining_fleet.remove(sunk_type)
+        self.expected_counts = self.get_expected_counts()
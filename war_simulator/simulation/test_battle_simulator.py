@@ -0,0 +1,61 @@
+import random
+from unittest import TestCase
+
+from war_simulator.model.battlefield import Battlefield
+from war_simulator.model.submarine import Submarine
+from war_simulator.simulation.battle_simulator import DEFAULT_FLEET, \
+    DensityStrategy, RandomStrategy, SweepStrategy, place_fleet, play_game, \
+    simulate_games
+
+
+class TestBattleSimulator(TestCase):
+    def test_place_fleet_keeps_surface_vessels_at_surface(self):
+        # Arrange
+        battlefield = Battlefield(0, 5, 0, 5, -1, 1)
+
+        # Act
+        place_fleet(battlefield, DEFAULT_FLEET, random.Random(0))
+
+        # Assert
+        self.assertEqual(len(DEFAULT_FLEET), len(battlefield.get_vessels()))
+        for vessel in battlefield.get_vessels():
+            z = vessel.get_coordinates()[2]
+            if isinstance(vessel, Submarine):
+                self.assertLessEqual(z, 0)
+            else:
+                self.assertEqual(0, z)
+
+    def test_play_game_is_reproducible(self):
+        # Act
+        result_1 = play_game((RandomStrategy, SweepStrategy), seed=42)
+        result_2 = play_game((RandomStrategy, SweepStrategy), seed=42)
+
+        # Assert
+        self.assertEqual(result_1, result_2)
+
+    def test_play_game_ends_when_a_fleet_is_destroyed(self):
+        # Act
+        results = [play_game((RandomStrategy, RandomStrategy), seed)
+                   for seed in range(50)]
+
+        # Assert
+        for result in results:
+            if result["winner"] is not None:
+                loser = 1 - result["winner"]
+                self.assertEqual(0, result["remaining_power"][loser])
+
+    def test_simulate_games_counts_every_game(self):
+        # Act
+        stats = simulate_games((RandomStrategy, RandomStrategy), 100, seed=1)
+
+        # Assert
+        self.assertEqual(100, stats["games"])
+        self.assertEqual(100, sum(stats["wins"]) + stats["draws"])
+        self.assertGreater(sum(stats["wins"]), 0)
+
+    def test_density_strategy_beats_random_strategy(self):
+        # Act
+        stats = simulate_games((DensityStrategy, RandomStrategy), 100, seed=1)
+
+        # Assert
+        self.assertGreater(stats["wins"][0], 2 * stats["wins"][1])
@@ -0,0 +1,116 @@
+import random
+from unittest import TestCase
+
+from war_simulator.model.battlefield import Battlefield
+from war_simulator.model.cruiser import Cruiser
+from war_simulator.model.frigate import Frigate
+from war_simulator.model.submarine import Submarine
+from war_simulator.simulation.targeting import DensityTargeting, find_shooter
+
+
+class TestTargeting(TestCase):
+    def test_find_shooter_respects_weapon_depth(self):
+        # Arrange
+        battlefield = Battlefield(0, 10, 0, 10, -1, 2)
+        cruiser = Cruiser(0, 0, 0)
+        battlefield.add_vessel(cruiser)
+
+        # Act
+        surface_shooter = find_shooter(battlefield, 5, 5, 0)
+        air_shooter = find_shooter(battlefield, 5, 5, 1)
+
+        # Assert
+        self.assertIsNone(surface_shooter)
+        self.assertIs(cruiser, air_shooter)
+
+    def test_find_shooter_skips_vessels_without_ammunitions(self):
+        # Arrange
+        battlefield = Battlefield(0, 10, 0, 10, -1, 2)
+        submarine = Submarine(0, 0, -1)
+        submarine.get_weapon().ammunitions = 0
+        battlefield.add_vessel(submarine)
+
+        # Act
+        shooter = find_shooter(battlefield, 5, 5, -1)
+
+        # Assert
+        self.assertIsNone(shooter)
+
+    def test_choose_shot_only_targets_reachable_depths(self):
+        # Arrange
+        battlefield = Battlefield(0, 4, 0, 4, -1, 2)
+        frigate = Frigate(0, 0, 0)
+        battlefield.add_vessel(frigate)
+        targeting = DensityTargeting(battlefield, (Submarine,),
+                                     random.Random(0))
+
+        # Act
+        targets = []
+        while (shot := targeting.choose_shot()) is not None:
+            shooter, target = shot
+            targets.append(target)
+            targeting.record_shot(target, hit=False, sunk=False)
+
+        # Assert
+        self.assertEqual(16, len(targets))
+        self.assertEqual(16, len(set(targets)))
+        self.assertTrue(all(z == 0 for _, _, z in targets))
+
+    def test_choose_shot_prefers_the_most_likely_depth(self):
+        # Arrange
+        battlefield = Battlefield(0, 4, 0, 4, -1, 1)
+        battlefield.add_vessel(Submarine(0, 0, -1))
+        targeting = DensityTargeting(battlefield,
+                                     (Frigate, Frigate, Submarine),
+                                     random.Random(0))
+
+        # Act
+        _, target = targeting.choose_shot()
+
+        # Assert
+        self.assertEqual(0, target[2])
+
+    def test_choose_shot_fires_again_at_a_hit_cell(self):
+        # Arrange
+        battlefield = Battlefield(0, 4, 0, 4, -1, 1)
+        battlefield.add_vessel(Submarine(0, 0, -1))
+        targeting = DensityTargeting(battlefield, (Frigate,),
+                                     random.Random(0))
+        _, first_target = targeting.choose_shot()
+
+        # Act
+        targeting.record_shot(first_target, hit=True, sunk=False)
+        _, second_target = targeting.choose_shot()
+
+        # Assert
+        self.assertEqual(first_target, second_target)
+
+    def test_record_shot_updates_density(self):
+        # Arrange
+        battlefield = Battlefield(0, 2, 0, 2, 0, 1)
+        battlefield.add_vessel(Frigate(0, 0, 0))
+        targeting = DensityTargeting(battlefield, (Frigate,),
+                                     random.Random(0))
+        initial_density = targeting.get_density()[0, 1, 1]
+
+        # Act
+        targeting.record_shot((0, 0, 0), hit=False, sunk=False)
+
+        # Assert
+        density = targeting.get_density()
+        self.assertEqual(0, density[0, 0, 0])
+        self.assertAlmostEqual(initial_density * 4 / 3, density[0, 1, 1])
+
+    def test_record_shot_identifies_sunk_vessel_by_its_hits(self):
+        # Arrange
+        battlefield = Battlefield(0, 4, 0, 4, -1, 1)
+        battlefield.add_vessel(Submarine(0, 0, -1))
+        targeting = DensityTargeting(battlefield, (Frigate, Submarine),
+                                     random.Random(0))
+
+        # Act
+        targeting.record_shot((1, 1, 0), hit=True, sunk=False)
+        targeting.record_shot((1, 1, 0), hit=True, sunk=True)
+
+        # Assert
+        self.assertEqual([Frigate], targeting.remaining_fleet)
@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from war_simulator.simulation.tournament import add_batch, get_batches, \
+    run_tournament
+
+
+class TestTournament(TestCase):
+    def test_get_batches_covers_every_matchup(self):
+        # Act
+        batches = get_batches(["balanced", "surface"], 25, seed=1,
+                              batch_size=10)
+
+        # Assert
+        matchups = [matchup for matchup, _, _ in batches]
+        self.assertEqual([("balanced", "balanced")] * 3
+                         + [("balanced", "surface")] * 3
+                         + [("surface", "surface")] * 3, matchups)
+        self.assertEqual([0, 10, 20], [start for _, _, start in batches[:3]])
+        self.assertEqual(25, sum(len(seeds) for _, seeds, _ in batches[:3]))
+
+    def test_add_batch_counts_both_sides(self):
+        # Arrange
+        fleet_stats = {}
+
+        # Act
+        add_batch(fleet_stats, {"fleets": ("balanced", "cruisers"),
+                                "games": 10, "wins": [7, 1],
+                                "winning_shots": [350, 60]})
+
+        # Assert
+        self.assertEqual({"games": 10, "wins": 7, "losses": 1, "draws": 2,
+                          "winning_shots": 350}, fleet_stats["balanced"])
+        self.assertEqual({"games": 10, "wins": 1, "losses": 7, "draws": 2,
+                          "winning_shots": 60}, fleet_stats["cruisers"])
+
+    def test_run_tournament_does_not_depend_on_workers(self):
+        # Act
+        stats_1 = run_tournament(["balanced", "surface"], 40, seed=7,
+                                 max_workers=1, batch_size=40)
+        stats_2 = run_tournament(["balanced", "surface"], 40, seed=7,
+                                 max_workers=2, batch_size=15)
+
+        # Assert
+        self.assertEqual(stats_1["fleets"], stats_2["fleets"])
+        self.assertEqual(stats_1["matchups"], stats_2["matchups"])
+        self.assertEqual(120, stats_1["games"])
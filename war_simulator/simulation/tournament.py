@@ -0,0 +1,144 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from war_simulator.model.cruiser import Cruiser
+from war_simulator.model.destroyer import Destroyer
+from war_simulator.model.frigate import Frigate
+from war_simulator.model.submarine import Submarine
+from war_simulator.simulation.battle_simulator import DEFAULT_BOUNDS, \
+    STRATEGIES, play_game
+
+# Tournoi entre compositions de flotte : chaque paire de flottes (y compris
+# une flotte contre elle-même) joue games_per_matchup parties, découpées en
+# lots joués par un ProcessPoolExecutor. Chaque lot reçoit ses graines,
+# tirées de la graine du tournoi : les résultats ne dépendent ni du nombre
+# de processus ni de l'ordre dans lequel les lots se terminent.
+#   python -m war_simulator.simulation.tournament --games 10000 --seed 1
+
+# Puissance maximale d'un champ de bataille : 22
+FLEETS = {
+    "balanced": (Cruiser, Frigate, Destroyer, Submarine, Submarine),
+    "surface": (Frigate, Frigate, Destroyer, Destroyer),
+    "submarines": (Submarine,) * 11,
+    "cruisers": (Cruiser, Cruiser, Cruiser),
+}
+BATCH_SIZE = 500
+
+
+def play_batch(fleet_names: tuple, strategy_types: tuple, seeds: list[int],
+               first_game_index: int, bounds: tuple) -> dict:
+    # Exécutée dans un processus du pool : seul le résumé du lot est renvoyé
+    fleets = tuple(FLEETS[name] for name in fleet_names)
+    wins = [0, 0]
+    winning_shots = [0, 0]
+    for index, seed in enumerate(seeds, first_game_index):
+        result = play_game(strategy_types, seed, bounds, fleets,
+                           first_player=index % 2)
+        winner = result["winner"]
+        if winner is not None:
+            wins[winner] += 1
+            winning_shots[winner] += result["shots"][winner]
+    return {"fleets": fleet_names, "games": len(seeds), "wins": wins,
+            "winning_shots": winning_shots}
+
+
+def get_batches(fleet_names: list[str], games_per_matchup: int, seed: int,
+                batch_size: int) -> list[tuple]:
+    # (paire de flottes, graines, index de la première partie) pour chaque
+    # lot, dans un ordre fixe
+    rng = random.Random(seed)
+    batches = []
+    for matchup in itertools.combinations_with_replacement(fleet_names, 2):
+        seeds = [rng.getrandbits(64) for _ in range(games_per_matchup)]
+        for start in range(0, games_per_matchup, batch_size):
+            batches.append((matchup, seeds[start:start + batch_size], start))
+    return batches
+
+
+def new_fleet_stats() -> dict:
+    return {"games": 0, "wins": 0, "losses": 0, "draws": 0,
+            "winning_shots": 0}
+
+
+def add_batch(fleet_stats: dict, batch: dict):
+    for side in (0, 1):
+        stats = fleet_stats.setdefault(batch["fleets"][side],
+                                       new_fleet_stats())
+        stats["games"] += batch["games"]
+        stats["wins"] += batch["wins"][side]
+        stats["losses"] += batch["wins"][1 - side]
+        stats["draws"] += batch["games"] - sum(batch["wins"])
+        stats["winning_shots"] += batch["winning_shots"][side]
+
+
+def get_fleet_summary(fleet_stats: dict) -> dict:
+    return {name: {"games": stats["games"],
+                   "win_rate": stats["wins"] / max(stats["games"], 1),
+                   "loss_rate": stats["losses"] / max(stats["games"], 1),
+                   "draw_rate": stats["draws"] / max(stats["games"], 1),
+                   "mean_shots_to_win":
+                       stats["winning_shots"] / max(stats["wins"], 1)}
+            for name, stats in sorted(fleet_stats.items())}
+
+
+def run_tournament(fleet_names: list[str], games_per_matchup: int,
+                   seed: int = 0, strategy_types: tuple = (STRATEGIES["random"],
+                                                           STRATEGIES["random"]),
+                   bounds: tuple = DEFAULT_BOUNDS, max_workers: int = None,
+                   batch_size: int = BATCH_SIZE, on_batch=None) -> dict:
+    # on_batch, si fourni, est appelée avec le résumé de chaque lot dès
+    # qu'il est terminé
+    start = time.perf_counter()
+    fleet_stats = {}
+    matchups = {}
+    batches = get_batches(fleet_names, games_per_matchup, seed, batch_size)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(play_batch, matchup, strategy_types, seeds,
+                                   first_game_index, bounds)
+                   for matchup, seeds, first_game_index in batches]
+        for future in as_completed(futures):
+            batch = future.result()
+            add_batch(fleet_stats, batch)
+            matchup = matchups.setdefault(" vs ".join(batch["fleets"]),
+                                          {"games": 0, "wins": [0, 0]})
+            matchup["games"] += batch["games"]
+            matchup["wins"][0] += batch["wins"][0]
+            matchup["wins"][1] += batch["wins"][1]
+            if on_batch is not None:
+                on_batch(batch)
+    game_count = sum(matchup["games"] for matchup in matchups.values())
+    return {"games": game_count,
+            "fleets": get_fleet_summary(fleet_stats),
+            "matchups": dict(sorted(matchups.items())),
+            "games_per_second": game_count / (time.perf_counter() - start)}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Tournoi entre compositions de flotte")
+    parser.add_argument("--games", type=int, default=1000,
+                        help="parties par paire de flottes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--fleets", nargs="+", default=sorted(FLEETS),
+                        choices=sorted(FLEETS))
+    parser.add_argument("--strategy", default="random",
+                        choices=sorted(STRATEGIES))
+    arguments = parser.parse_args()
+    strategy_type = STRATEGIES[arguments.strategy]
+    stats = run_tournament(arguments.fleets, arguments.games, arguments.seed,
+                           (strategy_type, strategy_type),
+                           max_workers=arguments.workers,
+                           batch_size=arguments.batch_size)
+    print(json.dumps(dict(stats, seed=arguments.seed,
+                          workers=arguments.workers), indent=2))
+
+
+if __name__ == "__main__":
+    main()